@@ -0,0 +1,243 @@
+# algorithms/cache.py
+"""
+Content-addressed cache of scheduling results.
+
+A result (schedule, summary metrics, per-process metrics) is keyed by a hash
+of the process set (ProcessTable.fingerprint), the algorithm and every
+parameter that changes its outcome. run_scheduling_algorithm and
+compare_algorithms take a ResultsCache, so running the same algorithm on an
+unchanged workload again, or comparing after a run, costs one lookup.
+
+The in-memory tier is an LRU bounded by the estimated size of its entries;
+an optional directory adds a disk tier that survives restarts, e.g. for the
+command-line runner.
+
+Usage:
+    cache = ResultsCache(max_bytes=512 * 2**20, directory=".scheduler-cache")
+    schedule, summary, detailed = run_scheduling_algorithm("SRTF", table, cache=cache)
+
+Cached results are shared between callers and must be treated as read-only.
+"""
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+import threading
+from collections import OrderedDict
+
+from algorithms.process_table import as_process_table
+from algorithms.registry import SCHEDULERS
+
+# Part of every key; bump it when an engine's output changes, so stale disk
+# entries are never read
+CACHE_VERSION = 1
+
+# Lists longer than this are sized from their first element
+_SAMPLED_LENGTH = 16
+
+
+def result_key(processes, algorithm, time_quantum=None, **parameters):
+    """
+    Cache key of one algorithm's result on a process set.
+
+    Args:
+        processes: ProcessTable or list of process dictionaries
+        algorithm: Registered algorithm name
+        time_quantum: Time quantum; only part of the key for algorithms that
+            take one, with None meaning their default
+        **parameters: Every other argument that changes the result, e.g.
+            switch_cost or cpus
+
+    Returns:
+        Hexadecimal digest string
+    """
+    scheduler = SCHEDULERS.get(algorithm)
+    if scheduler is not None and scheduler.needs_quantum:
+        time_quantum = scheduler.parameters["quantum"] if time_quantum is None else time_quantum
+    else:
+        time_quantum = None
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(repr((CACHE_VERSION, as_process_table(processes).fingerprint(), algorithm, time_quantum,
+                        _canonical(parameters))).encode())
+    return digest.hexdigest()
+
+
+def _canonical(value):
+    """Value with dictionaries and sets in sorted order, for a stable repr."""
+    if isinstance(value, dict):
+        return tuple(sorted((repr(key), _canonical(item)) for key, item in value.items()))
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(repr(item) for item in value))
+    if isinstance(value, (list, tuple)):
+        return tuple(_canonical(item) for item in value)
+    return value
+
+
+def estimate_size(value):
+    """
+    Rough size of a result in bytes. Long lists are sized from their first
+    element, which is exact enough for schedules and per-process metrics,
+    whose elements all have the same shape.
+    """
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        return size + sum(estimate_size(item) for item in value.values())
+    if isinstance(value, (list, tuple)) and value:
+        if len(value) > _SAMPLED_LENGTH:
+            return size + len(value) * estimate_size(value[0])
+        return size + sum(estimate_size(item) for item in value)
+    return size
+
+
+class ResultsCache:
+    """
+    LRU cache of scheduling results with an optional disk tier.
+
+    Entries beyond max_bytes (by estimate_size) are evicted least recently
+    used first; an entry larger than max_bytes on its own only goes to disk.
+    Disk entries are pickle files named by their key, found again by any
+    ResultsCache on the same directory, and promoted to memory when read.
+    Unreadable disk entries count as misses. All methods are thread-safe.
+    """
+
+    def __init__(self, max_bytes=256 * 2**20, directory=None, max_disk_bytes=None):
+        """
+        Args:
+            max_bytes: Memory budget of the in-memory tier
+            directory: Optional directory of the disk tier, created if needed
+            max_disk_bytes: Optional budget of the disk tier; the least
+                recently used files are deleted beyond it
+        """
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self.hits = 0
+        self.misses = 0
+        # key -> (value, estimated size), least recently used first
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def get(self, key):
+        """Return the cached value of key, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+
+            value = self._read(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._remember(key, value)
+            return value
+
+    def put(self, key, value):
+        """Store a value under key, in memory and, with a directory, on disk."""
+        with self._lock:
+            self._remember(key, value)
+            self._write(key, value)
+
+    def clear(self, disk=False):
+        """Forget every in-memory entry, and with disk=True the disk tier too."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            if disk and self.directory is not None:
+                for path in self._disk_files():
+                    _remove(path)
+
+    @property
+    def memory_bytes(self):
+        """Estimated size of the in-memory entries."""
+        return self._bytes
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries or (self.directory is not None and os.path.exists(self._path(key)))
+
+    # In-memory tier
+
+    def _remember(self, key, value):
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old[1]
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return
+        self._entries[key] = (value, size)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            _, (_, evicted) = self._entries.popitem(last=False)
+            self._bytes -= evicted
+
+    # Disk tier
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.pkl")
+
+    def _read(self, key):
+        if self.directory is None:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+            _remove(path)
+            return None
+        try:
+            # Mark as recently used for the disk budget
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def _write(self, key, value):
+        if self.directory is None:
+            return
+        try:
+            # Write to a temporary file first, so readers never see half a file
+            fd, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary, self._path(key))
+        except OSError:
+            return
+        if self.max_disk_bytes is not None:
+            self._trim_disk()
+
+    def _disk_files(self):
+        return [os.path.join(self.directory, name) for name in os.listdir(self.directory) if name.endswith(".pkl")]
+
+    def _trim_disk(self):
+        files = []
+        for path in self._disk_files():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_disk_bytes:
+                break
+            _remove(path)
+            total -= size
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
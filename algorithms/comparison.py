@@ -1,35 +1,223 @@
 # algorithms/comparison.py
 
-def compare_algorithms(processes, time_quantum=2):
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from algorithms.cache import result_key
+from algorithms.metrics import calculate_metrics
+from algorithms.process_table import as_process_table
+from algorithms.registry import get_scheduler, scheduler_names
+
+# Seconds between checks for cancellation while waiting for parallel runs
+CANCEL_POLL_INTERVAL = 0.1
+
+def compare_algorithms(processes, time_quantum=2, parallel=False, max_workers=None, use_threads=False,
+                       control=None, instrument=None, switch_cost=0, dispatch_latency=0, algorithms=None,
+                       cache=None):
     """
-    Compare all scheduling algorithms using the same process set.
-    
+    Compare scheduling algorithms using the same process set.
+
     Args:
-        processes: List of process dictionaries
-        time_quantum: Time quantum for Round Robin algorithm
-        
+        processes: ProcessTable or list of process dictionaries
+        time_quantum: Time quantum for Round Robin, top-level quantum of MLFQ
+        parallel: If True, run each algorithm and its metrics in an executor
+            instead of one after another in the calling thread
+        max_workers: Number of parallel workers (default: one per algorithm,
+            capped at the number of CPUs)
+        use_threads: Use a thread pool instead of the default process pool
+        control: Optional RunControl for progress and cancellation of a
+            serial comparison; raises SimulationCancelled if cancelled
+        instrument: Optional Instrumentation recording one run per algorithm
+            of a serial comparison
+        switch_cost: Time charged per context switch (see
+            algorithms.scheduling)
+        dispatch_latency: Time charged per dispatch
+        algorithms: Names of the registered algorithms to compare, in the
+            order given (default: every one registered as compared)
+        cache: Optional ResultsCache (algorithms.cache); only algorithms
+            without a cached result are run, and their results are added.
+            It shares its entries with run_scheduling_algorithm. Not used
+            with an instrument
+
     Returns:
         Dictionary containing results for each algorithm
+
+    Raises:
+        ValueError: For an unknown algorithm name
+    """
+    if algorithms is None:
+        algorithms = scheduler_names(compared=True)
+    for name in algorithms:
+        get_scheduler(name)
+    # Convert once so every algorithm shares the same columns and arrival order
+    processes = as_process_table(processes)
+
+    overhead = dict(switch_cost=switch_cost, dispatch_latency=dispatch_latency)
+    if instrument is not None:
+        cache = None
+    comparison = {}
+    keys = {}
+    if cache is not None:
+        for name in algorithms:
+            keys[name] = result_key(processes, name, time_quantum, **overhead)
+            result = cache.get(keys[name])
+            if result is not None:
+                comparison[name] = dict(zip(("schedule", "summary", "detailed"), result))
+
+    tasks = [(name, time_quantum) for name in algorithms if name not in comparison]
+    if parallel and tasks:
+        results = _run_parallel(processes, tasks, False, max_workers, use_threads, overhead)
+    else:
+        if control is not None:
+            control.runs_total = len(tasks)
+        results = [evaluate_algorithm(name, processes, quantum, control=control, instrument=instrument, **overhead)
+                   for name, quantum in tasks]
+
+    for (name, _), result in zip(tasks, results):
+        comparison[name] = result
+        if cache is not None:
+            # Stored as run_scheduling_algorithm returns it
+            cache.put(keys[name], (result["schedule"], result["summary"], result["detailed"]))
+    return {name: comparison[name] for name in algorithms}
+
+def sweep_round_robin(processes, quanta, parallel=True, max_workers=None, use_threads=False, switch_cost=0,
+                      dispatch_latency=0, control=None):
+    """
+    Evaluate Round Robin for several time quanta on the same process set.
+
+    The processes are sorted by arrival once and every run reuses that
+    sorted table (and its pid index for the metrics). Only the summary
+    metrics are kept per quantum, so the schedules never leave the workers.
+
+    With a switch cost, the 'switch_overhead' of the results shows where
+    smaller quanta stop paying for their better response time.
+
+    Args:
+        processes: ProcessTable or list of process dictionaries
+        quanta: Iterable of time quanta to evaluate
+        parallel: If True, evaluate the quanta in an executor
+        max_workers: Number of parallel workers (default: one per CPU)
+        use_threads: Use a thread pool instead of the default process pool
+        switch_cost: Time charged per context switch
+        dispatch_latency: Time charged per dispatch
+        control: Optional RunControl for progress and cancellation; raises
+            SimulationCancelled if cancelled. A parallel sweep reports each
+            finished quantum and, when cancelled, skips the quanta not
+            started yet
+
+    Returns:
+        List of dictionaries, one per quantum in the given order, holding
+        'quantum' and the summary metrics of that run
     """
-    from algorithms.scheduling import fcfs, optimized_sjf, srtf, optimized_round_robin, priority_scheduling
-    from algorithms.metrics import calculate_metrics
-    
-    algorithms = {
-        "FCFS": fcfs(processes),
-        "SJF": optimized_sjf(processes),
-        "SRTF": srtf(processes),
-        "Round Robin": optimized_round_robin(processes, time_quantum),
-        "Priority": priority_scheduling(processes)
+    processes = as_process_table(processes).sorted_by_arrival()
+
+    overhead = dict(switch_cost=switch_cost, dispatch_latency=dispatch_latency)
+    tasks = [("Round Robin", quantum) for quantum in quanta]
+    if parallel and len(tasks) > 1:
+        results = _run_parallel(processes, tasks, True, max_workers, use_threads, overhead, control)
+    else:
+        if control is not None:
+            control.runs_total = len(tasks)
+        results = [evaluate_algorithm(name, processes, quantum, summary_only=True, control=control, **overhead)
+                   for name, quantum in tasks]
+
+    return [dict(quantum=quantum, **(result["summary"] or {})) for (_, quantum), result in zip(tasks, results)]
+
+def evaluate_algorithm(name, processes, time_quantum=2, summary_only=False, control=None, instrument=None,
+                       switch_cost=0, dispatch_latency=0):
+    """
+    Run one algorithm and calculate its metrics.
+
+    Args:
+        name: Name of a scheduler in algorithms.registry
+        processes: ProcessTable or list of process dictionaries
+        time_quantum: Time quantum for Round Robin, top-level quantum of MLFQ
+        summary_only: If True, only return the summary metrics
+        control: Optional RunControl following the run
+        instrument: Optional Instrumentation recording the run
+        switch_cost: Time charged per context switch
+        dispatch_latency: Time charged per dispatch
+
+    Returns:
+        Dictionary with the schedule, summary and detailed metrics
+    """
+    if control is not None:
+        control.begin_run(name, len(processes))
+    overhead = dict(switch_cost=switch_cost, dispatch_latency=dispatch_latency)
+    scheduler = get_scheduler(name)
+    if instrument is None:
+        schedule = scheduler.run(processes, time_quantum, control, **overhead)
+        summary, detailed = calculate_metrics(schedule, processes, detailed=not summary_only)
+    else:
+        # The instrumentation sees every engine event first and passes it on
+        instrument.begin_run(name)
+        instrument.metrics = control
+        with instrument.profiling():
+            with instrument.phase("schedule"):
+                schedule = scheduler.run(processes, time_quantum, instrument, **overhead)
+            with instrument.phase("metrics"):
+                summary, detailed = calculate_metrics(schedule, processes, instrument, detailed=not summary_only)
+    if summary_only:
+        return {"summary": summary}
+    return {
+        "schedule": schedule,
+        "summary": summary,
+        "detailed": detailed
     }
-    
-    results = {}
-    
-    for name, schedule in algorithms.items():
-        summary, detailed = calculate_metrics(schedule, processes)
-        results[name] = {
-            "schedule": schedule,
-            "summary": summary,
-            "detailed": detailed
-        }
-    
-    return results
\ No newline at end of file
+
+def _run_parallel(processes, tasks, summary_only, max_workers, use_threads, overhead, control=None):
+    """
+    Evaluate (name, time_quantum) tasks in an executor, with the
+    evaluate_algorithm keyword arguments in `overhead`. An optional
+    RunControl counts every finished task as a finished run.
+
+    Returns:
+        List of evaluate_algorithm results in task order
+
+    Raises:
+        SimulationCancelled: If the control is cancelled; tasks not started
+            yet are dropped, running ones are waited for
+    """
+    if max_workers is None:
+        max_workers = min(len(tasks), os.cpu_count() or 1)
+
+    if use_threads:
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        submit = lambda name, quantum: executor.submit(evaluate_algorithm, name, processes, quantum, summary_only,
+                                                       **overhead)
+    else:
+        # Workers receive the process table once, when they start, instead of
+        # a pickled copy of it with every task
+        executor = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                       initargs=(processes,))
+        submit = lambda name, quantum: executor.submit(_evaluate_in_worker, name, quantum, summary_only, overhead)
+
+    with executor:
+        futures = [submit(name, quantum) for name, quantum in tasks]
+        if control is not None:
+            _follow(futures, executor, control, ", ".join(dict.fromkeys(name for name, _ in tasks)))
+        return [future.result() for future in futures]
+
+def _follow(futures, executor, control, label):
+    """Report finished futures to the control until all are done or it is cancelled."""
+    control.label = label
+    control.runs_total = len(futures)
+    pending = set(futures)
+    while pending:
+        done, pending = wait(pending, timeout=CANCEL_POLL_INTERVAL, return_when=FIRST_COMPLETED)
+        control.runs_done += len(done)
+        if control.cancelled:
+            executor.shutdown(wait=False, cancel_futures=True)
+            control.check()
+
+# Process table of a pool worker, set once by _init_worker
+_worker_processes = None
+
+def _init_worker(processes):
+    """Pool initializer: keep the process table for every task of this worker."""
+    global _worker_processes
+    _worker_processes = processes
+
+def _evaluate_in_worker(name, time_quantum, summary_only, overhead):
+    """Pool task: evaluate one algorithm on the worker's process table."""
+    return evaluate_algorithm(name, _worker_processes, time_quantum, summary_only, **overhead)
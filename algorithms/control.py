@@ -0,0 +1,95 @@
+# algorithms/control.py
+
+
+class SimulationCancelled(Exception):
+    """Raised inside an engine when its run has been cancelled."""
+
+
+class RunControl:
+    """
+    Progress reporting and cancellation for simulations running in another
+    thread.
+
+    A RunControl has the interface of OnlineMetrics, so it is passed to the
+    engines as their `metrics` argument (optionally forwarding to a real
+    OnlineMetrics). It counts every arrival and segment event the engine
+    reports and raises SimulationCancelled from the next event after cancel()
+    was called, which unwinds the engine.
+
+    Usage (worker thread):
+        control = RunControl()
+        schedule, summary, detailed = run_scheduling_algorithm(
+            "SRTF", processes, control=control)
+
+    Usage (UI thread, e.g. from root.after):
+        progress_bar["value"] = 100 * control.progress
+        control.cancel()
+    """
+
+    def __init__(self, metrics=None):
+        self.metrics = metrics
+        self.events = 0
+        self.completed = 0
+        # Processes in the current run
+        self.total = 0
+        # Name of the current run, runs finished and runs expected in total
+        self.label = None
+        self.runs_done = 0
+        self.runs_total = 1
+        self._cancelled = False
+
+    def cancel(self):
+        """Request the running engine to stop at its next event."""
+        self._cancelled = True
+
+    @property
+    def cancelled(self):
+        return self._cancelled
+
+    def begin_run(self, label, total):
+        """
+        Start counting a new run of `total` processes. Runs before it are
+        counted as finished.
+        """
+        if self.label is not None:
+            self.runs_done += 1
+        self.label = label
+        self.total = total
+        self.completed = 0
+        self.check()
+
+    @property
+    def progress(self):
+        """Fraction (0 to 1) of all expected runs completed so far."""
+        current = self.completed / self.total if self.total else 0
+        return min((self.runs_done + current) / max(self.runs_total, 1), 1.0)
+
+    def check(self):
+        """
+        Raises:
+            SimulationCancelled: If cancel() has been called
+        """
+        if self._cancelled:
+            raise SimulationCancelled(f"{self.label or 'Simulation'} was cancelled")
+
+    # OnlineMetrics interface, called by the engines
+
+    def start(self, time):
+        if self.metrics is not None:
+            self.metrics.start(time)
+
+    def add_process(self, pid, arrival, burst):
+        self.events += 1
+        if self._cancelled:
+            self.check()
+        if self.metrics is not None:
+            self.metrics.add_process(pid, arrival, burst)
+
+    def add_segment(self, pid, start, end, completed=None):
+        self.events += 1
+        if completed:
+            self.completed += 1
+        if self._cancelled:
+            self.check()
+        if self.metrics is not None:
+            self.metrics.add_segment(pid, start, end, completed)
@@ -0,0 +1,353 @@
+# algorithms/instrumentation.py
+"""
+Opt-in instrumentation of scheduling runs: event counters, ready-queue
+lengths, phase timings and profiling.
+
+An Instrumentation has the interface of OnlineMetrics, so the engines take it
+as their `metrics` argument and nothing changes in their hot loops: with no
+instrumentation the only cost is the `metrics is not None` test they already
+make. It can forward every event to another metrics object (an OnlineMetrics
+or a RunControl).
+
+Usage:
+    instrument = Instrumentation(profiler="cprofile")
+    schedule, summary, detailed = run_scheduling_algorithm("SRTF", processes, instrument=instrument)
+    print(instrument.format_report())
+    json.dump(instrument.report(), f)
+"""
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+
+from algorithms.overhead import OVERHEAD_PIDS
+
+PROFILERS = ("cprofile", "sampling")
+
+# Counters kept per run
+COUNTERS = ("arrivals", "dispatches", "preemptions", "completions", "context_switches",
+            "queue_pushes", "queue_pops", "overhead_segments")
+
+
+class Instrumentation:
+    """
+    Counters, ready-queue samples and phase timings for one or more runs.
+
+    Counters are derived from the engine events:
+        arrivals: Processes released to the ready queue
+        dispatches: Segments run on the CPU
+        preemptions: Segments that ended before their process completed
+            (preemption or an expired Round Robin quantum)
+        completions: Segments that completed their process
+        context_switches: Dispatches of a different process than the
+            previous segment's
+        queue_pushes / queue_pops: Ready-queue operations, one push per
+            arrival and preemption and one pop per dispatch (an upper bound
+            for the heap-based engines, which combine some pairs into one
+            heapreplace)
+        overhead_segments: Context-switch and dispatch-latency segments
+
+    Segments reported without a completed flag are only counted as
+    dispatches.
+    """
+
+    def __init__(self, metrics=None, profiler=None, sample_interval=0.001, max_queue_samples=2048):
+        """
+        Args:
+            metrics: Optional OnlineMetrics (or RunControl) receiving every event
+            profiler: None, 'cprofile' or 'sampling', used by profiling()
+            sample_interval: Seconds between stack samples of the sampling
+                profiler
+            max_queue_samples: Ready-queue samples kept per run; longer runs
+                keep every second sample, then every fourth, and so on
+        """
+        if profiler not in (None,) + PROFILERS:
+            raise ValueError(f"Unknown profiler '{profiler}', choose from: {', '.join(PROFILERS)}")
+        self.metrics = metrics
+        self.profiler = profiler
+        self.sample_interval = sample_interval
+        self.max_queue_samples = max_queue_samples
+        self.runs = []
+        self._run = None
+        self._lap_start = time.perf_counter()
+        self._cprofile_stats = None
+        self._samples = None
+
+    def begin_run(self, label):
+        """Start counting a new run, e.g. one algorithm of a comparison."""
+        self._run = {
+            "label": label,
+            "counters": dict.fromkeys(COUNTERS, 0),
+            "phases": {},
+            # (time, processes waiting) at every kept dispatch
+            "queue_lengths": [],
+            "max_queue_length": 0,
+            "_queue_total": 0,
+            "_stride": 1,
+            "_last_pid": None,
+            # OVERHEAD_PIDS that are the pids of processes of this run
+            "_process_markers": set(),
+        }
+        self.runs.append(self._run)
+        self._lap_start = time.perf_counter()
+
+    @property
+    def current(self):
+        """Record of the current run, started on the first event if needed."""
+        if self._run is None:
+            self.begin_run("run")
+        return self._run
+
+    # Phase timings
+
+    @contextmanager
+    def phase(self, name):
+        """
+        Add the wall time of the with-block to the phase `name`. Laps inside
+        the block break it down further.
+        """
+        start = self._lap_start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            phases = self.current["phases"]
+            phases[name] = phases.get(name, 0.0) + end - start
+            self._lap_start = end
+
+    def lap(self, name):
+        """Add the time since the last lap (or phase) to the phase `name`."""
+        now = time.perf_counter()
+        phases = self.current["phases"]
+        phases[name] = phases.get(name, 0.0) + now - self._lap_start
+        self._lap_start = now
+
+    # Profiling
+
+    def profiling(self):
+        """
+        Context manager profiling the with-block with the configured profiler
+        (does nothing without one). Profiles of several blocks are combined.
+        """
+        if self.profiler == "cprofile":
+            return self._cprofile()
+        if self.profiler == "sampling":
+            return self._sampling()
+        return nullcontext()
+
+    @contextmanager
+    def _cprofile(self):
+        # Imported on use: pstats alone doubles the import time of this module
+        import cProfile
+        import pstats
+
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            if self._cprofile_stats is None:
+                self._cprofile_stats = pstats.Stats(profile)
+            else:
+                self._cprofile_stats.add(profile)
+
+    @contextmanager
+    def _sampling(self):
+        sampler = SamplingProfiler(threading.get_ident(), self.sample_interval)
+        sampler.start()
+        try:
+            yield
+        finally:
+            sampler.stop()
+            if self._samples is None:
+                self._samples = sampler
+            else:
+                self._samples.merge(sampler)
+
+    def profile(self, top=20):
+        """
+        Functions taking the most time in the profiled blocks.
+
+        Returns:
+            List of at most `top` dictionaries with 'function', 'calls'
+            (None when sampled), 'self_seconds' and 'total_seconds', by
+            decreasing self time
+        """
+        if self._cprofile_stats is not None:
+            rows = [
+                {"function": _function_name(*key), "calls": calls,
+                 "self_seconds": self_time, "total_seconds": total_time}
+                for key, (_, calls, self_time, total_time, _) in self._cprofile_stats.stats.items()
+            ]
+        elif self._samples is not None:
+            rows = self._samples.rows()
+        else:
+            return []
+        return sorted(rows, key=lambda row: -row["self_seconds"])[:top]
+
+    # OnlineMetrics interface, called by the engines
+
+    def start(self, time):
+        if self.metrics is not None:
+            self.metrics.start(time)
+
+    def add_process(self, pid, arrival, burst):
+        run = self._run or self.current
+        counters = run["counters"]
+        if pid in OVERHEAD_PIDS:
+            run["_process_markers"].add(pid)
+        counters["arrivals"] += 1
+        counters["queue_pushes"] += 1
+        if self.metrics is not None:
+            self.metrics.add_process(pid, arrival, burst)
+
+    def add_segment(self, pid, start, end, completed=None):
+        run = self._run or self.current
+        counters = run["counters"]
+        if pid in OVERHEAD_PIDS and pid not in run["_process_markers"]:
+            counters["overhead_segments"] += 1
+            if self.metrics is not None:
+                self.metrics.add_segment(pid, start, end, completed)
+            return
+        counters["dispatches"] += 1
+        counters["queue_pops"] += 1
+        if pid != run["_last_pid"]:
+            if run["_last_pid"] is not None:
+                counters["context_switches"] += 1
+            run["_last_pid"] = pid
+
+        # Processes left waiting by this dispatch
+        waiting = max(counters["arrivals"] - counters["completions"] - 1, 0)
+        run["_queue_total"] += waiting
+        if waiting > run["max_queue_length"]:
+            run["max_queue_length"] = waiting
+        if counters["dispatches"] % run["_stride"] == 0:
+            samples = run["queue_lengths"]
+            samples.append((start, waiting))
+            if len(samples) >= self.max_queue_samples:
+                del samples[1::2]
+                run["_stride"] *= 2
+
+        if completed:
+            counters["completions"] += 1
+        elif completed is not None:
+            counters["preemptions"] += 1
+            counters["queue_pushes"] += 1
+        if self.metrics is not None:
+            self.metrics.add_segment(pid, start, end, completed)
+
+    # Results
+
+    def report(self, top=20):
+        """
+        Everything recorded, as a JSON-serializable dictionary.
+
+        Returns:
+            Dictionary with 'runs' (per run: 'label', 'counters', 'phases' in
+            seconds, 'max_queue_length', 'mean_queue_length' and the sampled
+            'queue_lengths') and 'profile' (see profile())
+        """
+        runs = []
+        for run in self.runs:
+            dispatches = run["counters"]["dispatches"]
+            runs.append({
+                "label": run["label"],
+                "counters": dict(run["counters"]),
+                "phases": dict(run["phases"]),
+                "max_queue_length": run["max_queue_length"],
+                "mean_queue_length": run["_queue_total"] / dispatches if dispatches else 0,
+                "queue_lengths": [list(sample) for sample in run["queue_lengths"]],
+            })
+        return {"runs": runs, "profiler": self.profiler, "profile": self.profile(top)}
+
+    def format_report(self, top=15):
+        """The report as readable text."""
+        report = self.report(top)
+        lines = []
+        for run in report["runs"]:
+            lines.append(run["label"])
+            for name, value in run["counters"].items():
+                lines.append(f"  {name:<26} {value:>12}")
+            lines.append(f"  {'max_queue_length':<26} {run['max_queue_length']:>12}")
+            lines.append(f"  {'mean_queue_length':<26} {run['mean_queue_length']:>12.2f}")
+            for name, seconds in run["phases"].items():
+                lines.append(f"  {name + ' (s)':<26} {seconds:>12.4f}")
+            lines.append("")
+
+        if report["profile"]:
+            lines.append(f"Profile ({report['profiler']}), by self time:")
+            lines.append(f"  {'self (s)':>9} {'total (s)':>9} {'calls':>9}  function")
+            for row in report["profile"]:
+                calls = row["calls"] if row["calls"] is not None else "-"
+                lines.append(f"  {row['self_seconds']:>9.4f} {row['total_seconds']:>9.4f} {calls:>9}  "
+                             f"{row['function']}")
+        return "\n".join(lines)
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler sampling the stack of one thread from a background
+    thread about every `interval` seconds. Its overhead does not grow with the
+    number of function calls, unlike cProfile's.
+
+    The sampler needs the GIL to take a sample, so samples can be further
+    apart than `interval`; each one is weighted by the time since the
+    previous sample.
+    """
+
+    def __init__(self, thread_id, interval=0.001):
+        self.thread_id = thread_id
+        self.interval = interval
+        # Sampled seconds with the function on top of the stack, and anywhere on it
+        self.self_seconds = Counter()
+        self.total_seconds = Counter()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def merge(self, other):
+        self.self_seconds.update(other.self_seconds)
+        self.total_seconds.update(other.total_seconds)
+
+    def rows(self):
+        """Sampled functions, in the row format of Instrumentation.profile()."""
+        return [
+            {"function": function, "calls": None,
+             "self_seconds": self.self_seconds[function], "total_seconds": seconds}
+            for function, seconds in self.total_seconds.items()
+        ]
+
+    def _run(self):
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            now = time.perf_counter()
+            elapsed, last = now - last, now
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            code = frame.f_code
+            self.self_seconds[_function_name(code.co_filename, code.co_firstlineno, code.co_name)] += elapsed
+            # Count each function once per sample, even if recursive
+            seen = set()
+            while frame is not None:
+                code = frame.f_code
+                seen.add(_function_name(code.co_filename, code.co_firstlineno, code.co_name))
+                frame = frame.f_back
+            for function in seen:
+                self.total_seconds[function] += elapsed
+
+
+def _function_name(filename, line, name):
+    if filename == "~":
+        # Built-in functions, as cProfile reports them
+        return name
+    return f"{filename}:{line}({name})"
@@ -1,88 +1,300 @@
-def calculate_metrics(schedule, processes):
+from collections.abc import Sequence
+
+import numpy as np
+
+from algorithms.process_table import as_process_table
+from algorithms.overhead import overhead_markers
+from algorithms.schedule import Schedule
+
+# Waiting-time percentiles reported in the summary
+WAITING_PERCENTILES = (50, 95, 99)
+
+# Keys of the per-process metrics
+PROCESS_METRICS = ('pid', 'arrival', 'burst', 'completion', 'turnaround', 'waiting', 'response')
+
+
+def schedule_to_arrays(schedule, processes=None):
+    """
+    Convert a schedule into three NumPy arrays.
+
+    Args:
+        schedule: Schedule as the engines return it, whose columns are
+            copied as they are; a list of tuples (pid, start_time, end_time);
+            or a tuple of three arrays (pids, start_times, end_times) which
+            is returned as is. Further elements of the tuples, such as the
+            core of a multi-core schedule, are ignored.
+        processes: Optional ProcessTable the schedule was made from. With
+            integer pids, a list is read in a single pass, about twice as
+            fast; the times are integers if the table's arrival and burst
+            times are and every time is whole.
+
+    Returns:
+        Tuple of arrays (pids, start_times, end_times)
+    """
+    if isinstance(schedule, tuple) and len(schedule) == 3 and isinstance(schedule[0], np.ndarray):
+        return schedule
+    if isinstance(schedule, Schedule):
+        return schedule.arrays()
+
+    if processes is not None and processes.pid.dtype.kind in 'iu' and isinstance(schedule, list) and schedule:
+        columns = _fill_columns(schedule, processes)
+        if columns is not None:
+            return columns
+
+    segments = np.array(schedule)
+    if segments.ndim == 2 and segments.dtype.kind in 'iuf':
+        return segments[:, 0], segments[:, 1], segments[:, 2]
+
+    # Non-numeric pids, keep each column's own type. String pids among the
+    # integer pids of overhead segments make an object array, not strings
+    pids, starts, ends = list(zip(*schedule))[:3]
+    pid_array = np.array(pids)
+    if pid_array.dtype.kind in 'US' and not all(isinstance(pid, str) for pid in pids):
+        pid_array = np.array(pids, dtype=object)
+    return pid_array, np.array(starts), np.array(ends)
+
+
+def calculate_metrics(schedule, processes, instrument=None, detailed=True):
     """
     Calculate performance metrics for the given schedule and processes.
-    
+
+    All per-process values are computed with grouped NumPy reductions over the
+    schedule columns, so no Python-level loop runs per segment, and the
+    per-process dictionaries are only built when they are read (see
+    ProcessMetrics).
+
+    Context-switch and dispatch-latency segments (see algorithms.overhead)
+    count towards the elapsed time but not towards any process or the CPU
+    utilization. 'switch_overhead' is the share of the elapsed time spent in
+    these segments, in percent. A process whose pid is one of the
+    OVERHEAD_PIDS is counted as a process, since no overhead can be charged
+    for its process set. 'context_switches' counts the changes from one
+    process to another in the time-ordered schedule, whether a switch cost
+    was charged or not.
+
     Args:
-        schedule: List of tuples (pid, start_time, end_time)
-        processes: List of dictionaries with process details
-        
+        schedule: Schedule as the engines return it, list of tuples (pid,
+            start_time, end_time), or a tuple of arrays (pids, start_times,
+            end_times) as returned by schedule_to_arrays
+        processes: ProcessTable or list of dictionaries with process details
+        instrument: Optional Instrumentation timing each step as a
+            'metrics: <step>' phase
+        detailed: If False, return None in place of the per-process metrics
+
     Returns:
-        Dictionary containing various performance metrics
+        Tuple (summary, detailed): dictionary of summary metrics and
+        ProcessMetrics, a sequence of one dictionary per process
     """
-    if not schedule:
+    if len(schedule) == 0 or len(schedule[0]) == 0:
         return None, None
 
-    # Create a dictionary for processes for easy lookup
-    process_dict = {p['pid']: p for p in processes}
+    table = as_process_table(processes)
+    pids, starts, ends = schedule_to_arrays(schedule, table)
 
-    # Get the end time of the last process to complete
-    max_completion_time = max(task[2] for task in schedule)
+    # Numeric schedules come back as a single array type, give the pids back
+    # the type they have in the process table
+    if pids.dtype != table.pid.dtype and pids.dtype.kind == 'f' and table.pid.dtype.kind in 'iu':
+        pids = pids.astype(table.pid.dtype)
 
-    # Dictionary to track completion time for each process
-    completion_times = {}
+    # Split off the overhead segments; the elapsed time still ends with them
+    last_end = ends.max()
+    overhead_time = 0
+    markers = overhead_markers(table.pid)
+    if markers and pids.dtype.kind in 'iufO':
+        if pids.dtype.kind == 'O':
+            is_overhead = np.fromiter((pid in markers for pid in pids.tolist()), bool, len(pids))
+        else:
+            is_overhead = np.isin(pids, markers)
+        if is_overhead.any():
+            overhead_time = (ends[is_overhead] - starts[is_overhead]).sum().item()
+            pids, starts, ends = pids[~is_overhead], starts[~is_overhead], ends[~is_overhead]
+    if pids.dtype.kind == 'O' and table.pid.dtype.kind != 'O':
+        pids = pids.astype(table.pid.dtype)
+    context_switches = int(np.count_nonzero(pids[1:] != pids[:-1]))
+    if instrument is not None:
+        instrument.lap('metrics: convert')
 
-    # Dictionary to calculate total running time for each process
-    running_times = {}
+    # Completion is the end of the last segment, response the start of the first
+    scheduled_pids, completion_times, first_start_times = _group_by_pid(pids, starts, ends, len(table))
+    if instrument is not None:
+        instrument.lap('metrics: group by pid')
 
-    # For each process, find its segments in the schedule
-    for pid, start, end in schedule:
-        if pid not in running_times:
-            running_times[pid] = 0
-        running_times[pid] += (end - start)
+    # Look up arrival and burst for every scheduled pid
+    table_order = table.pid_order()
+    table_sorted_pids = table.pid[table_order]
+    positions = np.minimum(np.searchsorted(table_sorted_pids, scheduled_pids), len(table_order) - 1)
+    missing = table_sorted_pids[positions] != scheduled_pids
+    if missing.any():
+        raise KeyError(scheduled_pids[missing][0].item())
+    rows = table_order[positions]
+    arrivals = table.arrival[rows]
+    bursts = table.burst[rows]
+    if instrument is not None:
+        instrument.lap('metrics: lookup')
 
-        # Update completion time (we want the max time when the process finishes)
-        completion_times[pid] = max(completion_times.get(pid, 0), end)
+    # Turnaround time = completion time - arrival time
+    turnaround_times = completion_times - arrivals
 
-    # Calculate waiting and turnaround times for each process
-    waiting_times = {}
-    turnaround_times = {}
+    # Waiting time = turnaround time - burst time
+    waiting_times = turnaround_times - bursts
 
-    for pid in completion_times:
-        # Turnaround time = completion time - arrival time
-        turnaround_times[pid] = completion_times[pid] - process_dict[pid]['arrival']
-
-        # Waiting time = turnaround time - burst time
-        waiting_times[pid] = turnaround_times[pid] - process_dict[pid]['burst']
+    # Response time = first time on the CPU - arrival time
+    response_times = first_start_times - arrivals
 
     # Calculate averages
-    avg_waiting_time = sum(waiting_times.values()) / len(waiting_times) if waiting_times else 0
-    avg_turnaround_time = sum(turnaround_times.values()) / len(turnaround_times) if turnaround_times else 0
+    avg_waiting_time = waiting_times.mean().item()
+    avg_turnaround_time = turnaround_times.mean().item()
+    avg_response_time = response_times.mean().item()
 
     # Calculate CPU utilization
-    # Get the first arrival time
-    first_arrival = min(p['arrival'] for p in processes)
-
     # Total time from first arrival to completion
-    total_time = max_completion_time - first_arrival
+    total_time = (last_end - table.arrival.min()).item()
 
     # Sum of all process execution times
-    total_execution_time = sum(end - start for _, start, end in schedule)
+    total_execution_time = (ends - starts).sum().item()
 
     # CPU utilization as a percentage
     cpu_utilization = (total_execution_time / total_time) * 100 if total_time > 0 else 0
 
     # Calculate throughput (processes per unit time)
-    number_of_processes = len(set(pid for pid, _, _ in schedule))
+    number_of_processes = len(scheduled_pids)
     throughput = number_of_processes / total_time if total_time > 0 else 0
 
     # Create a summary dictionary
     summary = {
         'avg_waiting_time': avg_waiting_time,
         'avg_turnaround_time': avg_turnaround_time,
+        'avg_response_time': avg_response_time,
         'cpu_utilization': cpu_utilization,
-        'throughput': throughput
+        'throughput': throughput,
+        'context_switches': context_switches,
+        'switch_overhead': (overhead_time / total_time) * 100 if total_time > 0 else 0
     }
-    
-    # Create detailed metrics per process
-    detailed_metrics = []
-    for pid in sorted(completion_times.keys()):
-        detailed_metrics.append({
-            'pid': pid,
-            'arrival': process_dict[pid]['arrival'],
-            'burst': process_dict[pid]['burst'],
-            'completion': completion_times[pid],
-            'turnaround': turnaround_times[pid],
-            'waiting': waiting_times[pid]
-        })
-    
-    return summary, detailed_metrics
\ No newline at end of file
+    for percentile, value in zip(WAITING_PERCENTILES, np.percentile(waiting_times, WAITING_PERCENTILES)):
+        summary[f'p{percentile}_waiting_time'] = value.item()
+    if instrument is not None:
+        instrument.lap('metrics: summary')
+
+    if not detailed:
+        return summary, None
+
+    # Detailed metrics per process, ordered by pid
+    detailed_metrics = ProcessMetrics(scheduled_pids, arrivals, bursts, completion_times, turnaround_times,
+                                      waiting_times, response_times)
+    if instrument is not None:
+        instrument.lap('metrics: detailed')
+
+    return summary, detailed_metrics
+
+
+class ProcessMetrics(Sequence):
+    """
+    Per-process metrics as returned by calculate_metrics: a sequence of
+    dictionaries with the keys of PROCESS_METRICS, one per process, ordered
+    by pid.
+
+    The values are held as NumPy columns and a dictionary is only built when
+    a process is read, so a caller that only wants the summary, or a few
+    processes, does not pay for one dictionary per process. to_records()
+    returns them all as a list.
+    """
+
+    __slots__ = ('columns',)
+
+    def __init__(self, *columns):
+        """
+        Args:
+            *columns: One array per key of PROCESS_METRICS, in that order
+        """
+        self.columns = columns
+
+    def to_records(self):
+        """Return the metrics as a list of dictionaries."""
+        return [
+            {
+                'pid': pid,
+                'arrival': arrival,
+                'burst': burst,
+                'completion': completion,
+                'turnaround': turnaround,
+                'waiting': waiting,
+                'response': response
+            }
+            for pid, arrival, burst, completion, turnaround, waiting, response in zip(
+                *(column.tolist() for column in self.columns)
+            )
+        ]
+
+    def __len__(self):
+        return len(self.columns[0])
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return ProcessMetrics(*(column[index] for column in self.columns))
+        return dict(zip(PROCESS_METRICS, (column[index].item() for column in self.columns)))
+
+    def __iter__(self):
+        return iter(self.to_records())
+
+    def __eq__(self, other):
+        if isinstance(other, (ProcessMetrics, list, tuple)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __sizeof__(self):
+        return object.__sizeof__(self) + sum(column.nbytes for column in self.columns)
+
+    def __repr__(self):
+        return f"ProcessMetrics({len(self)} processes)"
+
+
+def _fill_columns(schedule, table):
+    """
+    Columns of a schedule with integer pids, read with np.fromiter.
+
+    Returns:
+        Tuple of arrays (pids, start_times, end_times), or None if the
+        segments do not fit the table's pid type
+    """
+    fields = [('pid', table.pid.dtype), ('start', np.float64), ('end', np.float64)]
+    fields += [(f'extra{i}', np.float64) for i in range(len(schedule[0]) - 3)]
+    try:
+        segments = np.fromiter(schedule, dtype=fields, count=len(schedule))
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+    pids, starts, ends = (np.ascontiguousarray(segments[name]) for name in ('pid', 'start', 'end'))
+    if table.arrival.dtype.kind in 'iu' and table.burst.dtype.kind in 'iu':
+        whole_starts, whole_ends = starts.astype(np.int64), ends.astype(np.int64)
+        if np.array_equal(whole_starts, starts) and np.array_equal(whole_ends, ends):
+            starts, ends = whole_starts, whole_ends
+    return pids, starts, ends
+
+
+def _group_by_pid(pids, starts, ends, table_size):
+    """
+    Reduce the schedule columns per pid.
+
+    Returns:
+        Tuple of arrays (pids, last end time, first start time), ordered by pid
+    """
+    # Small non-negative integer pids (the usual case) index the result
+    # arrays directly, which avoids sorting the segments
+    if pids.dtype.kind in 'iu' and pids.min() >= 0 and pids.max() < 2 * table_size + 1024:
+        size = pids.max().item() + 1
+        present = np.flatnonzero(np.bincount(pids, minlength=size))
+        completion_times = np.full(size, ends.min())
+        np.maximum.at(completion_times, pids, ends)
+        first_start_times = np.full(size, starts.max())
+        np.minimum.at(first_start_times, pids, starts)
+        return present.astype(pids.dtype), completion_times[present], first_start_times[present]
+
+    # Otherwise sort once and reduce over each run of equal pids
+    order = np.argsort(pids)
+    sorted_pids = pids[order]
+    group_starts = np.flatnonzero(np.r_[True, sorted_pids[1:] != sorted_pids[:-1]])
+    return (sorted_pids[group_starts],
+            np.maximum.reduceat(ends[order], group_starts),
+            np.minimum.reduceat(starts[order], group_starts))
@@ -0,0 +1,235 @@
+# algorithms/online_metrics.py
+
+import math
+
+from algorithms.overhead import OVERHEAD_PIDS
+
+# Waiting-time percentiles reported in the summary, as in calculate_metrics
+WAITING_PERCENTILES = (50, 95, 99)
+
+
+class QuantileSketch:
+    """
+    Streaming quantile estimate with a bounded relative error.
+
+    Values are counted in logarithmically sized buckets (the DDSketch scheme):
+    any quantile is returned within `relative_accuracy` of the exact value,
+    and the number of buckets only depends on the range of the values, not on
+    how many were added. Adding a value is O(1).
+    """
+
+    def __init__(self, relative_accuracy=0.01):
+        gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._gamma = gamma
+        self._log_gamma = math.log(gamma)
+        # Values in (-min_value, min_value) are counted as zero
+        self._min_value = 1e-9
+        self._positive = {}
+        self._negative = {}
+        self._zero = 0
+        self.count = 0
+
+    def add(self, value):
+        self.count += 1
+        if value > self._min_value:
+            key = math.ceil(math.log(value) / self._log_gamma)
+            self._positive[key] = self._positive.get(key, 0) + 1
+        elif value < -self._min_value:
+            key = math.ceil(math.log(-value) / self._log_gamma)
+            self._negative[key] = self._negative.get(key, 0) + 1
+        else:
+            self._zero += 1
+
+    def quantile(self, q):
+        """
+        Return the estimated q-quantile (0 <= q <= 1), or None if empty.
+        Like numpy.percentile, it interpolates linearly between the two
+        closest ranks.
+        """
+        if not self.count:
+            return None
+
+        rank = q * (self.count - 1)
+        lower_rank = int(rank)
+        upper_rank = min(lower_rank + 1, self.count - 1)
+        lower = upper = None
+        seen = 0
+        for value, count in self._buckets():
+            seen += count
+            if lower is None and seen > lower_rank:
+                lower = value
+            if seen > upper_rank:
+                upper = value
+                break
+        return lower + (upper - lower) * (rank - lower_rank)
+
+    def _buckets(self):
+        """Yield (representative value, count) from the lowest to the highest bucket."""
+        for key in sorted(self._negative, reverse=True):
+            yield -self._bucket_value(key), self._negative[key]
+        if self._zero:
+            yield 0, self._zero
+        for key in sorted(self._positive):
+            yield self._bucket_value(key), self._positive[key]
+
+    def _bucket_value(self, key):
+        # Midpoint (in relative terms) of the bucket (gamma^(key-1), gamma^key]
+        return 2 * self._gamma ** key / (self._gamma + 1)
+
+
+class RunningStatistic:
+    """Count, mean, minimum, maximum and quantile sketch of a value stream."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.minimum = None
+        self.maximum = None
+        self.sketch = QuantileSketch()
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+        self.sketch.add(value)
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0
+
+    def quantile(self, q):
+        # Clamp to the exact extremes so p0/p100 and tiny streams stay exact
+        value = self.sketch.quantile(q)
+        if value is None:
+            return None
+        return min(max(value, self.minimum), self.maximum)
+
+
+class OnlineMetrics:
+    """
+    Performance metrics updated one segment at a time.
+
+    Schedulers feed it as they run (the engines in algorithms.scheduling and
+    algorithms.streaming take a `metrics` argument),
+    so long simulations can report live metrics and finish without a second
+    pass over the schedule.
+    Only processes that have arrived but not yet completed are kept in memory;
+    every other statistic (running totals, extremes and a quantile sketch per
+    statistic) has a fixed size.
+
+    The summary has the same keys as calculate_metrics. Averages, utilization
+    and throughput are exact; percentiles are within 1% of the exact value.
+
+    Usage:
+        metrics = OnlineMetrics()
+        schedule = srtf(processes, metrics=metrics)
+        summary = metrics.summary()
+    """
+
+    def __init__(self):
+        # pid -> [arrival, burst, remaining, first_start] for in-flight processes
+        self._in_flight = {}
+        self.segments = 0
+        self.first_arrival = None
+        self.last_end = None
+        self.busy_time = 0
+        # Context-switch and dispatch-latency time, and process changes
+        self.overhead_time = 0
+        self.context_switches = 0
+        self._last_pid = None
+        self.waiting = RunningStatistic()
+        self.turnaround = RunningStatistic()
+        self.response = RunningStatistic()
+        # Completion time of the most recently completed process
+        self.last_completion = None
+
+    @property
+    def completed(self):
+        """Number of processes that have completed."""
+        return self.turnaround.count
+
+    @property
+    def in_flight(self):
+        """Number of processes that have arrived but not completed."""
+        return len(self._in_flight)
+
+    def add_process(self, pid, arrival, burst):
+        """Register a process when it arrives."""
+        self._in_flight[pid] = [arrival, burst, burst, None]
+        if self.first_arrival is None or arrival < self.first_arrival:
+            self.first_arrival = arrival
+
+    def start(self, time):
+        """
+        Start the observation window at `time` (normally the first arrival)
+        even if no process registered so far arrived that early, e.g. because
+        the engine skips processes without any work.
+        """
+        if self.first_arrival is None or time < self.first_arrival:
+            self.first_arrival = time
+
+    def add_segment(self, pid, start, end, completed=None):
+        """
+        Account for one schedule segment (pid, start_time, end_time).
+        Overhead segments (see algorithms.overhead.OVERHEAD_PIDS) only add
+        to the elapsed and the overhead time, unless their pid is that of an
+        arrived process.
+
+        Args:
+            completed: Whether the process finishes with this segment. Engines
+                that know pass it; if None, the process is complete once its
+                whole burst has been accounted for.
+        """
+        self.segments += 1
+        duration = end - start
+        if self.last_end is None or end > self.last_end:
+            self.last_end = end
+        if pid in OVERHEAD_PIDS and pid not in self._in_flight:
+            self.overhead_time += duration
+            return
+        self.busy_time += duration
+        if pid != self._last_pid:
+            if self._last_pid is not None:
+                self.context_switches += 1
+            self._last_pid = pid
+
+        state = self._in_flight[pid]
+        if state[3] is None:
+            state[3] = start
+        state[2] -= duration
+
+        if completed is None:
+            # A small tolerance absorbs float rounding of accumulated slices
+            completed = state[2] <= 1e-9 * max(state[1], 1)
+        if completed:
+            arrival, burst, _, first_start = self._in_flight.pop(pid)
+            turnaround = end - arrival
+            self.turnaround.add(turnaround)
+            self.waiting.add(turnaround - burst)
+            self.response.add(first_start - arrival)
+            self.last_completion = end
+
+    def summary(self):
+        """
+        Return the summary metrics of the completed processes so far, with the
+        keys used by calculate_metrics, or None before anything completed.
+        """
+        if not self.completed:
+            return None
+
+        total_time = self.last_end - self.first_arrival
+        summary = {
+            'avg_waiting_time': self.waiting.mean,
+            'avg_turnaround_time': self.turnaround.mean,
+            'avg_response_time': self.response.mean,
+            'cpu_utilization': (self.busy_time / total_time) * 100 if total_time > 0 else 0,
+            'throughput': self.completed / total_time if total_time > 0 else 0,
+            'context_switches': self.context_switches,
+            'switch_overhead': (self.overhead_time / total_time) * 100 if total_time > 0 else 0
+        }
+        for percentile in WAITING_PERCENTILES:
+            summary[f'p{percentile}_waiting_time'] = self.waiting.quantile(percentile / 100)
+        return summary
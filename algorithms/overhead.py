@@ -0,0 +1,55 @@
+# algorithms/overhead.py
+"""
+Pids of the context-switch and dispatch-latency segments.
+
+The engines in algorithms.scheduling put the overhead they charge into the
+schedule as segments of these sentinel pids. They live in this module,
+which imports no engine, so the metrics, the instrumentation and the charts
+can recognize overhead segments without loading the schedulers.
+
+Real processes may use these pids as long as no overhead is charged: the
+engines refuse to charge overhead for such a process set, and everything
+reading a schedule treats a sentinel pid that belongs to one of its
+processes as that process (see overhead_markers).
+"""
+CONTEXT_SWITCH_PID = -1
+DISPATCH_LATENCY_PID = -2
+OVERHEAD_PIDS = (CONTEXT_SWITCH_PID, DISPATCH_LATENCY_PID)
+
+_OVERHEAD_PID_SET = frozenset(OVERHEAD_PIDS)
+
+
+def check_pids(pids):
+    """
+    Check that overhead can be charged for a process set.
+
+    Args:
+        pids: Iterable of the process pids
+
+    Raises:
+        ValueError: If a process uses one of the OVERHEAD_PIDS, whose
+            segments could not be told from the overhead
+    """
+    if not _OVERHEAD_PID_SET.isdisjoint(pids):
+        clashes = sorted(_OVERHEAD_PID_SET.intersection(pids))
+        raise ValueError(f"Pids {clashes} mark overhead segments; renumber those processes to charge a switch "
+                         f"cost or dispatch latency")
+
+
+def overhead_markers(process_pids):
+    """
+    The OVERHEAD_PIDS that mark overhead in schedules of a process set, i.e.
+    those that are not also the pid of one of its processes.
+
+    Args:
+        process_pids: NumPy array of the process pids, e.g. ProcessTable.pid
+
+    Returns:
+        Tuple of pids
+    """
+    if process_pids.dtype.kind in 'iuf':
+        return tuple(pid for pid in OVERHEAD_PIDS if not (process_pids == pid).any())
+    if process_pids.dtype.kind in 'US':
+        return OVERHEAD_PIDS
+    present = set(process_pids.tolist())
+    return tuple(pid for pid in OVERHEAD_PIDS if pid not in present)
@@ -0,0 +1,160 @@
+# algorithms/process_table.py
+
+import hashlib
+
+import numpy as np
+
+COLUMNS = ('pid', 'arrival', 'burst', 'priority')
+
+
+class ProcessTable:
+    """
+    Columnar process set backed by contiguous NumPy arrays.
+
+    Holds one array per field (pid, arrival, burst, priority) instead of one
+    dictionary per process. Every scheduling algorithm, calculate_metrics and
+    compare_algorithms accept a ProcessTable directly; lists of process
+    dictionaries are converted through as_process_table.
+    """
+
+    __slots__ = ('pid', 'arrival', 'burst', 'priority', '_arrival_order', '_pid_order', '_arrival_sorted',
+                 '_fingerprint')
+
+    def __init__(self, pid, arrival, burst, priority=None):
+        """
+        Args:
+            pid: Sequence or array of process IDs
+            arrival: Sequence or array of arrival times
+            burst: Sequence or array of burst times
+            priority: Sequence or array of priorities (defaults to all zeros)
+        """
+        self.pid = np.asarray(pid)
+        self.arrival = np.asarray(arrival)
+        self.burst = np.asarray(burst)
+        self.priority = np.zeros(len(self.pid), dtype=np.int64) if priority is None else np.asarray(priority)
+
+        lengths = {len(self.pid), len(self.arrival), len(self.burst), len(self.priority)}
+        if len(lengths) != 1:
+            raise ValueError("All process table columns must have the same length")
+
+        # Stable arrival order and pid order, computed on first use and shared
+        # by every engine and metrics calculation on this table
+        self._arrival_order = None
+        self._pid_order = None
+        # True when the rows are already in arrival order (see sorted_by_arrival)
+        self._arrival_sorted = False
+        self._fingerprint = None
+
+    @classmethod
+    def from_records(cls, processes):
+        """
+        Build a table from a list of process dictionaries.
+
+        Args:
+            processes: List of dictionaries with 'pid', 'arrival', 'burst' and
+                optionally 'priority'
+        """
+        return cls(
+            [p['pid'] for p in processes],
+            [p['arrival'] for p in processes],
+            [p['burst'] for p in processes],
+            [p.get('priority', 0) for p in processes],
+        )
+
+    def to_records(self):
+        """Return the table as a list of process dictionaries."""
+        return [
+            {'pid': pid, 'arrival': arrival, 'burst': burst, 'priority': priority}
+            for pid, arrival, burst, priority in zip(
+                self.pid.tolist(), self.arrival.tolist(), self.burst.tolist(), self.priority.tolist()
+            )
+        ]
+
+    def arrival_order(self):
+        """
+        Indices that sort the table by arrival time. The sort is stable, so
+        processes arriving together keep their table order, exactly like
+        sorting the equivalent list of dictionaries.
+        """
+        if self._arrival_order is None:
+            if self._arrival_sorted:
+                self._arrival_order = np.arange(len(self))
+            else:
+                self._arrival_order = np.argsort(self.arrival, kind='stable')
+        return self._arrival_order
+
+    def pid_order(self):
+        """Indices that sort the table by pid, used for metric lookups."""
+        if self._pid_order is None:
+            self._pid_order = np.argsort(self.pid, kind='stable')
+        return self._pid_order
+
+    def fingerprint(self):
+        """
+        Hash of the table's contents (every column, in row order), computed
+        on first use. Equal process sets in the same order have equal
+        fingerprints, e.g. to key cached results (see algorithms.cache).
+        """
+        if self._fingerprint is None:
+            digest = hashlib.blake2b(str(len(self)).encode(), digest_size=16)
+            for column in (self.pid, self.arrival, self.burst, self.priority):
+                column = np.ascontiguousarray(column)
+                digest.update(column.dtype.str.encode())
+                digest.update(column.tobytes() if column.dtype.kind != 'O' else repr(column.tolist()).encode())
+            self._fingerprint = digest.hexdigest()
+        return self._fingerprint
+
+    def sorted_by_arrival(self):
+        """
+        Return a copy of the table with its rows in arrival order.
+
+        Engines skip the sort and the reordering step on such a table, which
+        pays off when the same process set is simulated many times.
+        """
+        if self._arrival_sorted:
+            return self
+        order = self.arrival_order()
+        table = ProcessTable(self.pid[order], self.arrival[order], self.burst[order], self.priority[order])
+        table._arrival_sorted = True
+        return table
+
+    def sorted_columns(self, *columns):
+        """
+        Return the requested columns as Python lists in arrival order.
+
+        The engines iterate element by element, where Python scalars are much
+        faster than NumPy scalars, so the columns are converted once per run.
+        """
+        if self._arrival_sorted:
+            return tuple(getattr(self, column).tolist() for column in columns)
+        order = self.arrival_order()
+        return tuple(getattr(self, column)[order].tolist() for column in columns)
+
+    def __getstate__(self):
+        # Pickle only the columns (as raw array buffers); cached orders are
+        # cheap to recompute and would double the payload sent to workers
+        return (self.pid, self.arrival, self.burst, self.priority, self._arrival_sorted)
+
+    def __setstate__(self, state):
+        self.pid, self.arrival, self.burst, self.priority, self._arrival_sorted = state
+        self._arrival_order = None
+        self._pid_order = None
+        self._fingerprint = None
+
+    def __len__(self):
+        return len(self.pid)
+
+    def __repr__(self):
+        return f"ProcessTable({len(self)} processes)"
+
+
+def as_process_table(processes):
+    """
+    Return processes as a ProcessTable without copying if it already is one.
+
+    Args:
+        processes: ProcessTable or list of process dictionaries
+    """
+    if isinstance(processes, ProcessTable):
+        return processes
+    return ProcessTable.from_records(processes)
@@ -0,0 +1,234 @@
+# algorithms/registry.py
+"""
+Registry of the scheduling engines.
+
+Every engine is registered once with its display name, its parameters and
+defaults, and its capabilities; the controller, the comparison, the
+command-line runner and the GUI are all driven from here. Engines are named
+by "module:function" strings and imported on first use, so importing the
+registry costs nothing.
+
+Adding an engine:
+    register(Scheduler("Lottery", "mypackage.lottery:lottery", "Random, weighted by tickets",
+                       parameters={"seed": None}, preemptive=True))
+
+Running one:
+    schedule = get_scheduler("Round Robin").run(processes, time_quantum=4)
+"""
+import importlib
+
+# Registered schedulers by name, in display order
+SCHEDULERS = {}
+
+# Run-queue layouts of multi-CPU runs (see algorithms.smp)
+QUEUE_MODES = ('global', 'per-core')
+
+
+class Scheduler:
+    """
+    A registered scheduling engine.
+
+    The engine is called as engine(processes, metrics=..., switch_cost=...,
+    dispatch_latency=..., **options, **parameters), so it must accept those
+    keyword arguments like the engines of algorithms.scheduling.
+    """
+
+    def __init__(self, name, engine, description="", parameters=None, options=None, preemptive=False,
+                 stream_engine=None, smp_policy=None, compared=True):
+        """
+        Args:
+            name: Display name, e.g. "Round Robin"
+            engine: "module:function" of the engine
+            description: One-line description for help texts
+            parameters: Dictionary of the engine's tunable keyword
+                arguments and their defaults; 'quantum' marks engines that
+                take the time quantum
+            options: Fixed keyword arguments selecting this variant of the
+                engine, e.g. {"preemptive": True}
+            preemptive: Whether a running process can lose the CPU before
+                it completes
+            stream_engine: "module:function" of a streaming engine
+                (see algorithms.streaming), if there is one; it is called
+                like the engine, with an iterator of records for processes
+            smp_policy: algorithms.smp policy simulating this algorithm on
+                several CPUs, if there is one
+            compared: Whether compare_algorithms includes it by default
+        """
+        self.name = name
+        self.engine = engine
+        self.description = description
+        self.parameters = dict(parameters or {})
+        self.options = dict(options or {})
+        self.preemptive = preemptive
+        self.stream_engine = stream_engine
+        self.smp_policy = smp_policy
+        self.compared = compared
+
+    @property
+    def needs_quantum(self):
+        return "quantum" in self.parameters
+
+    @property
+    def streaming(self):
+        return self.stream_engine is not None
+
+    def load(self):
+        """The engine function, imported on first use."""
+        return _load(self.engine)
+
+    def run(self, processes, time_quantum=None, metrics=None, switch_cost=0, dispatch_latency=0, **parameters):
+        """
+        Run the engine.
+
+        Args:
+            processes: ProcessTable or list of process dictionaries
+            time_quantum: Time quantum, used if the engine takes one
+                (default: its declared default)
+            metrics: Optional OnlineMetrics (or RunControl, Instrumentation)
+            switch_cost: Time charged per context switch
+            dispatch_latency: Time charged per dispatch
+            **parameters: Declared parameters; None keeps the default
+
+        Returns:
+            The engine's schedule
+
+        Raises:
+            ValueError: For a parameter the engine does not declare
+        """
+        arguments = self.arguments(parameters)
+        if self.needs_quantum and time_quantum is not None:
+            arguments["quantum"] = time_quantum
+        return self.load()(processes, metrics=metrics, switch_cost=switch_cost, dispatch_latency=dispatch_latency,
+                           **self.options, **arguments)
+
+    def stream(self, records, time_quantum=None, metrics=None, switch_cost=0, dispatch_latency=0, **parameters):
+        """
+        Run the streaming engine over arrival-sorted records. It takes the
+        same arguments as the engine.
+
+        Returns:
+            Iterator of schedule segments
+
+        Raises:
+            ValueError: If the algorithm has no streaming engine, or for an
+                undeclared parameter
+        """
+        if self.stream_engine is None:
+            raise ValueError(f"No streaming engine for '{self.name}', choose from: "
+                             f"{', '.join(scheduler_names(streaming=True))}")
+        arguments = self.arguments(parameters)
+        if self.needs_quantum and time_quantum is not None:
+            arguments["quantum"] = time_quantum
+        return _load(self.stream_engine)(records, metrics=metrics, switch_cost=switch_cost,
+                                         dispatch_latency=dispatch_latency, **self.options, **arguments)
+
+    def arguments(self, parameters):
+        """
+        The engine's parameters: the declared defaults, overridden by the
+        given values that are not None.
+
+        Raises:
+            ValueError: For a parameter the engine does not declare
+        """
+        arguments = dict(self.parameters)
+        for name, value in parameters.items():
+            if name not in arguments:
+                raise ValueError(f"{self.name} takes no parameter '{name}'")
+            if value is not None:
+                arguments[name] = value
+        return arguments
+
+    def __repr__(self):
+        return f"Scheduler({self.name!r}, {self.engine!r})"
+
+
+# Imported engine functions by "module:function"
+_engines = {}
+
+
+def _load(path):
+    engine = _engines.get(path)
+    if engine is None:
+        module, _, function = path.partition(":")
+        engine = _engines[path] = getattr(importlib.import_module(module), function)
+    return engine
+
+
+def register(scheduler, replace=False):
+    """
+    Add a scheduler to the registry, after the ones already registered.
+
+    Raises:
+        ValueError: If the name is taken and replace is False
+    """
+    if scheduler.name in SCHEDULERS and not replace:
+        raise ValueError(f"A scheduler named '{scheduler.name}' is already registered")
+    SCHEDULERS[scheduler.name] = scheduler
+    return scheduler
+
+
+def get_scheduler(name):
+    """
+    Look up a registered scheduler by name.
+
+    Raises:
+        ValueError: If no scheduler has that name
+    """
+    scheduler = SCHEDULERS.get(name)
+    if scheduler is None:
+        raise ValueError(f"Unknown algorithm '{name}', choose from: {', '.join(SCHEDULERS)}")
+    return scheduler
+
+
+def scheduler_names(**capabilities):
+    """
+    Names of the registered schedulers, in display order, optionally only
+    those with the given capabilities, e.g. scheduler_names(streaming=True)
+    or scheduler_names(needs_quantum=True).
+    """
+    return [name for name, scheduler in SCHEDULERS.items()
+            if all(getattr(scheduler, capability) == value for capability, value in capabilities.items())]
+
+
+register(Scheduler(
+    "FCFS", "algorithms.scheduling:fcfs",
+    "First-Come-First-Serve - Non-preemptive, processes scheduled in arrival order",
+    stream_engine="algorithms.streaming:stream_fcfs", smp_policy="fcfs",
+))
+register(Scheduler(
+    "SJF", "algorithms.scheduling:optimized_sjf",
+    "Shortest Job First - Non-preemptive, processes with shortest burst time first",
+    stream_engine="algorithms.streaming:stream_sjf", smp_policy="sjf",
+))
+register(Scheduler(
+    "SRTF", "algorithms.scheduling:srtf",
+    "Shortest Remaining Time First - Preemptive version of SJF",
+    preemptive=True, smp_policy="srtf",
+))
+register(Scheduler(
+    "Round Robin", "algorithms.scheduling:optimized_round_robin",
+    "Time-sliced scheduling with a quantum",
+    parameters={"quantum": 2}, preemptive=True,
+    stream_engine="algorithms.streaming:stream_round_robin", smp_policy="rr",
+))
+register(Scheduler(
+    "Priority", "algorithms.scheduling:priority_scheduling",
+    "Non-preemptive scheduling based on priority values",
+    parameters={"aging": 0}, stream_engine="algorithms.streaming:stream_priority", smp_policy="priority",
+))
+register(Scheduler(
+    "Priority (Preemptive)", "algorithms.scheduling:priority_scheduling",
+    "A higher-priority arrival preempts the running process",
+    parameters={"aging": 0}, options={"preemptive": True}, preemptive=True,
+    smp_policy="priority-preemptive", compared=False,
+))
+register(Scheduler(
+    "MLFQ", "algorithms.scheduling:mlfq",
+    "Multilevel feedback queue - the quantum doubles per level, processes using theirs move down",
+    parameters={"quantum": 2, "levels": 3, "boost_interval": None}, preemptive=True,
+))
+register(Scheduler(
+    "CFS", "algorithms.scheduling:cfs",
+    "Completely Fair Scheduler - the least CPU time weighted by priority runs next",
+    parameters={"target_latency": 8, "min_granularity": 1}, preemptive=True,
+))
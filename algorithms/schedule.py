@@ -0,0 +1,85 @@
+# algorithms/schedule.py
+"""
+Columnar schedules.
+
+The engines in algorithms.scheduling append every segment to three lists
+(pid, start_time, end_time) instead of appending one tuple per segment, and
+return them as a Schedule of three read-only NumPy columns. A Schedule reads
+like the list of (pid, start_time, end_time) tuples it replaces (len,
+indexing, iteration, comparison with a list), while calculate_metrics and the
+Gantt chart take its columns as they are, without a step per segment.
+"""
+from collections.abc import Sequence
+
+import numpy as np
+
+
+class Schedule(Sequence):
+    """
+    Schedule segments (pid, start_time, end_time) held as three NumPy columns,
+    the attributes pid, start and end.
+
+    Indexing and iteration return segment tuples of Python values, slicing
+    returns a Schedule.
+    """
+
+    __slots__ = ('pid', 'start', 'end')
+
+    def __init__(self, pid=(), start=(), end=()):
+        """
+        Args:
+            pid: Sequence of the segments' pids, e.g. the list an engine
+                appended to
+            start: Sequence of their start times
+            end: Sequence of their end times
+        """
+        self.pid = _column(pid)
+        self.start = _column(start)
+        self.end = _column(end)
+
+    def arrays(self):
+        """The columns as a tuple of arrays (pids, start_times, end_times)."""
+        return self.pid, self.start, self.end
+
+    def __len__(self):
+        return len(self.pid)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            schedule = Schedule.__new__(Schedule)
+            schedule.pid, schedule.start, schedule.end = self.pid[index], self.start[index], self.end[index]
+            return schedule
+        return tuple(_value(column[index]) for column in (self.pid, self.start, self.end))
+
+    def __iter__(self):
+        return zip(self.pid.tolist(), self.start.tolist(), self.end.tolist())
+
+    def __eq__(self, other):
+        if isinstance(other, (Schedule, list, tuple)):
+            return len(self) == len(other) and all(a == tuple(b) for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __sizeof__(self):
+        return object.__sizeof__(self) + self.pid.nbytes + self.start.nbytes + self.end.nbytes
+
+    def __repr__(self):
+        return f"Schedule({len(self)} segments)"
+
+
+def _column(values):
+    """
+    Read-only array of a column. String pids among the integer pids of
+    overhead segments make an object array rather than strings.
+    """
+    column = np.array(values)
+    if column.dtype.kind in 'US' and not all(isinstance(value, str) for value in values):
+        column = np.array(values, dtype=object)
+    column.flags.writeable = False
+    return column
+
+
+def _value(item):
+    """A column element as a Python value."""
+    return item.item() if isinstance(item, np.generic) else item
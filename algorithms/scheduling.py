@@ -1,274 +1,983 @@
-from queue import PriorityQueue
-
-def fcfs(processes):
-    """
-    First-Come-First-Serve scheduling algorithm.
-    Processes are scheduled in order of arrival.
+import heapq
+from collections import deque
+
+from algorithms.overhead import CONTEXT_SWITCH_PID, DISPATCH_LATENCY_PID, OVERHEAD_PIDS, check_pids
+from algorithms.process_table import as_process_table
+from algorithms.schedule import Schedule
+
+# Every algorithm accepts a ProcessTable or a list of process dictionaries and
+# works on its columns in arrival order, as Python lists or as rows, so the
+# input is never modified.
+#
+# FCFS, SJF and SRTF, non-preemptive Priority and Round Robin run on a core
+# that consumes an iterator of arrival-sorted rows (pid, arrival, burst,
+# priority) and holds only the ready queue. The list-based functions feed it
+# the rows of the process table, the streaming engines of algorithms.streaming
+# those of a trace read one record at a time. A core is a generator: it yields
+# before every dispatch, when the segments decided so far are in the column
+# lists, so the caller can take them out as it goes. The non-preemptive cores
+# yield a checkpoint there and can resume from one (see
+# algorithms.incremental).
+#
+# Every algorithm appends the segments it decides to three column lists (pid,
+# start_time, end_time), which is cheaper than a tuple per segment, and
+# returns them as a Schedule (see algorithms.schedule), whose NumPy columns
+# the metrics and the charts read without a per-segment conversion.
+#
+# Every algorithm also takes an optional `metrics` accumulator (see
+# algorithms.online_metrics.OnlineMetrics), which is told about each process
+# when it arrives and each segment as it is produced.
+#
+# A context-switch cost and a dispatch latency can be charged on every
+# dispatch of a process other than the one that last ran: the switch cost
+# when the CPU moves from one process to another, the dispatch latency on
+# every such dispatch including the first. They appear in the schedule as
+# segments of the sentinel pids below, so charging overhead raises a
+# ValueError for processes using those pids. Without overhead the schedules
+# are unchanged. The pids of the overhead segments are defined in
+# algorithms.overhead.
+
+
+def _charge_dispatch(result, time, switch, switch_cost, dispatch_latency, metrics):
     """
-    processes.sort(key=lambda x: x['arrival'])
-    start_time, result = 0, []
-    for process in processes:
-        start_time = max(start_time, process['arrival'])
-        result.append((process['pid'], start_time, start_time + process['burst']))
-        start_time += process['burst']
-    return result
+    Append the overhead segments of one dispatch to result, the schedule's
+    column lists (pids, start_times, end_times).
 
+    Args:
+        switch: Whether another process ran before, so a context switch is due
 
-def optimized_sjf(processes):
-    """
-    Optimized Shortest Job First using a priority queue for better performance.
+    Returns:
+        Time at which the dispatched process starts running
     """
-    if not processes:
-        return []
+    for pid, cost in ((CONTEXT_SWITCH_PID, switch_cost if switch else 0), (DISPATCH_LATENCY_PID, dispatch_latency)):
+        if cost:
+            result[0].append(pid)
+            result[1].append(time)
+            result[2].append(time + cost)
+            if metrics is not None:
+                metrics.add_segment(pid, time, time + cost, False)
+            time += cost
+    return time
 
-    # Create a copy of processes to avoid modifying the original data
-    processes = [p.copy() for p in processes]
 
-    # Sort by arrival time
-    processes.sort(key=lambda x: x['arrival'])
+def _rows(processes):
+    """Arrival-sorted rows (pid, arrival, burst, priority) of the processes."""
+    return zip(*as_process_table(processes).sorted_columns('pid', 'arrival', 'burst', 'priority'))
 
-    result = []
-    time = processes[0]['arrival']
-    pq = PriorityQueue()  # Priority queue for ready processes
-    next_process_idx = 0
 
-    while next_process_idx < len(processes) or not pq.empty():
-        # Add all processes that have arrived to the priority queue
-        while next_process_idx < len(processes) and processes[next_process_idx]['arrival'] <= time:
-            # Queue contains (burst_time, arrival_time, process_id)
-            # Arrival time is used as a tie-breaker
-            p = processes[next_process_idx]
-            pq.put((p['burst'], p['arrival'], p['pid']))
-            next_process_idx += 1
+def _checked(rows):
+    """Pass rows through, raising a ValueError for a pid that marks overhead (see check_pids)."""
+    for row in rows:
+        check_pids(row[:1])
+        yield row
 
-        if pq.empty():
-            # If no process is ready, jump to the next arrival
-            if next_process_idx < len(processes):
-                time = processes[next_process_idx]['arrival']
-                continue
-            else:
-                break
 
-        # Get the process with the shortest burst time
-        burst, arrival, pid = pq.get()
+def _finish(core, result):
+    """Run an engine core to the end and return the Schedule of its column lists."""
+    deque(core, maxlen=0)
+    return Schedule(*result)
 
-        # Add to result
-        result.append((pid, time, time + burst))
 
-        # Update time
-        time += burst
+def fcfs(processes, metrics=None, switch_cost=0, dispatch_latency=0):
+    """
+    First-Come-First-Serve scheduling algorithm.
+    Processes are scheduled in order of arrival.
+    """
+    result = ([], [], [])
+    return _finish(fcfs_core(_rows(processes), result, metrics, switch_cost, dispatch_latency), result)
+
 
-    return result
+def fcfs_core(rows, result, metrics=None, switch_cost=0, dispatch_latency=0, resume=None):
+    """
+    Core of fcfs over an iterator of arrival-sorted rows (pid, arrival,
+    burst, priority).
+
+    Args:
+        rows: Iterable of rows, consumed one dispatch at a time
+        result: Column lists (pids, start_times, end_times) the segments are
+            appended to
+        resume: Checkpoint to continue from, see shortest_job_core; nothing
+            waits in FCFS, so the taken rows are exactly those dispatched
+
+    Yields:
+        Checkpoint (time, taken, order) before every dispatch, as in
+        shortest_job_core
+    """
+    add_pid, add_start, add_end = (column.append for column in result)
+    start_time, taken, _, switch = resume if resume is not None else (0, 0, (), False)
+    overhead = bool(switch_cost or dispatch_latency)
+    if overhead:
+        rows = _checked(rows)
+    for taken, (pid, arrival, burst, _) in enumerate(rows, taken):
+        start_time = max(start_time, arrival)
+        yield start_time, taken, taken
+        if overhead:
+            start_time = _charge_dispatch(result, start_time, switch, switch_cost, dispatch_latency, metrics)
+            switch = True
+        add_pid(pid)
+        add_start(start_time)
+        add_end(start_time + burst)
+        if metrics is not None:
+            metrics.add_process(pid, arrival, burst)
+            metrics.add_segment(pid, start_time, start_time + burst, True)
+        start_time += burst
+
+
+def optimized_sjf(processes, preemptive=False, metrics=None, switch_cost=0, dispatch_latency=0):
+    """
+    Optimized Shortest Job First using a heapq-based ready queue.
+
+    Args:
+        processes: ProcessTable or list of process dictionaries
+        preemptive: If True, run the preemptive variant (Shortest Remaining
+            Time First), where an arrival with a shorter burst than the
+            remaining time of the running process preempts it
+        metrics: Optional OnlineMetrics updated as the schedule is produced
+        switch_cost: Time charged per context switch
+        dispatch_latency: Time charged per dispatch
+
+    Returns:
+        Schedule of the segments (pid, start_time, end_time)
+    """
+    result = ([], [], [])
+    return _finish(shortest_job_core(_rows(processes), result, preemptive, metrics, switch_cost, dispatch_latency),
+                   result)
 
 
-def srtf(processes):
+def srtf(processes, metrics=None, switch_cost=0, dispatch_latency=0):
     """
     Shortest Remaining Time First (Preemptive SJF) algorithm implementation.
-    Fixed to correctly handle process preemption and Gantt chart creation.
     """
-    if not processes:
-        return []
-
-    # Create a copy of processes to avoid modifying the original data
-    processes = [p.copy() for p in processes]
-
-    # Sort processes by arrival time
-    processes.sort(key=lambda x: x['arrival'])
-
-    # Initialize variables
-    n = len(processes)
-    current_time = processes[0]['arrival']
-    completed = 0
-    remaining_time = {p['pid']: p['burst'] for p in processes}
-
-    # To track if a process is in the result already
-    last_scheduled = None
-    result = []
-
-    while completed < n:
-        # Find the process with minimum remaining time among the arrived processes
-        min_remaining = float('inf')
-        selected_pid = None
-
-        for process in processes:
-            if process['arrival'] <= current_time and remaining_time[process['pid']] > 0:
-                if remaining_time[process['pid']] < min_remaining:
-                    min_remaining = remaining_time[process['pid']]
-                    selected_pid = process['pid']
-
-        # If no process is available, jump to the next arrival time
-        if selected_pid is None:
-            next_arrival = float('inf')
-            for process in processes:
-                if process['arrival'] > current_time and remaining_time[process['pid']] > 0:
-                    next_arrival = min(next_arrival, process['arrival'])
-
-            if next_arrival == float('inf'):
-                break  # No more processes to execute
-
-            current_time = next_arrival
+    return optimized_sjf(processes, preemptive=True, metrics=metrics, switch_cost=switch_cost,
+                         dispatch_latency=dispatch_latency)
+
+
+def shortest_job_core(rows, result, preemptive=False, metrics=None, switch_cost=0, dispatch_latency=0,
+                      resume=None):
+    """
+    Event-driven core shared by SJF and SRTF, over an iterator of
+    arrival-sorted rows (pid, arrival, burst, priority).
+
+    Arrived processes wait in a min-heap keyed by (remaining time, arrival,
+    tie-breaker) and new arrivals are taken from the rows as the clock
+    passes them, so every dispatch or preemption decision costs O(log n).
+    Non-preemptive mode breaks ties by pid, preemptive mode by arrival
+    order, matching the established output of each algorithm.
+
+    In preemptive mode, processes arriving during a switch are considered
+    as soon as it ends, and may preempt the process just switched to.
+
+    A non-preemptive schedule depends on the rows arriving after a dispatch
+    only through the dispatches after it, so it can be resumed from the
+    checkpoint of any dispatch with the rows from there on changed.
+
+    Args:
+        rows: Iterable of rows, consumed as the processes arrive
+        result: Column lists (pids, start_times, end_times) the segments are
+            appended to
+        resume: Non-preemptive mode only: checkpoint to continue from, a
+            tuple (time, taken, waiting, switch) of the clock, the number of
+            rows taken before (rows holds the ones after them), the
+            (arrival order, row) pairs waiting in the ready queue and whether
+            a process ran before. Metrics only receive the events from there
+            on.
+
+    Yields:
+        In non-preemptive mode, checkpoint (time, taken, order) before every
+        dispatch: the clock, the number of rows taken so far and the arrival
+        order of the process dispatched. None before every step in preemptive
+        mode, where the last segment may still be extended by the next one.
+
+    Raises:
+        ValueError: For a resume in preemptive mode
+    """
+    if resume is not None and preemptive:
+        raise ValueError("Only a non-preemptive schedule can be resumed")
+    rows = _checked(rows) if switch_cost or dispatch_latency else iter(rows)
+    upcoming = next(rows, None)
+    if resume is None:
+        if upcoming is None:
+            return
+        current_time, order, waiting, switch = upcoming[1], 0, (), False
+    else:
+        current_time, order, waiting, switch = resume
+    # order: arrival order of the upcoming row, i.e. the number of rows taken
+
+    # Heap of (remaining_time, arrival_time, pid, arrival_order), or of
+    # (remaining_time, arrival_time, arrival_order, pid) in preemptive mode
+    ready_heap = [(burst, arrival, pid, idx) for idx, (pid, arrival, burst, _) in waiting]
+    heapq.heapify(ready_heap)
+    add_pid, add_start, add_end = (column.append for column in result)
+    pids, ends = result[0], result[2]
+    overhead = bool(switch_cost or dispatch_latency)
+    # Arrival order of the process whose context is on the CPU (preemptive mode)
+    loaded = None
+    if metrics is not None and resume is None:
+        # Zero-burst processes may never be registered but still open the window
+        metrics.start(current_time)
+
+    while True:
+        # Add all processes that have arrived to the heap
+        while upcoming is not None and upcoming[1] <= current_time:
+            pid, arrival, burst, _ = upcoming
+            if not preemptive:
+                heapq.heappush(ready_heap, (burst, arrival, pid, order))
+            elif burst > 0:
+                # Processes without any work never occupy the CPU
+                heapq.heappush(ready_heap, (burst, arrival, order, pid))
+            if metrics is not None and (burst > 0 or not preemptive):
+                metrics.add_process(pid, arrival, burst)
+            order += 1
+            upcoming = next(rows, None)
+
+        if not ready_heap:
+            # If no process is ready, jump to the next arrival
+            if upcoming is not None:
+                current_time = upcoming[1]
+                continue
+            break  # No more processes to execute
+
+        if not preemptive:
+            # Run the process with the shortest burst time to completion
+            burst, _, pid, idx = heapq.heappop(ready_heap)
+            yield current_time, order, idx
+            if overhead:
+                current_time = _charge_dispatch(result, current_time, switch, switch_cost, dispatch_latency,
+                                                metrics)
+                switch = True
+            add_pid(pid)
+            add_start(current_time)
+            add_end(current_time + burst)
+            if metrics is not None:
+                metrics.add_segment(pid, current_time, current_time + burst, True)
+            current_time += burst
             continue
 
-        # If there's a context switch, end the previous process's execution segment
-        if last_scheduled is not None and last_scheduled != selected_pid and result and result[-1][0] == last_scheduled:
-            result[-1] = (result[-1][0], result[-1][1], current_time)
-
-        # If starting a new process or resuming after preemption
-        if last_scheduled != selected_pid:
-            result.append((selected_pid, current_time, None))  # End time will be filled later
-
-        # Determine how long this process will run
-        next_event_time = float('inf')
-
-        # Check if another process will arrive before this one finishes
-        for process in processes:
-            if process['arrival'] > current_time and process['arrival'] < current_time + remaining_time[selected_pid]:
-                next_event_time = min(next_event_time, process['arrival'])
-
-        # Calculate execution time for this segment
-        execution_time = min(remaining_time[selected_pid],
-                             next_event_time - current_time if next_event_time != float('inf') else remaining_time[
-                                 selected_pid])
-
-        # Update current time and remaining time
-        current_time += execution_time
-        remaining_time[selected_pid] -= execution_time
-
-        # If the process just finished
-        if remaining_time[selected_pid] == 0:
-            completed += 1
-            # Complete the last entry
-            result[-1] = (result[-1][0], result[-1][1], current_time)
-            last_scheduled = None
+        yield
+        # The process with minimum remaining time stays on top of the heap
+        remaining, arrival, idx, pid = ready_heap[0]
+        if overhead and idx != loaded:
+            current_time = _charge_dispatch(result, current_time, loaded is not None, switch_cost,
+                                            dispatch_latency, metrics)
+            loaded = idx
+            # Take the arrivals during the switch into account first
+            continue
+        start_time = current_time
+
+        if upcoming is not None and upcoming[1] < current_time + remaining:
+            # Run until the next arrival, which may preempt this process
+            execution_time = upcoming[1] - current_time
+            current_time += execution_time
+            heapq.heapreplace(ready_heap, (remaining - execution_time, arrival, idx, pid))
+            completed = False
         else:
-            last_scheduled = selected_pid
-            # If we're approaching a new arrival, we need to close this segment
-            if next_event_time != float('inf'):
-                result[-1] = (result[-1][0], result[-1][1], current_time)
-
-    # Make sure all segments have end times
-    for i in range(len(result)):
-        if result[i][2] is None:
-            result[i] = (result[i][0], result[i][1], current_time)
-
-    # Merge consecutive segments for the same process
-    merged_result = []
-    for pid, start, end in result:
-        if merged_result and merged_result[-1][0] == pid and merged_result[-1][2] == start:
-            merged_result[-1] = (pid, merged_result[-1][1], end)
+            # Nothing arrives before this process finishes
+            current_time += remaining
+            heapq.heappop(ready_heap)
+            completed = True
+
+        # Extend the previous segment if the same process keeps the CPU
+        if ends and ends[-1] == start_time and pids[-1] == pid:
+            ends[-1] = current_time
         else:
-            merged_result.append((pid, start, end))
+            add_pid(pid)
+            add_start(start_time)
+            add_end(current_time)
+        if metrics is not None:
+            metrics.add_segment(pid, start_time, current_time, completed)
 
-    return merged_result
 
-
-def optimized_round_robin(processes, quantum):
+def optimized_round_robin(processes, quantum, metrics=None, switch_cost=0, dispatch_latency=0):
     """
     Optimized Round Robin scheduling algorithm that avoids unnecessary iterations
     by jumping to the next event (arrival or quantum completion) rather than
     incrementing time one by one.
+
+    The ready queue is a deque, so every dispatch is O(1). Whenever no arrival
+    can change the rotation, the engine computes how many whole rounds every
+    ready process survives and emits those rounds in bulk instead of dispatching
+    them one quantum at a time (only without switch cost and dispatch latency,
+    which every dispatch in a rotation of several processes pays).
+
+    Raises:
+        ValueError: For a non-positive quantum
     """
-    if not processes:
-        return []
+    result = ([], [], [])
+    deque(round_robin_core(_rows(processes), result, quantum, metrics, switch_cost, dispatch_latency), maxlen=0)
+    if processes and not result[0]:
+        # Ensure non-empty result to avoid plotting errors
+        return Schedule([0], [0], [0])
+    return Schedule(*result)
 
-    # Create a copy of processes to avoid modifying the original data
-    processes = [p.copy() for p in processes]
 
-    # Sort processes by arrival time
-    processes.sort(key=lambda x: x['arrival'])
+def round_robin_core(rows, result, quantum, metrics=None, switch_cost=0, dispatch_latency=0, bulk_limit=None):
+    """
+    Core of optimized_round_robin over an iterator of arrival-sorted rows
+    (pid, arrival, burst, priority).
 
-    # Initialize variables
-    result = []
-    ready_queue = []  # Processes that have arrived and are waiting for CPU
-    time = processes[0]['arrival']  # Start time is the earliest arrival
-    remaining_burst = {p['pid']: p['burst'] for p in processes}
-    remaining_processes = len(processes)
-    next_arrival_idx = 0
+    Args:
+        rows: Iterable of rows, consumed as the processes arrive
+        result: Column lists (pids, start_times, end_times) the segments are
+            appended to
+        bulk_limit: Most segments appended by one bulk emission of full
+            rounds (default: no limit)
 
-    while remaining_processes > 0:
+    Yields:
+        None before every dispatch or bulk emission
+
+    Raises:
+        ValueError: For a non-positive quantum
+    """
+    if quantum <= 0:
+        raise ValueError("Time quantum must be positive")
+    rows = _checked(rows) if switch_cost or dispatch_latency else iter(rows)
+    upcoming = next(rows, None)
+    if upcoming is None:
+        return
+
+    add_pid, add_start, add_end = (column.append for column in result)
+    ready_queue = deque()  # [pid, remaining_burst] of processes waiting for CPU
+    time = upcoming[1]  # Start time is the earliest arrival
+    # Dispatches since the last bulk-round check; checking at most once per
+    # rotation keeps the O(len(ready_queue)) check amortized O(1) per dispatch
+    dispatches_since_check = 0
+    overhead = bool(switch_cost or dispatch_latency)
+    loaded = None  # Ready-queue entry of the process whose context is on the CPU
+
+    while True:
         # Add newly arrived processes to the ready queue
-        while next_arrival_idx < len(processes) and processes[next_arrival_idx]['arrival'] <= time:
-            ready_queue.append(processes[next_arrival_idx])
-            next_arrival_idx += 1
+        while upcoming is not None and upcoming[1] <= time:
+            pid, arrival, burst, _ = upcoming
+            ready_queue.append([pid, burst])
+            if metrics is not None:
+                metrics.add_process(pid, arrival, burst)
+            upcoming = next(rows, None)
 
         if not ready_queue:
             # If no process is in the ready queue, jump to the next arrival time
-            if next_arrival_idx < len(processes):
-                time = processes[next_arrival_idx]['arrival']
+            if upcoming is not None:
+                time = upcoming[1]
+                continue
+            break  # No more processes to execute
+
+        yield
+        if not overhead and dispatches_since_check >= len(ready_queue):
+            dispatches_since_check = 0
+            rounds = _full_rounds([entry[1] for entry in ready_queue], quantum, time,
+                                  upcoming[1] if upcoming is not None else None)
+            if rounds > 0:
+                if bulk_limit is not None and rounds * len(ready_queue) > bulk_limit:
+                    rounds = max(1, bulk_limit // len(ready_queue))
+                    # Check again right after these rounds
+                    dispatches_since_check = len(ready_queue)
+                time = _emit_full_rounds(result, ready_queue, quantum, time, rounds, metrics)
                 continue
-            else:
-                break  # No more processes to execute
 
         # Get the next process from the ready queue
-        current_process = ready_queue.pop(0)
-        pid = current_process['pid']
+        entry = ready_queue.popleft()
+        pid = entry[0]
+        dispatches_since_check += 1
+        if overhead and entry is not loaded:
+            time = _charge_dispatch(result, time, loaded is not None, switch_cost, dispatch_latency, metrics)
+            loaded = entry
 
         # Calculate actual execution time (either quantum or remaining burst time)
-        exec_time = min(quantum, remaining_burst[pid])
+        exec_time = min(quantum, entry[1])
 
         # Add to result
-        result.append((pid, time, time + exec_time))
+        add_pid(pid)
+        add_start(time)
+        add_end(time + exec_time)
+        if metrics is not None:
+            metrics.add_segment(pid, time, time + exec_time, exec_time == entry[1])
 
         # Update time and remaining burst
         time += exec_time
-        remaining_burst[pid] -= exec_time
+        entry[1] -= exec_time
 
-        # Check if process is completed
-        if remaining_burst[pid] == 0:
-            remaining_processes -= 1
-        else:
-            # Process still has work to do, check if any new processes have arrived
-            # before adding it back to the ready queue
-            arrived_during_execution = []
-            while next_arrival_idx < len(processes) and processes[next_arrival_idx]['arrival'] <= time:
-                arrived_during_execution.append(processes[next_arrival_idx])
-                next_arrival_idx += 1
+        if entry[1] != 0:
+            # Process still has work to do, add the processes that arrived during
+            # its execution first, then put it back at the end of the ready queue
+            while upcoming is not None and upcoming[1] <= time:
+                pid, arrival, burst, _ = upcoming
+                ready_queue.append([pid, burst])
+                if metrics is not None:
+                    metrics.add_process(pid, arrival, burst)
+                upcoming = next(rows, None)
+            ready_queue.append(entry)
+
+
+def _full_rounds(remaining, quantum, time, next_arrival):
+    """
+    Number of whole rotations of the ready queue in which every process uses its
+    full quantum and still has work left, and which end strictly before the next
+    arrival. Within those rounds the rotation order cannot change.
+
+    Args:
+        remaining: Remaining burst times of the ready processes, in queue order
+        quantum: Time quantum
+        time: Current time
+        next_arrival: Arrival time of the next process, or None
+
+    Only integer timelines take this path: bulk arithmetic on floats would not
+    reproduce the rounding of quantum-by-quantum accumulation.
+    """
+    if type(quantum) is not int or type(time) is not int:
+        return 0
+    if not all(type(r) is int for r in remaining):
+        return 0
+    # A process with remaining time r survives ceil(r / quantum) - 1 full rounds
+    rounds = -(-min(remaining) // quantum) - 1
+    if rounds > 0 and next_arrival is not None:
+        round_length = len(remaining) * quantum
+        rounds = min(rounds, -(-(next_arrival - time) // round_length) - 1)
+    return rounds
+
+
+def _emit_full_rounds(result, ready_queue, quantum, time, rounds, metrics=None):
+    """
+    Append `rounds` whole rotations of the ready queue to the column lists of
+    result in one pass and return the time at which they end. The queue order
+    is left unchanged.
+    """
+    rotation = [entry[0] for entry in ready_queue]
+    count = len(rotation)
+    first = len(result[0])
+    end = time + rounds * count * quantum
+    result[0].extend(rotation * rounds)
+    result[1].extend(range(time, end, quantum))
+    result[2].extend(range(time + quantum, end + quantum, quantum))
+    if metrics is not None:
+        for segment in zip(*(column[first:] for column in result)):
+            metrics.add_segment(*segment, False)
+    for entry in ready_queue:
+        entry[1] -= rounds * quantum
+    return end
+
+
+def priority_scheduling(processes, preemptive=False, aging=0, metrics=None, switch_cost=0, dispatch_latency=0):
+    """
+    Priority Scheduling with fixed handling of arrival times.
+    Lower priority value indicates higher priority.
 
-            # Add the preempted process back to the ready queue after newly arrived processes
-            ready_queue.extend(arrived_during_execution)
-            ready_queue.append(current_process)
+    Arrived processes wait in a heap keyed by (priority, arrival order) and
+    arrivals are taken from a cursor over the arrival-sorted list, so each
+    dispatch costs O(log n).
+
+    Args:
+        processes: ProcessTable or list of process dictionaries
+        preemptive: If True, a newly arrived process with a strictly higher
+            priority preempts the running one
+        aging: Amount by which a waiting process's priority value drops per
+            time unit spent in the ready queue (0 disables aging). Priorities
+            are re-evaluated at every arrival and completion.
+        metrics: Optional OnlineMetrics updated as the schedule is produced
+        switch_cost: Time charged per context switch
+        dispatch_latency: Time charged per dispatch
+
+    Returns:
+        Schedule of the segments (pid, start_time, end_time)
+    """
+    if preemptive:
+        if not processes:
+            return Schedule()
+        # Columns in arrival order. The position in this order is the
+        # tie-breaker for equal priorities.
+        columns = as_process_table(processes).sorted_columns('pid', 'arrival', 'burst', 'priority')
+        return _preemptive_priority(*columns, aging, metrics, switch_cost, dispatch_latency)
 
-    return result if result else [(0, 0, 0)]  # Ensure non-empty result to avoid plotting errors
+    result = ([], [], [])
+    return _finish(priority_core(_rows(processes), result, aging, metrics, switch_cost, dispatch_latency), result)
 
 
-def priority_scheduling(processes):
+def priority_core(rows, result, aging=0, metrics=None, switch_cost=0, dispatch_latency=0, resume=None):
     """
-    Non-preemptive Priority Scheduling with fixed handling of arrival times.
-    Lower priority value indicates higher priority.
+    Core of the non-preemptive priority_scheduling over an iterator of
+    arrival-sorted rows (pid, arrival, burst, priority).
+
+    Args:
+        rows: Iterable of rows, consumed as the processes arrive
+        result: Column lists (pids, start_times, end_times) the segments are
+            appended to
+        resume: Checkpoint to continue from, see shortest_job_core
+
+    Yields:
+        Checkpoint (time, taken, order) before every dispatch, as in
+        shortest_job_core
+    """
+    rows = _checked(rows) if switch_cost or dispatch_latency else iter(rows)
+    upcoming = next(rows, None)
+    if resume is None:
+        if upcoming is None:
+            return
+        time, order, waiting, switch = upcoming[1], 0, (), False
+    else:
+        time, order, waiting, switch = resume
+    # order: arrival order of the upcoming row, the tie-breaker for equal priorities
+
+    add_pid, add_start, add_end = (column.append for column in result)
+    # With aging, a process waiting since time w has effective priority
+    # priority - aging * (now - w). Ordering by priority + aging * w gives the
+    # same order at any instant, so heap keys never need to be updated.
+    # (aged priority key, arrival order, pid, burst)
+    ready_heap = [(priority + aging * arrival, idx, pid, burst) for idx, (pid, arrival, burst, priority) in waiting]
+    heapq.heapify(ready_heap)
+    overhead = bool(switch_cost or dispatch_latency)
+
+    while True:
+        # Add all processes that have arrived to the heap
+        while upcoming is not None and upcoming[1] <= time:
+            pid, arrival, burst, priority = upcoming
+            heapq.heappush(ready_heap, (priority + aging * arrival, order, pid, burst))
+            if metrics is not None:
+                metrics.add_process(pid, arrival, burst)
+            order += 1
+            upcoming = next(rows, None)
+
+        if not ready_heap:
+            # Jump to next process arrival
+            if upcoming is not None:
+                time = upcoming[1]
+                continue
+            break
+
+        # Schedule the process with highest priority (lowest priority number)
+        _, idx, pid, burst = heapq.heappop(ready_heap)
+        yield time, order, idx
+        if overhead:
+            time = _charge_dispatch(result, time, switch, switch_cost, dispatch_latency, metrics)
+            switch = True
+        add_pid(pid)
+        add_start(time)
+        add_end(time + burst)
+        if metrics is not None:
+            metrics.add_segment(pid, time, time + burst, True)
+
+        # Update time
+        time += burst
+
+
+def _preemptive_priority(pids, arrivals, bursts, priorities, aging, metrics=None, switch_cost=0,
+                         dispatch_latency=0):
+    """
+    Preemptive variant of priority_scheduling, expects arrival-sorted columns.
+    The running process competes with its base priority; waiting processes
+    are aged exactly as in the non-preemptive mode.
+    """
+    n = len(pids)
+    result = ([], [], [])
+    add_pid, add_start, add_end = (column.append for column in result)
+    ends = result[2]
+    current_time = arrivals[0]
+    next_arrival_idx = 0
+    remaining = bursts  # Fresh list owned by this run
+
+    ready_heap = []  # (aged priority key, arrival order)
+    running = None   # (aged priority key, arrival order) of the process on the CPU
+    overhead = bool(switch_cost or dispatch_latency)
+    if overhead:
+        check_pids(pids)
+    loaded = None    # Arrival order of the process whose context is on the CPU
+    switched = False  # Whether the last step was a switch to `running`
+    if metrics is not None:
+        # Zero-burst processes are never registered but still open the window
+        metrics.start(current_time)
+
+    while True:
+        # Add all processes that have arrived to the heap
+        while next_arrival_idx < n and arrivals[next_arrival_idx] <= current_time:
+            # Processes without any work never occupy the CPU
+            if bursts[next_arrival_idx] > 0:
+                heapq.heappush(ready_heap, (priorities[next_arrival_idx] + aging * arrivals[next_arrival_idx],
+                                            next_arrival_idx))
+                if metrics is not None:
+                    metrics.add_process(pids[next_arrival_idx], arrivals[next_arrival_idx],
+                                        bursts[next_arrival_idx])
+            next_arrival_idx += 1
+
+        if running is None:
+            if not ready_heap:
+                # Jump to next process arrival
+                if next_arrival_idx < n:
+                    current_time = arrivals[next_arrival_idx]
+                    continue
+                break
+            running = heapq.heappop(ready_heap)
+        else:
+            # Re-key the running process as if it became ready now, so it
+            # competes with its base priority. A process just switched to
+            # keeps the key it was chosen with, otherwise aging during the
+            # switch could hand the CPU back and forth without progress.
+            idx = running[1]
+            if not switched:
+                running = (priorities[idx] + aging * current_time, idx)
+            if ready_heap and ready_heap[0][0] < running[0]:
+                running = heapq.heapreplace(ready_heap, running)
+        switched = False
+
+        idx = running[1]
+        if overhead and idx != loaded:
+            current_time = _charge_dispatch(result, current_time, loaded is not None, switch_cost,
+                                            dispatch_latency, metrics)
+            loaded = idx
+            switched = True
+            # Take the arrivals during the switch into account first
+            continue
+        pid = pids[idx]
+        start_time = current_time
+
+        if next_arrival_idx < n and arrivals[next_arrival_idx] < current_time + remaining[idx]:
+            # Run until the next arrival, which may preempt this process
+            execution_time = arrivals[next_arrival_idx] - current_time
+            current_time += execution_time
+            remaining[idx] -= execution_time
+            completed = False
+        else:
+            current_time += remaining[idx]
+            remaining[idx] = 0
+            running = None
+            completed = True
+
+        # Extend the previous segment if the same process keeps the CPU
+        if ends and ends[-1] == start_time and result[0][-1] == pid:
+            ends[-1] = current_time
+        else:
+            add_pid(pid)
+            add_start(start_time)
+            add_end(current_time)
+        if metrics is not None:
+            metrics.add_segment(pid, start_time, current_time, completed)
+
+    return Schedule(*result)
+
+
+def mlfq(processes, quantum=2, levels=3, quanta=None, boost_interval=None, metrics=None, switch_cost=0,
+         dispatch_latency=0):
+    """
+    Multilevel Feedback Queue scheduling.
+
+    Every process starts in the top level. The highest non-empty level runs
+    Round Robin with its own quantum; a process that uses up the quantum of
+    its level moves one level down, the last level keeps it. An arrival
+    (always in the top level) preempts a process running in a lower level,
+    which goes back to the head of its level and keeps what is left of its
+    quantum. Every `boost_interval` time units all processes move back to
+    the top level with a fresh quantum, so long-running processes cannot
+    starve.
+
+    Each level is a chain of deques, so a boost concatenates the levels in
+    O(levels) and quanta are reset lazily, on the next dispatch after it.
+    Every dispatch costs O(levels).
+
+    Args:
+        processes: ProcessTable or list of process dictionaries
+        quantum: Quantum of the top level, doubled in each lower level
+        levels: Number of levels
+        quanta: Optional sequence of one quantum per level, overriding
+            quantum and levels
+        boost_interval: Time between priority boosts (None disables them)
+        metrics: Optional OnlineMetrics updated as the schedule is produced
+        switch_cost: Time charged per context switch
+        dispatch_latency: Time charged per dispatch
+
+    Returns:
+        Schedule of the segments (pid, start_time, end_time)
+
+    Raises:
+        ValueError: For fewer than one level, a non-positive quantum or boost
+            interval
     """
+    quanta = list(quanta) if quanta is not None else [quantum * 2 ** level for level in range(levels)]
+    levels = len(quanta)
+    if levels < 1:
+        raise ValueError("MLFQ needs at least one level")
+    if min(quanta) <= 0:
+        raise ValueError("Time quanta must be positive")
+    if boost_interval is not None and boost_interval <= 0:
+        raise ValueError("Boost interval must be positive")
     if not processes:
-        return []
+        return Schedule()
+
+    pids, arrivals, remaining = as_process_table(processes).sorted_columns('pid', 'arrival', 'burst')
+    n = len(pids)
+    result = ([], [], [])
+    add_pid, add_start, add_end = (column.append for column in result)
+    ends = result[2]
+    time = arrivals[0]
+    next_arrival_idx = 0
+    next_boost = time + boost_interval if boost_interval else None
+
+    # Arrival-order indices per level, as a chain of deques; the head is at
+    # queues[level][0][0], the tail at queues[level][-1][-1]
+    queues = [deque([deque()]) for _ in range(levels)]
+    sizes = [0] * levels
+    used = [0] * n   # Time used of the quantum of its level
+    epoch = 0        # Number of boosts so far
+    boosted = [0] * n  # Epoch in which used was last valid
+    requeue = None   # (process, level) whose quantum expired, queued after the arrivals
+    overhead = bool(switch_cost or dispatch_latency)
+    if overhead:
+        check_pids(pids)
+    loaded = None    # Arrival order of the process whose context is on the CPU
+    if metrics is not None:
+        # Zero-burst processes are never registered but still open the window
+        metrics.start(time)
+
+    while True:
+        # Add all processes that have arrived to the top level
+        while next_arrival_idx < n and arrivals[next_arrival_idx] <= time:
+            # Processes without any work never occupy the CPU
+            if remaining[next_arrival_idx] > 0:
+                queues[0][-1].append(next_arrival_idx)
+                sizes[0] += 1
+                if metrics is not None:
+                    metrics.add_process(pids[next_arrival_idx], arrivals[next_arrival_idx],
+                                        remaining[next_arrival_idx])
+            next_arrival_idx += 1
+        # As in Round Robin, an expired process queues behind the arrivals
+        if requeue is not None:
+            idx, lvl = requeue
+            queues[lvl][-1].append(idx)
+            sizes[lvl] += 1
+            requeue = None
+
+        if next_boost is not None and next_boost <= time:
+            # Priority boost: every process back to the top level, in level order
+            for lvl in range(1, levels):
+                queues[0].extend(queues[lvl])
+                queues[lvl] = deque([deque()])
+                sizes[0] += sizes[lvl]
+                sizes[lvl] = 0
+            epoch += 1
+            # Skip the boosts that fell into an idle period
+            next_boost += boost_interval * ((time - next_boost) // boost_interval + 1)
+
+        # Highest non-empty level
+        current = 0
+        while current < levels and not sizes[current]:
+            current += 1
+        if current == levels:
+            # Jump to next process arrival
+            if next_arrival_idx < n:
+                time = arrivals[next_arrival_idx]
+                continue
+            break
+
+        chain = queues[current]
+        while not chain[0]:
+            chain.popleft()
+        queue = chain[0]
+        idx = queue.popleft()
+        if boosted[idx] != epoch:
+            # Boosted since its last run: a fresh top-level quantum
+            boosted[idx] = epoch
+            used[idx] = 0
+        if overhead and idx != loaded:
+            time = _charge_dispatch(result, time, loaded is not None, switch_cost, dispatch_latency, metrics)
+            loaded = idx
+            # Take the arrivals and boosts during the switch into account first
+            queue.appendleft(idx)
+            continue
+        sizes[current] -= 1
+
+        # Run to completion or the end of the quantum, unless an arrival
+        # (which outranks a lower level) or a boost comes first
+        pid = pids[idx]
+        start_time = time
+        run = min(remaining[idx], quanta[current] - used[idx])
+        end = time + run
+        if current > 0 and next_arrival_idx < n and arrivals[next_arrival_idx] < end:
+            end = arrivals[next_arrival_idx]
+        if next_boost is not None and next_boost < end:
+            end = next_boost
+
+        if end == time + run:
+            completed = run == remaining[idx]
+            remaining[idx] -= run
+            used[idx] += run
+            if completed:
+                remaining[idx] = 0
+            elif used[idx] >= quanta[current]:
+                used[idx] = 0
+                requeue = (idx, min(current + 1, levels - 1))
+            else:
+                queue.appendleft(idx)
+                sizes[current] += 1
+        else:
+            # Interrupted: back to the head of its level
+            completed = False
+            remaining[idx] -= end - time
+            used[idx] += end - time
+            queue.appendleft(idx)
+            sizes[current] += 1
+        time = end
+
+        # Extend the previous segment if the same process keeps the CPU
+        if ends and ends[-1] == start_time and result[0][-1] == pid:
+            ends[-1] = time
+        else:
+            add_pid(pid)
+            add_start(start_time)
+            add_end(time)
+        if metrics is not None:
+            metrics.add_segment(pid, start_time, time, completed)
+
+    return Schedule(*result)
+
 
-    # Create a copy of processes to avoid modifying the original data
-    processes = [p.copy() for p in processes]
+# Weight of a process with priority (nice value) 0; every priority step
+# changes the weight by a factor of 1.25, as in Linux's prio_to_weight table
+NICE_0_WEIGHT = 1024
 
-    # Sort by arrival time initially
-    processes.sort(key=lambda x: x['arrival'])
 
-    result = []
-    time = processes[0]['arrival']
-    remaining = len(processes)
-    completed = set()
+def cfs_weight(priority):
+    """Scheduling weight of a priority, read as a nice value clamped to [-20, 19]."""
+    return NICE_0_WEIGHT / 1.25 ** min(max(priority, -20), 19)
 
-    while remaining > 0:
-        # Find available processes that have arrived
-        available = [p for p in processes if p['arrival'] <= time and p['pid'] not in completed]
 
-        if not available:
+def cfs(processes, target_latency=8, min_granularity=1, metrics=None, switch_cost=0, dispatch_latency=0):
+    """
+    Completely Fair Scheduler-style scheduling.
+
+    Every process accumulates virtual runtime: its CPU time scaled by
+    NICE_0_WEIGHT / weight, the weight following from its priority (lower
+    value, more weight; see cfs_weight). The CPU always goes to the process
+    with the smallest virtual runtime, for a slice of target_latency split
+    in proportion to the weights of the runnable processes, but at least
+    min_granularity (the period stretches when there are more than
+    target_latency / min_granularity runnable processes). Arrivals start at
+    the current minimum virtual runtime, so they neither starve nor
+    monopolize the CPU, and wait for the running slice to end.
+
+    Runnable processes wait in a heap keyed by (virtual runtime, arrival
+    order), so every dispatch costs O(log n). With integer times the slices
+    are rounded to whole time units, so the schedule stays integer.
+
+    Args:
+        processes: ProcessTable or list of process dictionaries
+        target_latency: Period in which every runnable process runs once
+        min_granularity: Shortest slice
+        metrics: Optional OnlineMetrics updated as the schedule is produced
+        switch_cost: Time charged per context switch
+        dispatch_latency: Time charged per dispatch
+
+    Returns:
+        Schedule of the segments (pid, start_time, end_time)
+
+    Raises:
+        ValueError: For a non-positive target latency or minimum granularity
+    """
+    if target_latency <= 0 or min_granularity <= 0:
+        raise ValueError("Target latency and minimum granularity must be positive")
+    if not processes:
+        return Schedule()
+
+    pids, arrivals, remaining, priorities = as_process_table(processes).sorted_columns(
+        'pid', 'arrival', 'burst', 'priority')
+    n = len(pids)
+    integral = all(isinstance(value, int) for value in (arrivals[0], remaining[0], target_latency, min_granularity))
+    result = ([], [], [])
+    add_pid, add_start, add_end = (column.append for column in result)
+    ends = result[2]
+    time = arrivals[0]
+    next_arrival_idx = 0
+
+    ready_heap = []  # (virtual runtime, arrival order)
+    min_vruntime = 0.0
+    total_weight = 0.0  # Of the runnable processes, including the running one
+    runnable = 0
+    weights = {}  # Weight of each runnable process, by arrival order
+    overhead = bool(switch_cost or dispatch_latency)
+    if overhead:
+        check_pids(pids)
+    loaded = None  # Arrival order of the process whose context is on the CPU
+    if metrics is not None:
+        # Zero-burst processes are never registered but still open the window
+        metrics.start(time)
+
+    while True:
+        # Add all processes that have arrived, at the minimum virtual runtime
+        if ready_heap and ready_heap[0][0] > min_vruntime:
+            min_vruntime = ready_heap[0][0]
+        while next_arrival_idx < n and arrivals[next_arrival_idx] <= time:
+            # Processes without any work never occupy the CPU
+            if remaining[next_arrival_idx] > 0:
+                weight = weights[next_arrival_idx] = cfs_weight(priorities[next_arrival_idx])
+                total_weight += weight
+                runnable += 1
+                heapq.heappush(ready_heap, (min_vruntime, next_arrival_idx))
+                if metrics is not None:
+                    metrics.add_process(pids[next_arrival_idx], arrivals[next_arrival_idx],
+                                        remaining[next_arrival_idx])
+            next_arrival_idx += 1
+
+        if not ready_heap:
             # Jump to next process arrival
-            next_arrival = min([p['arrival'] for p in processes if p['pid'] not in completed])
-            time = next_arrival
+            if next_arrival_idx < n:
+                time = arrivals[next_arrival_idx]
+                continue
+            break
+
+        vruntime, idx = ready_heap[0]
+        if overhead and idx != loaded:
+            time = _charge_dispatch(result, time, loaded is not None, switch_cost, dispatch_latency, metrics)
+            loaded = idx
+            # Take the arrivals during the switch into account first
             continue
 
-        # Find process with highest priority (lowest priority number)
-        selected = min(available, key=lambda x: x['priority'])
+        # Slice of this process in the current period
+        weight = weights[idx]
+        period = runnable * min_granularity
+        if period < target_latency:
+            period = target_latency
+        time_slice = period * weight / total_weight
+        if integral:
+            time_slice = round(time_slice)
+        if time_slice < min_granularity:
+            time_slice = min_granularity
+
+        pid = pids[idx]
+        start_time = time
+        run = min(time_slice, remaining[idx])
+        time += run
+        remaining[idx] -= run
+        scale = NICE_0_WEIGHT / weight
+        # Arrivals during the slice join at the minimum virtual runtime at
+        # their arrival, over the running process (still the heap's root)
+        # and the waiting ones (the root's children)
+        while next_arrival_idx < n and arrivals[next_arrival_idx] < time:
+            if remaining[next_arrival_idx] > 0:
+                arrival_weight = weights[next_arrival_idx] = cfs_weight(priorities[next_arrival_idx])
+                total_weight += arrival_weight
+                runnable += 1
+                lowest = vruntime + (arrivals[next_arrival_idx] - start_time) * scale
+                if len(ready_heap) > 1:
+                    lowest = min(lowest, min(ready_heap[1:3])[0])
+                min_vruntime = max(min_vruntime, lowest)
+                heapq.heappush(ready_heap, (min_vruntime, next_arrival_idx))
+                if metrics is not None:
+                    metrics.add_process(pids[next_arrival_idx], arrivals[next_arrival_idx],
+                                        remaining[next_arrival_idx])
+            next_arrival_idx += 1
 
-        # Schedule the process
-        result.append((selected['pid'], time, time + selected['burst']))
+        vruntime += run * scale
+        completed = remaining[idx] <= 0
+        if completed:
+            remaining[idx] = 0
+            heapq.heappop(ready_heap)
+            total_weight -= weights.pop(idx)
+            runnable -= 1
+        else:
+            heapq.heapreplace(ready_heap, (vruntime, idx))
 
-        # Update time and mark process as completed
-        time += selected['burst']
-        completed.add(selected['pid'])
-        remaining -= 1
+        # Extend the previous segment if the same process keeps the CPU
+        if ends and ends[-1] == start_time and result[0][-1] == pid:
+            ends[-1] = time
+        else:
+            add_pid(pid)
+            add_start(start_time)
+            add_end(time)
+        if metrics is not None:
+            metrics.add_segment(pid, start_time, time, completed)
 
-    return result
+    return Schedule(*result)
@@ -0,0 +1,403 @@
+# algorithms/smp.py
+"""
+Scheduling on several CPUs (symmetric multiprocessing).
+
+The engines in algorithms.scheduling simulate one CPU. smp_schedule runs the
+same policies on N identical cores, with either one global run queue shared
+by all cores or one run queue per core (with optional work stealing), and an
+optional CPU affinity per process. Its segments carry the core they ran on:
+(pid, start_time, end_time, core).
+
+Example:
+    schedule = smp_schedule(table, cpus=32, policy='srtf', queues='per-core')
+    summary, detailed = smp_metrics(schedule, table, cpus=32)
+"""
+import heapq
+
+import numpy as np
+
+from algorithms.metrics import calculate_metrics, schedule_to_arrays
+from algorithms.process_table import as_process_table
+from algorithms.registry import QUEUE_MODES
+
+POLICIES = ('fcfs', 'sjf', 'srtf', 'rr', 'priority', 'priority-preemptive')
+
+# Policies where an arrival can take a core from a running process
+PREEMPTIVE_POLICIES = ('srtf', 'priority-preemptive')
+
+
+def smp_schedule(processes, cpus, policy='fcfs', quantum=2, queues='global', stealing=True, affinity=None,
+                 metrics=None):
+    """
+    Simulate a scheduling policy on several cores.
+
+    Each idle core runs the best ready process it may run: by arrival
+    ('fcfs'), shortest burst ('sjf'), shortest remaining time ('srtf'), in
+    turn for `quantum` time units ('rr'), or by lowest priority value
+    ('priority', 'priority-preemptive'). In the preemptive policies an
+    arriving process takes over the core running the worst process it beats.
+    Cores are considered in id order, so ties go to the lowest core id.
+
+    With queues='global', all cores serve one run queue. With
+    queues='per-core', an arriving process joins the queue of the least
+    loaded core it may run on and only that core serves it; with stealing,
+    a core that runs dry takes the head of the longest queue of another core,
+    if that process may run on it.
+
+    Args:
+        processes: ProcessTable or list of process dictionaries
+        cpus: Number of cores
+        policy: One of POLICIES
+        quantum: Time slice of 'rr'
+        queues: 'global' or 'per-core'
+        stealing: Let idle cores steal from other cores' queues ('per-core')
+        affinity: Optional dictionary pid -> iterable of core ids the process
+            may run on; other processes may run on any core
+        metrics: Optional OnlineMetrics (or RunControl) told about every
+            arrival and segment, as in algorithms.scheduling
+
+    Returns:
+        List of tuples (pid, start_time, end_time, core), ordered by start
+        time and core
+
+    Raises:
+        ValueError: For an unknown policy or queue mode, fewer than one core,
+            a non-positive quantum or an affinity naming no valid core
+    """
+    if cpus < 1:
+        raise ValueError("At least one CPU is needed")
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown policy '{policy}', choose from: {', '.join(POLICIES)}")
+    if queues not in QUEUE_MODES:
+        raise ValueError(f"Unknown queue mode '{queues}', choose from: {', '.join(QUEUE_MODES)}")
+    if policy == 'rr' and quantum <= 0:
+        raise ValueError("Time quantum must be positive")
+    if not processes:
+        return []
+
+    pids, arrivals, bursts, priorities = as_process_table(processes).sorted_columns(
+        'pid', 'arrival', 'burst', 'priority')
+    return _Simulation(pids, arrivals, bursts, priorities, cpus, policy, quantum, queues == 'per-core',
+                       stealing, _allowed_cores(pids, cpus, affinity), metrics).run()
+
+
+def _allowed_cores(pids, cpus, affinity):
+    """Tuple of allowed core ids per process in arrival order, None for any core."""
+    allowed = [None] * len(pids)
+    if not affinity:
+        return allowed
+    for i, pid in enumerate(pids):
+        cores = affinity.get(pid)
+        if cores is None:
+            continue
+        cores = tuple(sorted(set(cores)))
+        if not cores or cores[0] < 0 or cores[-1] >= cpus:
+            raise ValueError(f"Affinity of process {pid} must name cores between 0 and {cpus - 1}")
+        allowed[i] = None if len(cores) == cpus else cores
+    return allowed
+
+
+class _Simulation:
+    """
+    Event-driven state of one smp_schedule run.
+
+    Ready processes wait in heaps of (key..., arrival order). A global run
+    queue is split into one heap per distinct affinity, so a core only
+    looks at the heads of the heaps it may serve. Core events (completion or
+    end of a time slice) sit in a heap of (time, core, version); preempting a
+    core bumps its version, which invalidates its pending event.
+    """
+
+    def __init__(self, pids, arrivals, bursts, priorities, cpus, policy, quantum, per_core, stealing,
+                 allowed, metrics):
+        self.pids, self.arrivals, self.priorities = pids, arrivals, priorities
+        self.remaining = bursts  # Fresh list owned by this run
+        self.bursts = list(bursts)
+        self.cpus, self.policy, self.quantum = cpus, policy, quantum
+        self.per_core, self.stealing = per_core, stealing
+        self.allowed = allowed
+        self.metrics = metrics
+
+        # Run queues and, per core, the queues it serves
+        if per_core:
+            self.queues = {core: [] for core in range(cpus)}
+            self.eligible = [[core] for core in range(cpus)]
+        else:
+            classes = sorted(set(allowed), key=lambda cores: (cores is not None, cores or ()))
+            self.queues = {cores: [] for cores in classes}
+            self.eligible = [[cores for cores in classes if cores is None or core in cores]
+                             for core in range(cpus)]
+        self.waiting = 0
+        self.sequence = 0  # Round Robin queue order
+
+        # Core state: process on it, start of its segment, its queue key,
+        # whether the pending event completes it, and event version
+        self.running = [None] * cpus
+        self.segment_start = [0] * cpus
+        self.running_key = [None] * cpus
+        self.completes = [False] * cpus
+        self.version = [0] * cpus
+        self.idle = set(range(cpus))
+        self.events = []
+
+        self.result = []
+        # Index in result of each core's latest segment, for merging
+        self.last_segment = [None] * cpus
+
+    def run(self):
+        arrivals = self.arrivals
+        n = len(arrivals)
+        time = arrivals[0]
+        next_arrival = 0
+        if self.metrics is not None:
+            self.metrics.start(time)
+
+        while True:
+            # Arrivals first, so they queue ahead of a process whose time
+            # slice ends now, as in the single-CPU Round Robin
+            arrived = False
+            while next_arrival < n and arrivals[next_arrival] <= time:
+                self._arrive(next_arrival)
+                next_arrival += 1
+                arrived = True
+
+            # Completions and expired time slices up to now
+            while self.events and self.events[0][0] <= time:
+                end, core, version = heapq.heappop(self.events)
+                if version == self.version[core]:
+                    self._slice_end(core, end)
+
+            if self.waiting:
+                self._dispatch_idle(time)
+                if arrived and self.waiting and self.policy in PREEMPTIVE_POLICIES:
+                    self._preempt(time)
+
+            # Advance to the next event
+            while self.events and self.events[0][2] != self.version[self.events[0][1]]:
+                heapq.heappop(self.events)
+            if self.events:
+                time = self.events[0][0]
+                if next_arrival < n and arrivals[next_arrival] < time:
+                    time = arrivals[next_arrival]
+            elif next_arrival < n:
+                time = arrivals[next_arrival]
+            else:
+                break
+
+        # Segments were added as they ended
+        self.result.sort(key=lambda segment: (segment[1], segment[3]))
+        return self.result
+
+    # Run queues
+
+    def _key(self, idx):
+        """Queue key of a process, the arrival order idx breaks ties."""
+        policy = self.policy
+        if policy == 'fcfs':
+            return (self.arrivals[idx], idx)
+        if policy == 'rr':
+            self.sequence += 1
+            return (self.sequence, idx)
+        if policy in ('priority', 'priority-preemptive'):
+            return (self.priorities[idx], self.arrivals[idx], idx)
+        # sjf and srtf, on the remaining time
+        return (self.remaining[idx], self.arrivals[idx], idx)
+
+    def _enqueue(self, idx, core=None):
+        """Put a process in a run queue: per-core, the given core's (default: least loaded)."""
+        if self.per_core:
+            if core is None:
+                cores = self.allowed[idx] or range(self.cpus)
+                core = min(cores, key=lambda c: (len(self.queues[c]) + (self.running[c] is not None), c))
+            queue = self.queues[core]
+        else:
+            queue = self.queues[self.allowed[idx]]
+        heapq.heappush(queue, self._key(idx))
+        self.waiting += 1
+
+    def _best_queue(self, core, steal=True):
+        """The queue whose head this core should run next, or None."""
+        best = None
+        for queue_id in self.eligible[core]:
+            queue = self.queues[queue_id]
+            if queue and (best is None or queue[0] < best[0]):
+                best = queue
+        if best is None and steal and self.per_core and self.stealing:
+            best = self._steal(core)
+        return best
+
+    def _steal(self, core):
+        """The longest other queue whose head may run on this core, or None."""
+        victims = sorted((queue for c, queue in self.queues.items() if c != core and queue),
+                         key=len, reverse=True)
+        for queue in victims:
+            allowed = self.allowed[queue[0][-1]]
+            if allowed is None or core in allowed:
+                return queue
+        return None
+
+    # Cores
+
+    def _arrive(self, idx):
+        if self.policy in PREEMPTIVE_POLICIES and not self.bursts[idx]:
+            # As in the single-CPU preemptive engines, processes without any
+            # work never occupy a core
+            return
+        if self.metrics is not None:
+            self.metrics.add_process(self.pids[idx], self.arrivals[idx], self.bursts[idx])
+        self._enqueue(idx)
+
+    def _dispatch_idle(self, time):
+        for core in sorted(self.idle):
+            queue = self._best_queue(core)
+            if queue is not None:
+                key = heapq.heappop(queue)
+                self.waiting -= 1
+                self._start(core, key, time)
+                if not self.waiting:
+                    break
+
+    def _start(self, core, key, time):
+        """Run a process on an idle core from `time`."""
+        idx = key[-1]
+        self.idle.discard(core)
+        self.running[core] = idx
+        self.running_key[core] = key
+        self.segment_start[core] = time
+        run_time = self.remaining[idx]
+        if self.policy == 'rr' and self.quantum < run_time:
+            run_time = self.quantum
+        self.completes[core] = run_time == self.remaining[idx]
+        self.version[core] += 1
+        heapq.heappush(self.events, (time + run_time, core, self.version[core]))
+
+    def _stop(self, core, time, completed):
+        """End the segment on a core at `time` and free the core."""
+        idx = self.running[core]
+        start = self.segment_start[core]
+        if completed:
+            self.remaining[idx] = 0
+        else:
+            self.remaining[idx] -= time - start
+        self._emit(core, idx, start, time, completed)
+        self.running[core] = None
+        self.running_key[core] = None
+        self.version[core] += 1
+        self.idle.add(core)
+        return idx
+
+    def _slice_end(self, core, time):
+        """Handle a core's pending event: completion or end of a time slice."""
+        if self.completes[core]:
+            self._stop(core, time, True)
+            return
+        # Round Robin: keep the core if nothing else is waiting for it
+        if not any(self.queues[q] for q in self.eligible[core]):
+            idx = self.running[core]
+            self.remaining[idx] -= time - self.segment_start[core]
+            self._emit(core, idx, self.segment_start[core], time, False)
+            self._start(core, (0, idx), time)
+            return
+        idx = self._stop(core, time, False)
+        self._enqueue(idx, core if self.per_core else None)
+
+    def _preempt(self, time):
+        """
+        Let waiting processes take the cores of running processes with a
+        strictly worse remaining time or priority. Cores never steal to
+        preempt.
+        """
+        while self.waiting:
+            # The running process with the worst key among the cores that
+            # could run the best waiting process for them
+            victim, victim_key, queue = None, None, None
+            for core in range(self.cpus):
+                if self.running[core] is None:
+                    continue
+                candidate = self._best_queue(core, steal=False)
+                if candidate is None:
+                    continue
+                key = self._running_key(core, time)
+                if candidate[0] < key and (victim is None or key > victim_key):
+                    victim, victim_key, queue = core, key, candidate
+            if victim is None:
+                return
+            idx = self._stop(victim, time, False)
+            new_key = heapq.heappop(queue)
+            self.waiting -= 1
+            self._enqueue(idx, victim if self.per_core else None)
+            self._start(victim, new_key, time)
+
+    def _running_key(self, core, time):
+        """Queue key the process on a core would have if it were waiting."""
+        idx = self.running[core]
+        if self.policy == 'srtf':
+            return (self.remaining[idx] - (time - self.segment_start[core]), self.arrivals[idx], idx)
+        return self.running_key[core]
+
+    def _emit(self, core, idx, start, end, completed):
+        pid = self.pids[idx]
+        last = self.last_segment[core]
+        if last is not None and self.result[last][0] == pid and self.result[last][2] == start:
+            # The same process kept the core
+            self.result[last] = (pid, self.result[last][1], end, core)
+        else:
+            self.last_segment[core] = len(self.result)
+            self.result.append((pid, start, end, core))
+        if self.metrics is not None:
+            self.metrics.add_segment(pid, start, end, completed)
+
+
+def smp_metrics(schedule, processes, cpus):
+    """
+    Calculate the metrics of a multi-core schedule.
+
+    Args:
+        schedule: List of tuples (pid, start_time, end_time, core)
+        processes: ProcessTable or list of process dictionaries
+        cpus: Number of cores
+
+    Returns:
+        Tuple (summary, detailed) as calculate_metrics returns, where
+        'cpu_utilization' is the mean over the cores and 'context_switches'
+        counts process changes on each core. The summary adds 'cpus',
+        'core_utilization' (percent per core), 'load_imbalance' (percent by
+        which the busiest core exceeds the mean busy time) and 'migrations'
+        (segments on a different core than their process's previous one).
+    """
+    if len(schedule) == 0:
+        return None, None
+
+    # Columns of their own types, so string pids stay strings
+    table = as_process_table(processes)
+    pids, starts, ends = schedule_to_arrays(schedule, table)
+    cores = np.fromiter((segment[3] for segment in schedule), np.int64, len(schedule))
+    summary, detailed = calculate_metrics((pids, starts, ends), table)
+    if summary is None:
+        return None, None
+
+    total_time = (ends.max() - table.arrival.min()).item()
+    busy = np.bincount(cores, weights=ends - starts, minlength=cpus)[:cpus]
+    core_utilization = busy / total_time * 100 if total_time > 0 else np.zeros(cpus)
+    mean_busy = busy.mean()
+
+    # Switches per core: pid changes between consecutive segments of a core
+    by_core = np.lexsort((starts, cores))
+    core_sorted, pid_sorted = cores[by_core], pids[by_core]
+    same_core = core_sorted[1:] == core_sorted[:-1]
+    switches = np.count_nonzero(same_core & (pid_sorted[1:] != pid_sorted[:-1]))
+
+    # Migrations: consecutive segments of a process on different cores
+    by_pid = np.lexsort((starts, pids))
+    pid_sorted, core_sorted = pids[by_pid], cores[by_pid]
+    migrations = np.count_nonzero((pid_sorted[1:] == pid_sorted[:-1]) & (core_sorted[1:] != core_sorted[:-1]))
+
+    summary.update({
+        'cpu_utilization': core_utilization.mean().item(),
+        'context_switches': int(switches),
+        'cpus': cpus,
+        'core_utilization': core_utilization.tolist(),
+        'load_imbalance': (busy.max() / mean_busy - 1) * 100 if mean_busy > 0 else 0,
+        'migrations': int(migrations),
+    })
+    return summary, detailed
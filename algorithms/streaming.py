@@ -0,0 +1,144 @@
+# algorithms/streaming.py
+"""
+Streaming versions of the FCFS, SJF, Priority and Round Robin engines.
+
+Each engine consumes an iterator of process dictionaries sorted by arrival
+time (e.g. algorithms.traces.iter_trace) and yields schedule segments
+(pid, start_time, end_time) in batches as they are decided. The engines run
+the same cores as their list-based counterparts in algorithms.scheduling,
+with the same metrics, switch cost and dispatch latency, so given the same
+arrival-sorted input they yield exactly the same segments. Only the ready
+queue and one batch of segments are held in memory, so traces far larger
+than memory can be simulated.
+"""
+from collections import deque
+from itertools import chain, islice
+
+from algorithms.online_metrics import OnlineMetrics
+from algorithms.registry import get_scheduler
+from algorithms.scheduling import fcfs_core, priority_core, round_robin_core, shortest_job_core
+
+# Dispatches simulated before their segments are passed on, and most
+# segments of one bulk emission of Round Robin rounds; together they bound
+# the segments held in memory, whatever the length of the trace
+BATCH_DISPATCHES = 256
+BULK_SEGMENTS = 256
+
+# Marks the end of an engine core's dispatches
+_DONE = object()
+
+
+def stream_fcfs(records, metrics=None, switch_cost=0, dispatch_latency=0):
+    """
+    First-Come-First-Serve over an arrival-sorted stream of processes.
+    """
+    result = ([], [], [])
+    return _segments(fcfs_core(_rows(records), result, metrics, switch_cost, dispatch_latency), result)
+
+
+def stream_sjf(records, metrics=None, switch_cost=0, dispatch_latency=0):
+    """
+    Non-preemptive Shortest Job First over an arrival-sorted stream of processes.
+    """
+    result = ([], [], [])
+    return _segments(shortest_job_core(_rows(records), result, False, metrics, switch_cost, dispatch_latency),
+                     result)
+
+
+def stream_priority(records, aging=0, metrics=None, switch_cost=0, dispatch_latency=0):
+    """
+    Non-preemptive Priority Scheduling over an arrival-sorted stream of
+    processes. Lower priority value indicates higher priority; aging works as
+    in priority_scheduling.
+    """
+    result = ([], [], [])
+    return _segments(priority_core(_rows(records), result, aging, metrics, switch_cost, dispatch_latency), result)
+
+
+def stream_round_robin(records, quantum, metrics=None, switch_cost=0, dispatch_latency=0):
+    """
+    Round Robin over an arrival-sorted stream of processes, including the bulk
+    full-round fast path of optimized_round_robin.
+
+    Raises:
+        ValueError: For a non-positive quantum
+    """
+    result = ([], [], [])
+    return _segments(round_robin_core(_rows(records), result, quantum, metrics, switch_cost, dispatch_latency,
+                                      bulk_limit=BULK_SEGMENTS), result)
+
+
+def _rows(records):
+    """Rows (pid, arrival, burst, priority) of process dictionaries."""
+    for record in records:
+        yield record['pid'], record['arrival'], record['burst'], record.get('priority', 0)
+
+
+def _segments(core, result):
+    """
+    Run an engine core BATCH_DISPATCHES dispatches at a time, taking the
+    segments of every batch out of its column lists.
+    """
+    steps = chain(core, (_DONE,))
+    while True:
+        last = deque(islice(steps, BATCH_DISPATCHES), maxlen=1)
+        yield from _take(result)
+        if last[0] is _DONE:
+            return
+
+
+def _take(result):
+    """Remove the segments from the column lists and return them as tuples."""
+    segments = list(zip(*result))
+    for column in result:
+        column.clear()
+    return segments
+
+
+def simulate_stream(algorithm, records, time_quantum=2, metrics=None, switch_cost=0, dispatch_latency=0):
+    """
+    Run a streaming engine, updating metrics online from every segment.
+
+    Args:
+        algorithm: Name of a scheduler with a streaming engine in
+            algorithms.registry (ValueError otherwise)
+        records: Arrival-sorted iterable of process dictionaries
+        time_quantum: Time quantum for Round Robin
+        metrics: OnlineMetrics to update (default: a new one)
+        switch_cost: Time charged per context switch
+        dispatch_latency: Time charged per dispatch
+
+    Yields:
+        Schedule segments (pid, start_time, end_time); the metrics object can
+        be read at any time, e.g. for progress reporting, and is at most one
+        batch of segments ahead of them
+
+    Returns:
+        The OnlineMetrics object as the generator's return value
+    """
+    metrics = metrics if metrics is not None else OnlineMetrics()
+    yield from get_scheduler(algorithm).stream(records, time_quantum, metrics, switch_cost, dispatch_latency)
+    return metrics
+
+
+def run_stream(algorithm, records, time_quantum=2, on_segment=None, switch_cost=0, dispatch_latency=0):
+    """
+    Simulate a stream to the end and return its summary metrics.
+
+    Args:
+        algorithm: Name of a scheduler with a streaming engine
+        records: Arrival-sorted iterable of process dictionaries
+        time_quantum: Time quantum for Round Robin
+        on_segment: Optional callable receiving every segment, e.g. to write
+            the schedule to a file as it is produced
+        switch_cost: Time charged per context switch
+        dispatch_latency: Time charged per dispatch
+
+    Returns:
+        Summary metrics dictionary (see OnlineMetrics.summary)
+    """
+    metrics = OnlineMetrics()
+    for segment in simulate_stream(algorithm, records, time_quantum, metrics, switch_cost, dispatch_latency):
+        if on_segment is not None:
+            on_segment(segment)
+    return metrics.summary()
@@ -0,0 +1,219 @@
+# algorithms/traces.py
+
+import csv
+import json
+import os
+import sys
+
+class TraceError(ValueError):
+    """Raised for a trace file that cannot be read as processes."""
+
+
+# File extensions mapped to trace formats
+TRACE_FORMATS = {
+    '.csv': 'csv',
+    '.json': 'json',
+    '.jsonl': 'jsonl',
+    '.ndjson': 'jsonl',
+}
+
+
+def trace_format(path):
+    """
+    Guess the trace format of a file from its extension.
+
+    Raises:
+        TraceError: If the extension is not a known trace format
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in TRACE_FORMATS:
+        raise TraceError(f"Unknown trace format for '{path}', expected one of: {', '.join(TRACE_FORMATS)}")
+    return TRACE_FORMATS[extension]
+
+
+def read_trace(path, fmt=None):
+    """
+    Read a whole trace file into a ProcessTable.
+
+    CSV files need a header row with pid, arrival and burst columns (priority
+    is optional). JSON files hold a list of process objects and JSON-lines
+    files one process object per line, with the same keys.
+
+    Args:
+        path: Path of the trace file, or "-" for standard input
+        fmt: 'csv', 'json' or 'jsonl' (default: guessed from the extension)
+
+    Returns:
+        ProcessTable with the processes in file order
+
+    Raises:
+        TraceError: For an unknown format or a malformed record
+    """
+    # Imported here, so reading a trace lazily or only listing the formats
+    # does not load NumPy
+    from algorithms.process_table import COLUMNS, ProcessTable
+
+    fmt = fmt or trace_format(path)
+    with _open_trace(path) as handle:
+        records = [_record(raw, path, number) for number, raw in enumerate(_raw_records(handle, fmt, path), start=1)]
+
+    return ProcessTable(*([r[column] for r in records] for column in COLUMNS))
+
+
+def iter_trace(path, fmt=None):
+    """
+    Lazily read a trace file that is sorted by arrival time.
+
+    CSV and JSON-lines files are read one line at a time, so memory use does
+    not grow with the trace length. JSON files hold a single array and are
+    parsed as a whole before records are yielded.
+
+    Args:
+        path: Path of the trace file, or "-" for standard input
+        fmt: 'csv', 'json' or 'jsonl' (default: guessed from the extension)
+
+    Yields:
+        Process dictionaries with 'pid', 'arrival', 'burst' and 'priority'
+
+    Raises:
+        TraceError: For an unknown format or a malformed record, or if a
+            record arrives earlier than the one before it. The streaming
+            engines depend on arrival order and cannot sort lazily.
+    """
+    fmt = fmt or trace_format(path)
+    with _open_trace(path) as handle:
+        last_arrival = None
+        for number, raw in enumerate(_raw_records(handle, fmt, path), start=1):
+            record = _record(raw, path, number)
+            if last_arrival is not None and record['arrival'] < last_arrival:
+                raise TraceError(f"Trace '{path}' is not sorted by arrival time at record {number}")
+            last_arrival = record['arrival']
+            yield record
+
+
+def write_trace(path, processes, fmt=None):
+    """
+    Write processes to a trace file that read_trace and iter_trace can read.
+
+    Args:
+        path: Path of the trace file, or "-" for standard output
+        processes: ProcessTable or list of process dictionaries
+        fmt: 'csv', 'json' or 'jsonl' (default: guessed from the extension)
+    """
+    from algorithms.process_table import COLUMNS, as_process_table
+
+    fmt = fmt or trace_format(path)
+    table = as_process_table(processes)
+    columns = [getattr(table, column).tolist() for column in COLUMNS]
+
+    handle = open(sys.stdout.fileno(), 'w', newline='', closefd=False) if path == '-' else open(path, 'w', newline='')
+    with handle:
+        if fmt == 'csv':
+            writer = csv.writer(handle)
+            writer.writerow(COLUMNS)
+            writer.writerows(zip(*columns))
+        elif fmt == 'json':
+            json.dump([dict(zip(COLUMNS, row)) for row in zip(*columns)], handle)
+        elif fmt == 'jsonl':
+            handle.writelines(json.dumps(dict(zip(COLUMNS, row))) + '\n' for row in zip(*columns))
+        else:
+            raise ValueError(f"Unknown trace format '{fmt}'")
+
+
+def _raw_records(handle, fmt, path):
+    """
+    Yield the records of an open trace file as dictionaries of raw fields
+    (other JSON values are yielded as they are, for _record to reject).
+
+    Raises:
+        TraceError: For an unknown format or invalid JSON
+    """
+    if fmt == 'csv':
+        yield from csv.DictReader(handle)
+    elif fmt == 'json':
+        try:
+            records = json.load(handle)
+        except json.JSONDecodeError as e:
+            raise TraceError(f"Trace '{path}' is not valid JSON: {e}") from None
+        if not isinstance(records, list):
+            raise TraceError(f"Trace '{path}' must hold a JSON array of process objects")
+        yield from records
+    elif fmt == 'jsonl':
+        for number, line in enumerate(handle, start=1):
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise TraceError(f"Trace '{path}' line {number} is not valid JSON: {e}") from None
+    else:
+        raise TraceError(f"Unknown trace format '{fmt}'")
+
+
+def _record(raw, path, number):
+    """
+    Validate one raw record and convert it to a process dictionary.
+
+    Raises:
+        TraceError: Naming the record, if a field is missing or invalid
+    """
+    try:
+        record = {
+            'pid': _identifier(raw['pid']),
+            'arrival': _number(raw['arrival']),
+            'burst': _number(raw['burst']),
+            'priority': _number(raw.get('priority') or 0),
+        }
+    except (AttributeError, KeyError, TypeError, ValueError):
+        _reject(raw, path, number)
+    if record['pid'] == '' or not isinstance(record['pid'], (str, int, float)):
+        _reject(raw, path, number)
+    return record
+
+
+def _reject(raw, path, number):
+    """Raise a TraceError saying what is wrong with a record _record could not convert."""
+    if not isinstance(raw, dict):
+        raise TraceError(f"Trace '{path}' record {number} is not a process object")
+    for column in ('pid', 'arrival', 'burst'):
+        if raw.get(column) is None or raw[column] == '':
+            raise TraceError(f"Trace '{path}' record {number} has no {column}")
+    if not isinstance(raw['pid'], (str, int, float)):
+        raise TraceError(f"Trace '{path}' record {number} has an invalid pid: {raw['pid']!r}")
+    for column in ('arrival', 'burst', 'priority'):
+        try:
+            _number(raw.get(column) or 0)
+        except ValueError:
+            raise TraceError(f"Trace '{path}' record {number} has an invalid {column}: {raw[column]!r}") from None
+    raise TraceError(f"Trace '{path}' record {number} is not a valid process")
+
+
+def _open_trace(path):
+    """Open a trace file for reading; "-" reads from standard input."""
+    if path == '-':
+        return open(sys.stdin.fileno(), 'r', newline='', closefd=False)
+    return open(path, 'r', newline='')
+
+
+def _identifier(value):
+    """Process IDs are numeric when possible, otherwise kept as strings."""
+    try:
+        return _number(value)
+    except ValueError:
+        return value
+
+
+def _number(value):
+    """
+    Convert a CSV/JSON field to int when it is integral, float otherwise.
+
+    Raises:
+        ValueError: If the field is not a number
+    """
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            return float(value)
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    raise ValueError(f"not a number: {value!r}")
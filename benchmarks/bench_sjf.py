@@ -0,0 +1,92 @@
+# benchmarks/bench_sjf.py
+"""
+Benchmark the heapq-based SJF engine against the previous queue.PriorityQueue one.
+
+Run from the repository root:
+    python -m benchmarks.bench_sjf [sizes...]
+"""
+import sys
+import time
+from queue import PriorityQueue
+
+from algorithms.scheduling import optimized_sjf
+from algorithms.workloads import generate_workload
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000]
+
+
+# The previous SJF engine, optimized_sjf of algorithms/scheduling.py before the
+# heapq rewrite, copied unchanged except for its name. Every put/get on
+# queue.PriorityQueue takes a mutex and notifies a condition variable.
+def priority_queue_sjf(processes):
+    """
+    Optimized Shortest Job First using a priority queue for better performance.
+    """
+    if not processes:
+        return []
+
+    # Create a copy of processes to avoid modifying the original data
+    processes = [p.copy() for p in processes]
+
+    # Sort by arrival time
+    processes.sort(key=lambda x: x['arrival'])
+
+    result = []
+    time = processes[0]['arrival']
+    pq = PriorityQueue()  # Priority queue for ready processes
+    next_process_idx = 0
+
+    while next_process_idx < len(processes) or not pq.empty():
+        # Add all processes that have arrived to the priority queue
+        while next_process_idx < len(processes) and processes[next_process_idx]['arrival'] <= time:
+            # Queue contains (burst_time, arrival_time, process_id)
+            # Arrival time is used as a tie-breaker
+            p = processes[next_process_idx]
+            pq.put((p['burst'], p['arrival'], p['pid']))
+            next_process_idx += 1
+
+        if pq.empty():
+            # If no process is ready, jump to the next arrival
+            if next_process_idx < len(processes):
+                time = processes[next_process_idx]['arrival']
+                continue
+            else:
+                break
+
+        # Get the process with the shortest burst time
+        burst, arrival, pid = pq.get()
+
+        # Add to result
+        result.append((pid, time, time + burst))
+
+        # Update time
+        time += burst
+
+    return result
+
+
+def make_processes(n, seed=0):
+    """Poisson workload at 110% load, so the ready queue keeps growing."""
+    return generate_workload(n, seed=seed, arrival_rate=0.2, mean_burst=5.5, as_records=True)
+
+
+def time_call(func, processes):
+    """Return (seconds, result) for a single call."""
+    start = time.perf_counter()
+    result = func(processes)
+    return time.perf_counter() - start, result
+
+
+def main(sizes):
+    print(f"{'processes':>10} {'PriorityQueue (s)':>18} {'heapq (s)':>10} {'speed-up':>9}")
+    for n in sizes:
+        processes = make_processes(n)
+        baseline_time, baseline = time_call(priority_queue_sjf, processes)
+        heap_time, result = time_call(optimized_sjf, processes)
+        if result != baseline:
+            raise AssertionError(f"Schedules differ for {n} processes")
+        print(f"{n:>10} {baseline_time:>18.3f} {heap_time:>10.3f} {baseline_time / heap_time:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main([int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES)
@@ -0,0 +1,151 @@
+# benchmarks/bench_startup.py
+"""
+Benchmark the cold start of the GUI: time to the first window and import time
+per module, and fail if startup regresses.
+
+Every run starts a fresh interpreter with -X importtime that imports main,
+creates the main window, draws it once and exits. Without a display (no Tk
+window can be created) only the imports are timed.
+
+Run from the repository root:
+    python -m benchmarks.bench_startup [--runs 5] [--baseline startup.json] [--threshold 1.25]
+    python -m benchmarks.bench_startup --save-baseline startup.json
+
+Exits with status 1 if the median startup time exceeds the baseline by more
+than the threshold factor, exceeds --max-seconds, or if a module that must
+be imported lazily (e.g. matplotlib) is imported before the first window.
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Top-level packages that must not be imported before the first window
+LAZY_MODULES = ["matplotlib"]
+
+# Run in the child interpreter; prints whether a window was shown
+STARTUP_SCRIPT = """
+import tkinter
+import main
+try:
+    root = main.create_main_window()
+except tkinter.TclError:
+    print("no-window")
+else:
+    root.update()
+    print("window")
+    root.destroy()
+"""
+
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def run_once():
+    """
+    Start the application once in a fresh interpreter.
+
+    Returns:
+        Tuple (seconds, window_shown, imports) where imports maps every
+        imported module to its cumulative import time in seconds
+    """
+    start = time.perf_counter()
+    child = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", STARTUP_SCRIPT],
+        cwd=REPO_ROOT, capture_output=True, text=True,
+    )
+    seconds = time.perf_counter() - start
+    if child.returncode != 0:
+        raise RuntimeError(f"Startup failed:\n{child.stderr[-2000:]}")
+
+    imports = {}
+    for line in child.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            imports[match.group(4)] = int(match.group(2)) / 1e6
+    return seconds, child.stdout.strip() == "window", imports
+
+
+def measure(runs):
+    """
+    Start the application `runs` times.
+
+    Returns:
+        Dictionary with the median 'startup_seconds', whether a 'window' was
+        shown and the median cumulative import time of every module
+    """
+    results = [run_once() for _ in range(runs)]
+    modules = set().union(*(imports for _, _, imports in results))
+    return {
+        "startup_seconds": statistics.median(seconds for seconds, _, _ in results),
+        "window": all(window for _, window, _ in results),
+        "imports": {
+            module: statistics.median(imports.get(module, 0) for _, _, imports in results)
+            for module in modules
+        },
+    }
+
+
+def report(result, top):
+    kind = "first window" if result["window"] else "imports only, no display"
+    print(f"Startup ({kind}): {result['startup_seconds']:.3f} s")
+    print(f"\n{'module':<45} {'cumulative import (s)':>22}")
+    # Only top-level packages, their submodules are included in the time
+    top_level = {m: t for m, t in result["imports"].items() if "." not in m}
+    for module, seconds in sorted(top_level.items(), key=lambda item: -item[1])[:top]:
+        print(f"{module:<45} {seconds:>22.3f}")
+
+
+def check(result, baseline, threshold, max_seconds):
+    """Return a list of regression messages, empty if startup is fine."""
+    failures = []
+    eager = [m for m in LAZY_MODULES if m in result["imports"]]
+    if eager:
+        failures.append(f"imported before the first window: {', '.join(eager)}")
+    if baseline is not None and baseline.get("window") != result["window"]:
+        # A run with a window is not comparable to an imports-only run
+        print("Baseline was measured with a different display setup, not comparing", file=sys.stderr)
+    elif baseline is not None and result["startup_seconds"] > baseline["startup_seconds"] * threshold:
+        failures.append(f"startup {result['startup_seconds']:.3f} s exceeds baseline "
+                        f"{baseline['startup_seconds']:.3f} s x {threshold}")
+    if max_seconds is not None and result["startup_seconds"] > max_seconds:
+        failures.append(f"startup {result['startup_seconds']:.3f} s exceeds {max_seconds} s")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark GUI cold-start time")
+    parser.add_argument("--runs", type=int, default=5, help="number of cold starts (default: 5)")
+    parser.add_argument("--top", type=int, default=15, help="number of modules to list (default: 15)")
+    parser.add_argument("--baseline", help="JSON file written by --save-baseline to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="allowed slowdown factor against the baseline (default: 1.25)")
+    parser.add_argument("--max-seconds", type=float, help="absolute startup time budget")
+    parser.add_argument("--save-baseline", help="write the measured startup time to this JSON file")
+    args = parser.parse_args(argv)
+
+    result = measure(args.runs)
+    report(result, args.top)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump({"startup_seconds": result["startup_seconds"], "window": result["window"]}, f, indent=2)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    failures = check(result, baseline, args.threshold, args.max_seconds)
+    for failure in failures:
+        print(f"REGRESSION: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,230 @@
+# benchmarks/run_benchmarks.py
+"""
+Benchmark every scheduling engine, calculate_metrics and compare_algorithms
+across input sizes and workload shapes.
+
+For every (target, shape, size) the harness reports the best wall time of a
+few runs, the throughput in processes per second and the peak memory traced
+by tracemalloc in a separate run. Per (target, shape) it fits the scaling
+exponent k of time ~ n^k on a log-log scale (1 is linear, ~1.1 is n log n).
+
+Results are written as JSON; a previous results file can be given as the
+baseline, and runs more than --threshold times slower (or scaling worse by
+more than 0.2) are flagged as regressions.
+
+Run from the repository root:
+    python -m benchmarks.run_benchmarks --output results.json
+    python -m benchmarks.run_benchmarks --quick --baseline results.json
+    python -m benchmarks.run_benchmarks --targets srtf optimized_round_robin --shapes bursty --sizes 1000 100000
+"""
+import argparse
+import json
+import math
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+
+from algorithms.comparison import compare_algorithms
+from algorithms.metrics import calculate_metrics
+from algorithms.scheduling import fcfs, optimized_sjf, srtf, optimized_round_robin, priority_scheduling, mlfq, cfs
+from algorithms.workloads import generate_workload
+
+DEFAULT_SIZES = [100, 1_000, 10_000, 100_000, 1_000_000]
+QUICK_SIZES = [100, 1_000, 10_000]
+
+# Workload shapes, as generate_workload arguments (mean burst 5)
+SHAPES = {
+    "light": dict(arrivals="poisson", bursts="exponential", arrival_rate=0.1),
+    "overloaded": dict(arrivals="poisson", bursts="exponential", arrival_rate=0.22),
+    "bursty": dict(arrivals="onoff", bursts="pareto", arrival_rate=0.5),
+    "heavy-tail": dict(arrivals="poisson", bursts="lognormal", arrival_rate=0.15, sigma=2.0),
+}
+
+# Benchmarked functions. Each entry is (setup, run): setup(table) prepares the
+# arguments outside the timed region, run(*arguments) is timed.
+TARGETS = {
+    "fcfs": (lambda table: (table,), fcfs),
+    "optimized_sjf": (lambda table: (table,), optimized_sjf),
+    "srtf": (lambda table: (table,), srtf),
+    "optimized_round_robin": (lambda table: (table, 4), optimized_round_robin),
+    "priority_scheduling": (lambda table: (table,), priority_scheduling),
+    "mlfq": (lambda table: (table, 4), mlfq),
+    "cfs": (lambda table: (table,), cfs),
+    "calculate_metrics": (lambda table: (optimized_round_robin(table, 4), table), calculate_metrics),
+    "compare_algorithms": (lambda table: (table, 4), compare_algorithms),
+}
+
+# Only sizes from here on are used to fit the scaling exponent, smaller runs
+# are dominated by fixed costs
+SCALING_MIN_SIZE = 1_000
+
+
+def time_target(target, table, repeat):
+    """Best wall time of `repeat` runs of a target on a table."""
+    setup, run = TARGETS[target]
+    arguments = setup(table)
+    best = math.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run(*arguments)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def peak_memory(target, table):
+    """Peak memory in bytes traced during one run of a target."""
+    setup, run = TARGETS[target]
+    arguments = setup(table)
+    tracemalloc.start()
+    try:
+        run(*arguments)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def scaling_exponent(points):
+    """
+    Least-squares slope of log(seconds) against log(n).
+
+    Args:
+        points: List of (n, seconds)
+
+    Returns:
+        The exponent, or None with fewer than two usable sizes
+    """
+    usable = [(n, s) for n, s in points if n >= SCALING_MIN_SIZE and s > 0]
+    if len(usable) < 2:
+        usable = [(n, s) for n, s in points if s > 0]
+    if len(usable) < 2:
+        return None
+    sizes, seconds = zip(*usable)
+    return float(np.polyfit(np.log(sizes), np.log(seconds), 1)[0])
+
+
+def run_benchmarks(targets, shapes, sizes, seed=0, memory=True, progress=None):
+    """
+    Run every target on every shape and size.
+
+    Returns:
+        Results document: 'meta', 'results' (one entry per run) and 'scaling'
+        ({"target/shape": exponent})
+    """
+    results = []
+    for shape in shapes:
+        for n in sizes:
+            table = generate_workload(n, seed=seed, **SHAPES[shape])
+            # More repetitions where single runs are too short to time reliably
+            repeat = 5 if n <= 10_000 else 3 if n <= 100_000 else 1
+            for target in targets:
+                seconds = time_target(target, table, repeat)
+                entry = {
+                    "target": target,
+                    "shape": shape,
+                    "n": n,
+                    "seconds": seconds,
+                    "throughput": n / seconds if seconds > 0 else None,
+                    "peak_mb": peak_memory(target, table) / 1e6 if memory else None,
+                }
+                results.append(entry)
+                if progress is not None:
+                    progress(entry)
+
+    scaling = {}
+    for target in targets:
+        for shape in shapes:
+            points = [(r["n"], r["seconds"]) for r in results if r["target"] == target and r["shape"] == shape]
+            scaling[f"{target}/{shape}"] = scaling_exponent(points)
+
+    return {
+        "meta": {
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "platform": platform.platform(),
+            "seed": seed,
+        },
+        "results": results,
+        "scaling": scaling,
+    }
+
+
+def find_regressions(document, baseline, threshold, min_seconds=0.005):
+    """
+    Compare a results document against a baseline document.
+
+    Runs faster than min_seconds in both documents are ignored, they are
+    mostly timer noise.
+
+    Returns:
+        List of regression messages
+    """
+    previous = {(r["target"], r["shape"], r["n"]): r for r in baseline["results"]}
+    regressions = []
+    for r in document["results"]:
+        old = previous.get((r["target"], r["shape"], r["n"]))
+        if old is None or max(r["seconds"], old["seconds"]) < min_seconds:
+            continue
+        if r["seconds"] > old["seconds"] * threshold:
+            regressions.append(f"{r['target']} / {r['shape']} / n={r['n']}: {r['seconds']:.4f} s, "
+                               f"baseline {old['seconds']:.4f} s ({r['seconds'] / old['seconds']:.2f}x)")
+
+    for key, exponent in document["scaling"].items():
+        old = baseline.get("scaling", {}).get(key)
+        if exponent is not None and old is not None and exponent > old + 0.2:
+            regressions.append(f"{key}: scaling exponent {exponent:.2f}, baseline {old:.2f}")
+    return regressions
+
+
+def print_entry(entry):
+    memory = f"{entry['peak_mb']:>10.1f}" if entry["peak_mb"] is not None else f"{'-':>10}"
+    throughput = f"{entry['throughput']:>14,.0f}" if entry["throughput"] else f"{'-':>14}"
+    print(f"{entry['target']:<22} {entry['shape']:<11} {entry['n']:>9} {entry['seconds']:>10.4f} "
+          f"{throughput} {memory}", flush=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the schedulers and the metrics pipeline")
+    parser.add_argument("--targets", nargs="+", choices=list(TARGETS), default=list(TARGETS))
+    parser.add_argument("--shapes", nargs="+", choices=list(SHAPES), default=list(SHAPES))
+    parser.add_argument("--sizes", nargs="+", type=int, help="input sizes (default: 1e2 to 1e6)")
+    parser.add_argument("--quick", action="store_true", help="only sizes up to 1e4")
+    parser.add_argument("--seed", type=int, default=0, help="workload seed (default: 0)")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc peak memory runs")
+    parser.add_argument("--output", "-o", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="results JSON file to compare against")
+    parser.add_argument("--threshold", type=float, default=1.3,
+                        help="flag runs this many times slower than the baseline (default: 1.3)")
+    args = parser.parse_args(argv)
+
+    sizes = args.sizes or (QUICK_SIZES if args.quick else DEFAULT_SIZES)
+    print(f"{'target':<22} {'shape':<11} {'n':>9} {'seconds':>10} {'processes/s':>14} {'peak MB':>10}")
+    document = run_benchmarks(args.targets, args.shapes, sorted(sizes), args.seed,
+                              memory=not args.no_memory, progress=print_entry)
+
+    print("\nScaling exponents (time ~ n^k):")
+    for key, exponent in document["scaling"].items():
+        print(f"  {key:<40} {exponent:.2f}" if exponent is not None else f"  {key:<40} -")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(document, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = find_regressions(document, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
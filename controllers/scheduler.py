@@ -1,40 +1,119 @@
-from algorithms.scheduling import fcfs, optimized_sjf, srtf, optimized_round_robin, priority_scheduling
+from contextlib import nullcontext
+
+from algorithms.cache import result_key
 from algorithms.metrics import calculate_metrics
+from algorithms.process_table import as_process_table
+from algorithms.registry import SCHEDULERS
 
-def run_scheduling_algorithm(algorithm, processes, time_quantum=None):
+def run_scheduling_algorithm(algorithm, processes, time_quantum=None, control=None, instrument=None,
+                             switch_cost=0, dispatch_latency=0, cpus=1, queues="global", stealing=True,
+                             affinity=None, cache=None, incremental=None):
     """
     Run the selected scheduling algorithm and return the schedule and metrics.
     
     Args:
-        algorithm: String name of the scheduling algorithm to use
-        processes: List of process dictionaries
-        time_quantum: Integer for Round Robin algorithm (default=None)
+        algorithm: Name of a scheduler in algorithms.registry
+        processes: ProcessTable or list of process dictionaries
+        time_quantum: Integer for Round Robin, top-level quantum of MLFQ
+            (default=None)
+        control: Optional RunControl for progress and cancellation; the run
+            raises SimulationCancelled if it is cancelled
+        instrument: Optional Instrumentation recording event counters, phase
+            timings and, if it has a profiler, a profile of the run
+        switch_cost: Time charged per context switch, shown in the schedule
+            as CONTEXT_SWITCH_PID segments
+        dispatch_latency: Time charged per dispatch, shown in the schedule
+            as DISPATCH_LATENCY_PID segments
+        cpus: Number of CPUs; with more than one the run uses smp_schedule
+        queues: 'global' or 'per-core' run queues (several CPUs only)
+        stealing: Let idle CPUs steal work from other per-core queues
+        affinity: Optional dictionary pid -> CPUs the process may run on
+        cache: Optional ResultsCache (algorithms.cache); a run already in it
+            is returned from it, without control or instrumentation events
+        incremental: Optional IncrementalSimulator (algorithms.incremental);
+            algorithms it supports resume its last run with the same
+            settings from the last checkpoint before the first changed
+            process, on one CPU and without instrumentation. The control
+            then only follows the re-simulated part
         
     Returns:
-        schedule: List of tuples (pid, start_time, end_time)
+        schedule: Schedule of the segments (pid, start_time, end_time), or
+            a list of tuples with a fourth element, the CPU, when cpus > 1
         summary_metrics: Dictionary of summary performance metrics
-        detailed_metrics: List of dictionaries with per-process metrics
+        detailed_metrics: Sequence of dictionaries with per-process metrics
+            (see algorithms.metrics.ProcessMetrics)
+
+    Raises:
+        ValueError: If a switch cost or dispatch latency is given with
+            several CPUs, for an algorithm without a multi-CPU policy, or
+            for invalid SMP settings
     """
     # Check if there are processes to schedule
     if not processes:
         return [], None, None
     
-    # Run the selected algorithm
-    if algorithm == "FCFS":
-        schedule = fcfs(processes)
-    elif algorithm == "SJF":
-        schedule = optimized_sjf(processes)
-    elif algorithm == "SRTF":
-        schedule = srtf(processes)
-    elif algorithm == "Round Robin":
-        quantum = time_quantum if time_quantum else 2
-        schedule = optimized_round_robin(processes, quantum)
-    elif algorithm == "Priority":
-        schedule = priority_scheduling(processes)
-    else:
+    overhead = dict(switch_cost=switch_cost, dispatch_latency=dispatch_latency)
+    smp = None
+    if cpus > 1:
+        if switch_cost or dispatch_latency:
+            raise ValueError("Switch cost and dispatch latency are only simulated on one CPU")
+        smp = dict(cpus=cpus, queues=queues, stealing=stealing, affinity=affinity)
+
+    # An instrumented run is always simulated, it is what is being measured
+    key = None
+    if cache is not None and instrument is None and algorithm in SCHEDULERS:
+        processes = as_process_table(processes)
+        key = result_key(processes, algorithm, time_quantum, **overhead, **(smp or {}))
+        result = cache.get(key)
+        if result is not None:
+            return result
+
+    if control is not None:
+        control.begin_run(algorithm, len(processes))
+    if instrument is None:
+        result = _run(algorithm, processes, time_quantum, overhead, control, smp=smp, incremental=incremental)
+        if key is not None:
+            cache.put(key, result)
+        return result
+
+    # The instrumentation sees every engine event first and passes it on
+    instrument.begin_run(algorithm)
+    instrument.metrics = control
+    with instrument.profiling():
+        return _run(algorithm, processes, time_quantum, overhead, instrument, instrument, smp)
+
+def _run(algorithm, processes, time_quantum, overhead, metrics, instrument=None, smp=None, incremental=None):
+    """
+    Schedule and calculate the metrics, with `metrics` following every engine
+    event. `smp` holds the smp_schedule arguments of a run on several CPUs.
+    """
+    scheduler = SCHEDULERS.get(algorithm)
+    if scheduler is None:
         return [], None, None
-    
+    if smp is not None:
+        return _run_smp(scheduler, processes, time_quantum, smp, metrics, instrument)
+
+    with instrument.phase("schedule") if instrument is not None else nullcontext():
+        if incremental is not None and incremental.supports(algorithm):
+            schedule = incremental.run(algorithm, processes, metrics, **overhead)
+        else:
+            schedule = scheduler.run(processes, time_quantum, metrics, **overhead)
+
     # Calculate performance metrics
-    summary_metrics, detailed_metrics = calculate_metrics(schedule, processes)
-    
+    with instrument.phase("metrics") if instrument is not None else nullcontext():
+        summary_metrics, detailed_metrics = calculate_metrics(schedule, processes, instrument)
+
+    return schedule, summary_metrics, detailed_metrics
+
+def _run_smp(scheduler, processes, time_quantum, smp, metrics, instrument=None):
+    """_run on several CPUs."""
+    from algorithms.smp import smp_schedule, smp_metrics
+
+    if scheduler.smp_policy is None:
+        raise ValueError(f"{scheduler.name} is only simulated on one CPU")
+    with instrument.phase("schedule") if instrument is not None else nullcontext():
+        schedule = smp_schedule(processes, policy=scheduler.smp_policy, quantum=2 if time_quantum is None else time_quantum,
+                                metrics=metrics, **smp)
+    with instrument.phase("metrics") if instrument is not None else nullcontext():
+        summary_metrics, detailed_metrics = smp_metrics(schedule, processes, smp["cpus"])
     return schedule, summary_metrics, detailed_metrics
@@ -0,0 +1,392 @@
+# cpuscheduler.py
+"""
+Headless command-line runner for the CPU scheduling algorithms.
+
+Examples:
+    python -m cpuscheduler run --algo SRTF --input trace.csv --format json
+    python -m cpuscheduler compare --input trace.jsonl --quantum 4 --parallel
+    python -m cpuscheduler run --algo RR --input trace.csv --profile cprofile --instrument report.json
+    python -m cpuscheduler run --algo SRTF --input trace.csv --cpus 8 --queues per-core --affinity 3=0,1
+    python -m cpuscheduler compare --input trace.csv --cache ~/.cache/cpuscheduler
+    python -m cpuscheduler stream --algo FCFS --input huge.csv --segments schedule.csv
+    python -m cpuscheduler generate -n 1000000 --arrivals onoff --bursts pareto --seed 1 -o trace.csv
+
+Only the scheduling, metrics and comparison modules are imported here, never
+Tk, ttkbootstrap or matplotlib, so the runner works on display-less servers.
+"""
+import argparse
+import csv
+import json
+import re
+import sys
+
+# The controller, the comparison and the cache need NumPy and are imported by
+# the commands that use them, so --help and argument errors stay fast
+from algorithms.instrumentation import PROFILERS, Instrumentation
+from algorithms.online_metrics import OnlineMetrics
+from algorithms.registry import QUEUE_MODES, SCHEDULERS, get_scheduler, scheduler_names
+from algorithms.traces import TRACE_FORMATS, TraceError, iter_trace, read_trace, write_trace
+from algorithms.workloads import ARRIVAL_PATTERNS, BURST_DISTRIBUTIONS, generate_workload
+
+OUTPUT_FORMATS = ["json", "csv", "text"]
+
+
+def resolve_algorithm(name):
+    """
+    Match a command-line algorithm name against the known algorithms,
+    ignoring case and punctuation ("srtf", "round-robin" and "RR" all work).
+
+    Raises:
+        argparse.ArgumentTypeError: If the name matches no algorithm
+    """
+    algorithms = scheduler_names()
+    aliases = {_normalize(algorithm): algorithm for algorithm in algorithms}
+    aliases["rr"] = "Round Robin"
+    key = _normalize(name)
+    if key not in aliases:
+        raise argparse.ArgumentTypeError(
+            f"unknown algorithm '{name}', choose from: {', '.join(algorithms)}"
+        )
+    return aliases[key]
+
+
+def _normalize(name):
+    return re.sub(r"[^a-z0-9]", "", name.lower())
+
+
+def duration(text):
+    """
+    Parse a non-negative time span, as an int if it is integral so integer
+    schedules stay integer.
+
+    Raises:
+        argparse.ArgumentTypeError: If the text is not a non-negative number
+    """
+    try:
+        value = int(text)
+    except ValueError:
+        try:
+            value = float(text)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid time '{text}'") from None
+    if value < 0:
+        raise argparse.ArgumentTypeError(f"time must not be negative: '{text}'")
+    return value
+
+
+def quantum(text):
+    """
+    Parse a time quantum, a positive integer.
+
+    Raises:
+        argparse.ArgumentTypeError: If the text is not a positive integer
+    """
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid time quantum '{text}'") from None
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"time quantum must be at least 1: '{text}'")
+    return value
+
+
+def affinity(text):
+    """
+    Parse a PID=CORES affinity such as "7=0,2-3" into (pid, [cores]). Numeric
+    pids are returned as ints, like the pids read from traces.
+
+    Raises:
+        argparse.ArgumentTypeError: If the text is not of that form
+    """
+    pid, _, cores = text.partition("=")
+    try:
+        allowed = []
+        for part in cores.split(","):
+            low, _, high = part.partition("-")
+            allowed.extend(range(int(low), int(high or low) + 1))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid affinity '{text}', expected PID=CORES such as 7=0,2-3") from None
+    if not pid or not allowed:
+        raise argparse.ArgumentTypeError(f"invalid affinity '{text}', expected PID=CORES such as 7=0,2-3")
+    return (int(pid) if pid.lstrip("-").isdigit() else pid), allowed
+
+
+def build_parser():
+    """Create the argument parser for the run, compare, stream and generate commands."""
+    parser = argparse.ArgumentParser(prog="cpuscheduler", description="Headless CPU scheduling simulator")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    trace = argparse.ArgumentParser(add_help=False)
+    trace.add_argument("--input", "-i", required=True,
+                       help="trace file (.csv, .json, .jsonl), or - for standard input")
+    trace.add_argument("--input-format", choices=sorted(set(TRACE_FORMATS.values())),
+                       help="trace format (default: guessed from the file extension)")
+    trace.add_argument("--quantum", "-q", type=quantum, default=2, help="Round Robin and MLFQ top-level time quantum (default: 2)")
+    trace.add_argument("--format", "-f", choices=OUTPUT_FORMATS, default="json", help="output format")
+    trace.add_argument("--output", "-o", default="-", help="output file (default: standard output)")
+
+    overhead = argparse.ArgumentParser(add_help=False)
+    overhead.add_argument("--switch-cost", type=duration, default=0,
+                          help="time charged per context switch (default: 0)")
+    overhead.add_argument("--dispatch-latency", type=duration, default=0,
+                          help="time charged per dispatch (default: 0)")
+
+    common = argparse.ArgumentParser(add_help=False, parents=[trace, overhead])
+    common.add_argument("--no-schedule", action="store_true",
+                        help="omit the schedule and per-process metrics, only report the summary")
+    common.add_argument("--instrument", metavar="FILE",
+                        help="write event counters, queue lengths and phase timings to this JSON file "
+                             "(- for a text report on standard error)")
+    common.add_argument("--profile", choices=PROFILERS,
+                        help="profile the run; the profile is part of the --instrument report")
+    common.add_argument("--cache", metavar="DIR",
+                        help="keep results in this directory and reuse them for unchanged traces and settings")
+
+    run = commands.add_parser("run", parents=[common], help="run one scheduling algorithm")
+    run.add_argument("--algo", "-a", type=resolve_algorithm, required=True,
+                     help=f"algorithm: {', '.join(scheduler_names())}")
+    run.add_argument("--cpus", type=int, default=1, help="number of CPUs to simulate (default: 1)")
+    run.add_argument("--queues", choices=QUEUE_MODES, default="global",
+                     help="one global run queue or one per CPU (default: global)")
+    run.add_argument("--no-stealing", dest="stealing", action="store_false",
+                     help="idle CPUs do not steal work from other per-CPU queues")
+    run.add_argument("--affinity", type=affinity, action="append", metavar="PID=CORES",
+                     help="CPUs a process may run on, e.g. 7=0,2-3 (repeatable)")
+
+    compare = commands.add_parser("compare", parents=[common], help="compare the scheduling algorithms")
+    compare.add_argument("--parallel", action="store_true", help="run the algorithms in a process pool")
+    compare.add_argument("--workers", type=int, help="number of parallel workers")
+    compare.add_argument("--algos", type=resolve_algorithm, nargs="+", metavar="ALGO",
+                         help=f"algorithms to compare (default: {', '.join(scheduler_names(compared=True))})")
+
+    stream = commands.add_parser("stream", parents=[trace, overhead],
+                                 help="simulate an arrival-sorted trace with bounded memory")
+    stream.add_argument("--algo", "-a", type=resolve_algorithm, required=True,
+                        help=f"algorithm: {', '.join(scheduler_names(streaming=True))}")
+    stream.add_argument("--segments", help="write the schedule segments to this CSV file as they are produced")
+    stream.add_argument("--progress", type=int, metavar="N",
+                        help="report live metrics on standard error every N segments")
+
+    generate = commands.add_parser("generate", help="write a synthetic workload trace")
+    generate.add_argument("-n", "--processes", type=int, required=True, help="number of processes")
+    generate.add_argument("--arrivals", choices=ARRIVAL_PATTERNS, default="poisson", help="arrival pattern")
+    generate.add_argument("--bursts", choices=BURST_DISTRIBUTIONS, default="exponential",
+                          help="burst time distribution")
+    generate.add_argument("--seed", type=int, help="random seed (default: random)")
+    generate.add_argument("--arrival-rate", type=float, default=0.15, help="arrivals per time unit")
+    generate.add_argument("--mean-burst", type=float, default=5.0, help="mean burst time")
+    generate.add_argument("--priority-levels", type=int, default=10, help="number of priority values")
+    generate.add_argument("--float", dest="integer", action="store_false", help="keep float times")
+    generate.add_argument("--output", "-o", default="-", help="trace file (default: CSV on standard output)")
+    generate.add_argument("--output-format", choices=sorted(set(TRACE_FORMATS.values())),
+                          help="trace format (default: guessed from the file extension)")
+
+    return parser
+
+
+def generate_command(args):
+    """Generate a workload and write it as a trace file."""
+    table = generate_workload(
+        args.processes, args.arrivals, args.bursts, seed=args.seed, arrival_rate=args.arrival_rate,
+        mean_burst=args.mean_burst, priority_levels=args.priority_levels, integer=args.integer,
+    )
+    fmt = args.output_format or ("csv" if args.output == "-" else None)
+    write_trace(args.output, table, fmt)
+
+
+def run_command(args, processes, instrument=None, cache=None):
+    """Run one algorithm, returning {algorithm: result}."""
+    from controllers.scheduler import run_scheduling_algorithm
+
+    schedule, summary, detailed = run_scheduling_algorithm(
+        args.algo, processes, args.quantum, instrument=instrument, switch_cost=args.switch_cost,
+        dispatch_latency=args.dispatch_latency, cpus=args.cpus, queues=args.queues, stealing=args.stealing,
+        affinity=dict(args.affinity) if args.affinity else None, cache=cache,
+    )
+    return {args.algo: {"schedule": schedule, "summary": summary, "detailed": detailed}}
+
+
+def compare_command(args, processes, instrument=None, cache=None):
+    """Compare the chosen (default: all) algorithms, returning {algorithm: result}."""
+    from algorithms.comparison import compare_algorithms
+
+    return compare_algorithms(processes, args.quantum, parallel=args.parallel, max_workers=args.workers,
+                              instrument=instrument, switch_cost=args.switch_cost,
+                              dispatch_latency=args.dispatch_latency, algorithms=args.algos, cache=cache)
+
+
+def write_instrumentation(instrument, path):
+    """Write the instrumentation report as JSON, or as text to standard error for '-'."""
+    if path == "-":
+        print(instrument.format_report(), file=sys.stderr)
+        return
+    with open(path, "w") as f:
+        json.dump(instrument.report(), f, indent=2)
+        f.write("\n")
+
+
+def stream_command(args):
+    """
+    Stream the trace through a streaming engine, returning {algorithm: result}
+    with the summary only; the schedule goes to --segments if given.
+    """
+    from algorithms.streaming import simulate_stream
+
+    records = iter_trace(args.input, args.input_format)
+    metrics = OnlineMetrics()
+    segments_file = open(args.segments, "w", newline="") if args.segments else None
+    try:
+        if segments_file is not None:
+            writer = csv.writer(segments_file)
+            writer.writerow(["pid", "start", "end"])
+        segments = simulate_stream(args.algo, records, args.quantum, metrics, args.switch_cost, args.dispatch_latency)
+        for count, segment in enumerate(segments, start=1):
+            if segments_file is not None:
+                writer.writerow(segment)
+            if args.progress and count % args.progress == 0:
+                report_progress(metrics)
+    finally:
+        if segments_file is not None:
+            segments_file.close()
+    return {args.algo: {"schedule": [], "summary": metrics.summary(), "detailed": []}}
+
+
+def report_progress(metrics):
+    """Print one line of live metrics to standard error."""
+    summary = metrics.summary() or {}
+    print(f"segments={metrics.segments} completed={metrics.completed} in_flight={metrics.in_flight} "
+          f"avg_waiting={summary.get('avg_waiting_time', 0):.4f} "
+          f"p95_waiting={summary.get('p95_waiting_time') or 0:.4f}", file=sys.stderr)
+
+
+def write_json(results, out, include_schedule):
+    document = {}
+    for name, result in results.items():
+        entry = {"summary": result["summary"]}
+        if include_schedule:
+            entry["schedule"] = [list(segment) for segment in result["schedule"]]
+            entry["detailed"] = None if result["detailed"] is None else list(result["detailed"])
+        document[name] = entry
+    json.dump(document, out)
+    out.write("\n")
+
+
+def write_csv(results, out, include_schedule):
+    """
+    Write the schedule rows (algorithm, pid, start, end[, core]), or one
+    summary row per algorithm when the schedule is omitted.
+    """
+    writer = csv.writer(out)
+    if include_schedule:
+        cores = any(r["schedule"] and len(r["schedule"][0]) > 3 for r in results.values())
+        writer.writerow(["algorithm", "pid", "start", "end"] + (["core"] if cores else []))
+        for name, result in results.items():
+            writer.writerows((name, *segment) for segment in result["schedule"])
+        return
+
+    metrics = next((list(r["summary"]) for r in results.values() if r["summary"]), [])
+    writer.writerow(["algorithm"] + metrics)
+    for name, result in results.items():
+        summary = result["summary"] or {}
+        writer.writerow([name] + [_format_list(summary[metric], "{}") if isinstance(summary.get(metric), list)
+                                  else summary.get(metric, "") for metric in metrics])
+
+
+def write_text(results, out, include_schedule):
+    for name, result in results.items():
+        out.write(f"{name}\n")
+        if not result["summary"]:
+            out.write("  No metrics available.\n\n")
+            continue
+        for metric, value in result["summary"].items():
+            if isinstance(value, list):
+                out.write(f"  {metric:<22} {_format_list(value, '{:.4f}')}\n")
+            elif isinstance(value, int):
+                # Counters such as context_switches, cpus and migrations
+                out.write(f"  {metric:<22} {value}\n")
+            else:
+                out.write(f"  {metric:<22} {value:.4f}\n")
+        if include_schedule:
+            out.write("  Schedule:\n")
+            for pid, start, end, *core in result["schedule"]:
+                out.write(f"    P{pid}: {start} -> {end}" + (f" on CPU {core[0]}" if core else "") + "\n")
+        out.write("\n")
+
+
+def _format_list(values, fmt):
+    """Per-CPU values such as 'core_utilization' as one space-separated field."""
+    return " ".join(fmt.format(value) for value in values)
+
+
+WRITERS = {"json": write_json, "csv": write_csv, "text": write_text}
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.command == "generate":
+        try:
+            generate_command(args)
+        except (OSError, ValueError) as e:
+            print(f"cpuscheduler: cannot generate workload: {e}", file=sys.stderr)
+            return 2
+        return 0
+
+    instrument = None
+    if args.command in ("run", "compare") and (args.instrument or args.profile):
+        if args.command == "compare" and args.parallel:
+            parser.error("--instrument and --profile need a serial comparison, drop --parallel")
+        instrument = Instrumentation(profiler=args.profile)
+    if args.command == "run":
+        if args.cpus < 1:
+            parser.error("--cpus must be at least 1")
+        if args.cpus > 1 and (args.switch_cost or args.dispatch_latency):
+            parser.error("--switch-cost and --dispatch-latency are only simulated on one CPU")
+        if args.cpus > 1 and get_scheduler(args.algo).smp_policy is None:
+            multi_cpu = [name for name, scheduler in SCHEDULERS.items() if scheduler.smp_policy is not None]
+            parser.error(f"{args.algo} is only simulated on one CPU, --cpus needs one of: {', '.join(multi_cpu)}")
+    if args.command == "stream":
+        streaming = scheduler_names(streaming=True)
+        if args.algo not in streaming:
+            parser.error(f"no streaming engine for '{args.algo}', choose from: {', '.join(streaming)}")
+    else:
+        try:
+            processes = read_trace(args.input, args.input_format)
+        except (OSError, TraceError) as e:
+            print(f"cpuscheduler: cannot read trace: {e}", file=sys.stderr)
+            return 2
+
+    try:
+        if args.command == "stream":
+            results = stream_command(args)
+        else:
+            from algorithms.cache import ResultsCache
+
+            cache = ResultsCache(directory=args.cache) if args.cache else None
+            if args.command == "run":
+                results = run_command(args, processes, instrument, cache)
+            else:
+                results = compare_command(args, processes, instrument, cache)
+    except TraceError as e:
+        # A streamed trace is read while it is simulated
+        print(f"cpuscheduler: cannot read trace: {e}", file=sys.stderr)
+        return 2
+    except (OSError, ValueError, KeyError) as e:
+        print(f"cpuscheduler: {args.command} failed: {e}", file=sys.stderr)
+        return 2
+
+    include_schedule = args.command != "stream" and not args.no_schedule
+    out = sys.stdout if args.output == "-" else open(args.output, "w", newline="")
+    try:
+        WRITERS[args.format](results, out, include_schedule)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    if instrument is not None:
+        write_instrumentation(instrument, args.instrument or "-")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,13 +1,25 @@
+import threading
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, simpledialog, filedialog
 from ttkbootstrap.constants import *
 
+from algorithms.cache import ResultsCache
+from algorithms.control import RunControl, SimulationCancelled
+from algorithms.incremental import IncrementalSimulator
+from algorithms.instrumentation import Instrumentation
+from algorithms.registry import SCHEDULERS, get_scheduler, scheduler_names
 from controllers.scheduler import run_scheduling_algorithm
-from visualization.gantt_chart import create_gantt_chart
+from gui.process_store import ProcessStore
+from gui.virtual_table import VirtualTable
 from visualization.metrics_display import display_metrics
 # Import the new comparison functionality
-from algorithms.comparison import compare_algorithms
-from visualization.comparison_display import create_comparison_window
+from algorithms.comparison import compare_algorithms, sweep_round_robin
+from algorithms.workloads import generate_workload
+# The chart modules, and with them matplotlib, are imported on first use so
+# they do not delay the first window
+
+# How often the Tk thread checks on a background simulation
+POLL_INTERVAL_MS = 100
 
 def create_ui(root):
     """
@@ -76,18 +88,23 @@ def create_ui(root):
     ttk.Label(frame_input, text="Burst").grid(row=0, column=4)
     ttk.Label(frame_input, text="Priority").grid(row=0, column=6)
 
-    # Create process table
+    # Create process table: the processes live in the store, the table only
+    # holds the rows currently scrolled into view
     columns = ("PID", "Arrival", "Burst", "Priority")
-    table = ttk.Treeview(frame_table, columns=columns, show="headings")
-    for col in columns:
-        table.heading(col, text=col)
-        table.column(col, width=80)
+    store = ProcessStore()
+    table = VirtualTable(frame_table, store, columns)
     table.pack()
 
     # Define algorithm variable and time quantum
     algo_var = tk.StringVar(value="FCFS")
+    # Record counters, phase timings and a profile of the next runs
+    instrument_var = tk.BooleanVar(value=False)
     time_quantum = ttk.Entry(frame_controls, width=5)
     label_quantum = ttk.Label(frame_controls, text="Time Quantum:")
+    # Time charged per context switch, empty for none
+    switch_cost = ttk.Entry(frame_controls, width=5)
+    # Number of simulated CPUs of a run, empty for one
+    cpu_count = ttk.Entry(frame_controls, width=4)
 
     # Function to add a new process
     def add_process():
@@ -96,95 +113,260 @@ def create_ui(root):
             arrival = int(entry_arrival.get())
             burst = int(entry_burst.get())
             priority = int(entry_priority.get())
-            table.insert("", "end", values=(pid, arrival, burst, priority))
+            store.add(pid, arrival, burst, priority)
+            table.scroll_to(len(store) - 1)
         except ValueError:
             messagebox.showerror("Error", "Invalid input. Please enter valid numbers.")
 
     # Function to delete selected process
     def delete_process():
-        selected_item = table.selection()
-        if selected_item:
-            table.delete(selected_item)
+        selected_rows = table.selected_indices()
+        if selected_rows:
+            store.delete(selected_rows)
+            table.refresh()
 
     # Function to reset the table
     def reset_table():
-        for row in table.get_children():
-            table.delete(row)
+        store.clear()
+        table.refresh()
+
+    # Function to import processes from a CSV or JSON file
+    def import_processes():
+        path = filedialog.askopenfilename(
+            parent=root, title="Import Processes",
+            filetypes=[("Process traces", "*.csv *.json *.jsonl *.ndjson"), ("All files", "*.*")]
+        )
+        if not path:
+            return
+        try:
+            store.load(path)
+        except Exception as e:
+            messagebox.showerror("Error", f"Import failed: {e}")
+        table.refresh()
+
+    # Function to replace the processes with a synthetic workload
+    def generate_processes():
+        count = simpledialog.askinteger(
+            "Generate Processes", "Number of processes (Poisson arrivals, exponential bursts):",
+            initialvalue=1000, minvalue=1, parent=root
+        )
+        if not count:
+            return
+        store.extend(generate_workload(count), replace=True)
+        table.refresh()
 
     # Function to update time quantum visibility
     def update_time_quantum_visibility(*args):
-        if algo_var.get() == "Round Robin":
+        if get_scheduler(algo_var.get()).needs_quantum:
             label_quantum.pack(side="left", padx=5)
             time_quantum.pack(side="left", padx=5)
         else:
             label_quantum.pack_forget()
             time_quantum.pack_forget()
 
+    # Function to get the processes for a run, as a ProcessTable
+    def read_processes():
+        return store.to_table()
+
+    # Function to get the context-switch cost (0 if empty)
+    def read_switch_cost():
+        text = switch_cost.get().strip()
+        if not text:
+            return 0
+        value = float(text) if "." in text else int(text)
+        if value < 0:
+            raise ValueError("Switch cost must not be negative")
+        return value
+
+    # Function to get the number of CPUs of a run (1 if empty)
+    def read_cpus():
+        text = cpu_count.get().strip()
+        cpus = int(text) if text else 1
+        if cpus < 1:
+            raise ValueError("At least one CPU is needed")
+        return cpus
+
+    # Results of earlier runs and comparisons, reused while the processes
+    # and settings are unchanged
+    results_cache = ResultsCache()
+    # Checkpoints of the last FCFS, SJF and Priority runs, so a run after
+    # adding or deleting a process only re-simulates from that process on
+    simulator = IncrementalSimulator()
+
+    # RunControl of the simulation running in the background, if any
+    background = {"control": None}
+
+    # Function to run a simulation off the Tk thread
+    def run_in_background(work, on_done, error_title):
+        """
+        Run work(control) in a worker thread and pass its result to on_done on
+        the Tk thread. The worker never touches Tk: progress and completion
+        are polled from the Tk thread with root.after.
+        """
+        if background["control"] is not None:
+            messagebox.showinfo("Busy", "A simulation is already running.")
+            return
+
+        control = RunControl()
+        outcome = {}
+
+        def target():
+            try:
+                outcome["result"] = work(control)
+            except Exception as e:
+                outcome["error"] = e
+
+        def poll():
+            progress_bar["value"] = 100 * control.progress
+            status_var.set(f"Running {control.label}..." if control.label else "Running...")
+            if worker.is_alive():
+                root.after(POLL_INTERVAL_MS, poll)
+                return
+
+            # Finished, cancelled or failed: reset the controls
+            background["control"] = None
+            cancel_button.configure(state="disabled")
+            progress_bar["value"] = 0
+            status_var.set("")
+            error = outcome.get("error")
+            if isinstance(error, SimulationCancelled):
+                status_var.set("Cancelled")
+            elif error is not None:
+                messagebox.showerror("Error", f"{error_title}: {error}")
+            else:
+                on_done(outcome["result"])
+
+        background["control"] = control
+        cancel_button.configure(state="normal")
+        worker = threading.Thread(target=target, daemon=True)
+        worker.start()
+        root.after(POLL_INTERVAL_MS, poll)
+
+    # Function to cancel the background simulation
+    def cancel_background():
+        if background["control"] is not None:
+            background["control"].cancel()
+
     # Function to calculate scheduling
     def calculate_scheduling():
         algorithm = algo_var.get()
         try:
-            processes = []
-            for row in table.get_children():
-                values = table.item(row)['values']
-                processes.append({
-                    'pid': int(values[0]), 
-                    'arrival': int(values[1]), 
-                    'burst': int(values[2]), 
-                    'priority': int(values[3])
-                })
-
+            processes = read_processes()
             quantum = int(time_quantum.get()) if time_quantum.get() else 2
-            
-            # Run the scheduler
-            schedule, summary_metrics, detailed_metrics = run_scheduling_algorithm(
-                algorithm, processes, quantum if algorithm == "Round Robin" else None
-            )
-            
-            # Display results
-            create_gantt_chart(schedule, frame_chart)
-            display_metrics(frame_metrics, summary_metrics, detailed_metrics)
-            
+            cost = read_switch_cost()
+            cpus = read_cpus()
         except Exception as e:
             messagebox.showerror("Error", f"Invalid input: {e}")
-    
+            return
+
+        instrument = Instrumentation(profiler="cprofile") if instrument_var.get() else None
+
+        def show_results(result):
+            from visualization.gantt_chart import create_gantt_chart
+
+            schedule, summary_metrics, detailed_metrics = result
+            create_gantt_chart(schedule, frame_chart, processes)
+            display_metrics(frame_metrics, summary_metrics, detailed_metrics)
+            if instrument is not None:
+                show_instrumentation(instrument)
+
+        # Run the scheduler in the background, then display results
+        run_in_background(
+            lambda control: run_scheduling_algorithm(
+                algorithm, processes, quantum if get_scheduler(algorithm).needs_quantum else None, control=control,
+                instrument=instrument, switch_cost=cost, cpus=cpus, cache=results_cache,
+                incremental=simulator
+            ),
+            show_results,
+            "Scheduling failed"
+        )
+
     # Function to compare all scheduling algorithms
     def compare_algorithms_action():
         try:
-            processes = []
-            for row in table.get_children():
-                values = table.item(row)['values']
-                processes.append({
-                    'pid': int(values[0]), 
-                    'arrival': int(values[1]), 
-                    'burst': int(values[2]), 
-                    'priority': int(values[3])
-                })
-            
-            if not processes:
-                messagebox.showerror("Error", "No processes to compare. Please add some processes first.")
-                return
-                
+            processes = read_processes()
             quantum = int(time_quantum.get()) if time_quantum.get() else 2
-            
-            # Run comparison
-            comparison_results = compare_algorithms(processes, quantum)
-            
-            # Show comparison window
-            create_comparison_window(root, comparison_results)
-            
+            cost = read_switch_cost()
         except Exception as e:
-            messagebox.showerror("Error", f"Comparison failed: {e}")
+            messagebox.showerror("Error", f"Invalid input: {e}")
+            return
+
+        if not processes:
+            messagebox.showerror("Error", "No processes to compare. Please add some processes first.")
+            return
+
+        instrument = Instrumentation(profiler="cprofile") if instrument_var.get() else None
+
+        def show_comparison(comparison_results):
+            from visualization.comparison_display import create_comparison_window
+
+            create_comparison_window(root, comparison_results, processes)
+            if instrument is not None:
+                show_instrumentation(instrument)
+
+        # Run comparison in the background, then show the comparison window
+        run_in_background(
+            lambda control: compare_algorithms(processes, quantum, control=control, instrument=instrument,
+                                               switch_cost=cost, cache=results_cache),
+            show_comparison,
+            "Comparison failed"
+        )
+
+    # Function to show what an instrumented run recorded
+    def show_instrumentation(instrument):
+        from visualization.instrumentation_display import create_instrumentation_window
+
+        create_instrumentation_window(root, instrument)
+
+    # Function to sweep the Round Robin time quantum
+    def sweep_quantum_action():
+        try:
+            processes = read_processes()
+            cost = read_switch_cost()
+        except Exception as e:
+            messagebox.showerror("Error", f"Invalid input: {e}")
+            return
+
+        if not processes:
+            messagebox.showerror("Error", "No processes to sweep. Please add some processes first.")
+            return
+
+        quanta_text = simpledialog.askstring(
+            "Quantum Sweep", "Time quanta to evaluate (e.g. 1-10 or 1,2,4,8):",
+            initialvalue="1-10", parent=root
+        )
+        if not quanta_text:
+            return
+        try:
+            quanta = parse_quanta(quanta_text)
+        except ValueError as e:
+            messagebox.showerror("Error", f"Invalid time quanta: {e}")
+            return
+
+        def show_sweep(sweep_results):
+            from visualization.sweep_display import create_sweep_window
+
+            # Plot the metrics against the quantum
+            create_sweep_window(root, sweep_results)
+
+        # Run the sweep in the background, then show the sweep window
+        run_in_background(
+            lambda control: sweep_round_robin(processes, quanta, switch_cost=cost, control=control),
+            show_sweep,
+            "Quantum sweep failed"
+        )
 
     # Add controls
     ttk.Button(frame_input, text="Add Process", command=add_process, bootstyle=INFO).grid(row=0, column=8, padx=5)
     ttk.Button(frame_input, text="Delete", command=delete_process, bootstyle=WARNING).grid(row=0, column=9, padx=5)
     ttk.Button(frame_input, text="Reset", command=reset_table, bootstyle=PRIMARY).grid(row=0, column=10, padx=5)
+    ttk.Button(frame_input, text="Import...", command=import_processes, bootstyle=SECONDARY).grid(row=0, column=11, padx=5)
+    ttk.Button(frame_input, text="Generate...", command=generate_processes, bootstyle=SECONDARY).grid(row=0, column=12, padx=5)
     
     # Algorithm selection
     algo_var.trace("w", update_time_quantum_visibility)
     algo_menu = ttk.Combobox(frame_controls, textvariable=algo_var,
-                           values=["FCFS", "SJF", "SRTF", "Round Robin", "Priority"],
+                           values=scheduler_names(),
                            state="readonly")
     algo_menu.pack(side="left", padx=5)
     
@@ -199,17 +381,41 @@ def create_ui(root):
         bootstyle=SUCCESS
     ).pack(side="left", padx=5)
 
-    # Add explanation
-    explanation_text = """
-FCFS: First-Come-First-Serve - Non-preemptive, processes scheduled in arrival order
-SJF: Shortest Job First - Non-preemptive, processes with shortest burst time first
-SRTF: Shortest Remaining Time First - Preemptive version of SJF
-Round Robin: Time-sliced scheduling with a quantum
-Priority: Non-preemptive scheduling based on priority values
+    # Add quantum sweep button
+    ttk.Button(
+        frame_controls,
+        text="Quantum Sweep",
+        command=sweep_quantum_action,
+        bootstyle=SECONDARY
+    ).pack(side="left", padx=5)
+
+    # Context-switch cost of the runs
+    ttk.Label(frame_controls, text="Switch Cost:").pack(side="left", padx=5)
+    switch_cost.pack(side="left", padx=5)
+
+    # CPUs simulated by Run Scheduler (comparisons and sweeps use one)
+    ttk.Label(frame_controls, text="CPUs:").pack(side="left", padx=5)
+    cpu_count.pack(side="left", padx=5)
+
+    # Opt-in instrumentation of the runs
+    ttk.Checkbutton(frame_controls, text="Instrument", variable=instrument_var).pack(side="left", padx=5)
 
+    # Progress of background simulations and a button to stop them
+    progress_bar = ttk.Progressbar(frame_controls, length=150, maximum=100)
+    progress_bar.pack(side="left", padx=5)
+    cancel_button = ttk.Button(frame_controls, text="Cancel", command=cancel_background,
+                               bootstyle=DANGER, state="disabled")
+    cancel_button.pack(side="left", padx=5)
+    status_var = tk.StringVar()
+    ttk.Label(frame_controls, textvariable=status_var).pack(side="left", padx=5)
+
+    # Add explanation
+    explanation_text = "\n" + "".join(f"{name}: {scheduler.description}\n" for name, scheduler in SCHEDULERS.items()) + """
 Performance Metrics:
 - Average Waiting Time: Average time processes spend waiting in the ready queue
 - Average Turnaround Time: Average time from process arrival to completion
+- Average Response Time: Average time from process arrival to its first run on the CPU
+- Waiting Time Percentiles: p50 / p95 / p99 of the per-process waiting times
 - CPU Utilization: Percentage of time the CPU is busy processing
 - Throughput: Number of processes completed per unit time
 """
@@ -230,3 +436,24 @@ Performance Metrics:
     
     # Initialize UI based on current algorithm
     update_time_quantum_visibility()
+
+
+def parse_quanta(text):
+    """
+    Parse a list of time quanta such as "1-10" or "1,2,4,8" (ranges and
+    single values can be mixed, e.g. "1-4,8,16").
+
+    Returns:
+        Sorted list of distinct positive integers
+    """
+    quanta = set()
+    for part in text.split(","):
+        part = part.strip()
+        if "-" in part:
+            low, high = (int(value) for value in part.split("-", 1))
+            quanta.update(range(low, high + 1))
+        elif part:
+            quanta.add(int(part))
+    if not quanta or min(quanta) <= 0:
+        raise ValueError("Time quanta must be positive integers")
+    return sorted(quanta)
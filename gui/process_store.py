@@ -0,0 +1,95 @@
+# gui/process_store.py
+
+from algorithms.process_table import ProcessTable
+from algorithms.traces import read_trace
+
+
+class ProcessStore:
+    """
+    In-memory process list behind the GUI's process table.
+
+    The rows live in plain column lists, independent of any widget, so the
+    view only has to display the rows that are visible. The schedulers get a
+    ProcessTable built from the columns once per change, not once per run.
+    """
+
+    def __init__(self):
+        self.pid = []
+        self.arrival = []
+        self.burst = []
+        self.priority = []
+        # ProcessTable of the current rows, rebuilt after a change
+        self._table = None
+
+    def __len__(self):
+        return len(self.pid)
+
+    def row(self, index):
+        """Return the row at index as a tuple (pid, arrival, burst, priority)."""
+        return self.pid[index], self.arrival[index], self.burst[index], self.priority[index]
+
+    def rows(self, start, stop):
+        """Return the rows in [start, stop) as tuples."""
+        return list(zip(self.pid[start:stop], self.arrival[start:stop],
+                        self.burst[start:stop], self.priority[start:stop]))
+
+    def add(self, pid, arrival, burst, priority=0):
+        """Append one process."""
+        self.pid.append(pid)
+        self.arrival.append(arrival)
+        self.burst.append(burst)
+        self.priority.append(priority)
+        self._table = None
+
+    def delete(self, indices):
+        """Delete the rows at the given indices."""
+        indices = set(indices)
+        if not indices:
+            return
+        for name in ('pid', 'arrival', 'burst', 'priority'):
+            column = getattr(self, name)
+            setattr(self, name, [value for i, value in enumerate(column) if i not in indices])
+        self._table = None
+
+    def clear(self):
+        """Delete all rows."""
+        self.pid, self.arrival, self.burst, self.priority = [], [], [], []
+        self._table = None
+
+    def load(self, path, replace=True):
+        """
+        Import processes from a trace file (CSV, JSON or JSON lines, see
+        algorithms.traces.read_trace).
+
+        Args:
+            path: Path of the trace file
+            replace: If True, replace the current rows, otherwise append
+
+        Returns:
+            Number of processes imported
+        """
+        table = read_trace(path)
+        self.extend(table, replace)
+        return len(table)
+
+    def extend(self, table, replace=False):
+        """
+        Append the rows of a ProcessTable, e.g. a generated workload.
+
+        Args:
+            table: ProcessTable to add
+            replace: If True, replace the current rows instead
+        """
+        if replace:
+            self.clear()
+        self.pid.extend(table.pid.tolist())
+        self.arrival.extend(table.arrival.tolist())
+        self.burst.extend(table.burst.tolist())
+        self.priority.extend(table.priority.tolist())
+        self._table = table if replace else None
+
+    def to_table(self):
+        """Return the rows as a ProcessTable, cached until the next change."""
+        if self._table is None:
+            self._table = ProcessTable(self.pid, self.arrival, self.burst, self.priority)
+        return self._table
@@ -0,0 +1,85 @@
+# gui/virtual_table.py
+
+from tkinter import ttk
+
+
+class VirtualTable:
+    """
+    Treeview showing a window of rows of a ProcessStore.
+
+    Only the visible rows exist as Treeview items; scrolling replaces them
+    with the rows at the new position. Item ids are the row indices in the
+    store, so selections map straight back to store rows.
+    """
+
+    def __init__(self, parent, store, columns, height=10):
+        """
+        Args:
+            parent: Parent Tkinter widget
+            store: ProcessStore to display
+            columns: Column headings, one per store field
+            height: Number of visible rows
+        """
+        self.store = store
+        self.height = height
+        self.offset = 0
+
+        self.frame = ttk.Frame(parent)
+        self.tree = ttk.Treeview(self.frame, columns=columns, show="headings", height=height)
+        for col in columns:
+            self.tree.heading(col, text=col)
+            self.tree.column(col, width=80)
+        self.scrollbar = ttk.Scrollbar(self.frame, orient="vertical", command=self._on_scrollbar)
+        self.tree.pack(side="left")
+        self.scrollbar.pack(side="right", fill="y")
+
+        # Scroll the rows, not the page around the table
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.tree.bind(sequence, self._on_mousewheel)
+
+        self.refresh()
+
+    def pack(self, **kwargs):
+        self.frame.pack(**kwargs)
+
+    def refresh(self):
+        """Redraw the visible rows, e.g. after the store changed."""
+        self.offset = max(0, min(self.offset, len(self.store) - self.height))
+        self.tree.delete(*self.tree.get_children())
+        for index, row in enumerate(self.store.rows(self.offset, self.offset + self.height), start=self.offset):
+            self.tree.insert("", "end", iid=str(index), values=row)
+
+        total = len(self.store)
+        if total <= self.height:
+            self.scrollbar.set(0, 1)
+        else:
+            self.scrollbar.set(self.offset / total, (self.offset + self.height) / total)
+
+    def scroll_to(self, index):
+        """Scroll so that the row at index is visible."""
+        if index < self.offset:
+            self.offset = index
+        elif index >= self.offset + self.height:
+            self.offset = index - self.height + 1
+        self.refresh()
+
+    def selected_indices(self):
+        """Store indices of the selected rows."""
+        return [int(iid) for iid in self.tree.selection()]
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.offset = int(float(amount) * len(self.store))
+        elif unit == "pages":
+            self.offset += int(amount) * self.height
+        else:
+            self.offset += int(amount)
+        self.refresh()
+
+    def _on_mousewheel(self, event):
+        if event.num == 4 or event.delta > 0:
+            self.offset -= 3
+        else:
+            self.offset += 3
+        self.refresh()
+        return "break"
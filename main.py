@@ -3,7 +3,8 @@ import tkinter as tk
 import ttkbootstrap as ttk
 from gui.app_ui import create_ui
 
-def main():
+def create_main_window():
+    """Create the main window with the application UI, without running it."""
     # Create the main window with ttkbootstrap theme
     root = ttk.Window(themename="solar")  # Changed from "darkly" to "solar"
     root.title("CPU Scheduler Simulator")
@@ -11,6 +12,10 @@ def main():
     
     # Create the application UI
     create_ui(root)
+    return root
+
+def main():
+    root = create_main_window()
     
     # Start the application
     root.mainloop()
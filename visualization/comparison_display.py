@@ -2,17 +2,20 @@
 
 import tkinter as tk
 from tkinter import ttk
-import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
 
-def create_comparison_window(parent, comparison_results):
+from visualization.gantt_chart import gantt_figure
+
+def create_comparison_window(parent, comparison_results, processes=None):
     """
     Create a new window to display algorithm comparison results.
     
     Args:
         parent: Parent Tkinter window
         comparison_results: Dictionary with results for each algorithm
+        processes: Optional processes that were compared, so the Gantt
+            charts can tell overhead segments from processes
     """
     # Create a new top-level window
     comparison_window = tk.Toplevel(parent)
@@ -42,7 +45,7 @@ def create_comparison_window(parent, comparison_results):
     create_comparison_charts(charts_frame, comparison_results)
     
     # Create Gantt charts for each algorithm
-    create_all_gantt_charts(gantt_frame, comparison_results)
+    create_all_gantt_charts(gantt_frame, comparison_results, processes)
 
 def create_summary_table(frame, comparison_results):
     """Create a table showing all algorithms and their metrics side by side"""
@@ -65,12 +68,17 @@ def create_summary_table(frame, comparison_results):
     table.column("Metric", width=180, anchor="w")
     
     # Add the metrics data
-    metrics = ["avg_waiting_time", "avg_turnaround_time", "cpu_utilization", "throughput"]
+    metrics = ["avg_waiting_time", "avg_turnaround_time", "avg_response_time", "p95_waiting_time",
+               "cpu_utilization", "throughput", "context_switches", "switch_overhead"]
     metric_names = {
         "avg_waiting_time": "Average Waiting Time",
         "avg_turnaround_time": "Average Turnaround Time",
+        "avg_response_time": "Average Response Time",
+        "p95_waiting_time": "95th Percentile Waiting Time",
         "cpu_utilization": "CPU Utilization (%)",
-        "throughput": "Throughput (proc/time)"
+        "throughput": "Throughput (proc/time)",
+        "context_switches": "Context Switches",
+        "switch_overhead": "Switch Overhead (%)"
     }
     
     for metric in metrics:
@@ -78,7 +86,9 @@ def create_summary_table(frame, comparison_results):
         for algo in comparison_results.keys():
             if comparison_results[algo]["summary"]:
                 value = comparison_results[algo]["summary"][metric]
-                if metric == "cpu_utilization" or metric == "throughput":
+                if metric == "context_switches":
+                    formatted_value = f"{value}"
+                elif metric == "cpu_utilization" or metric == "throughput":
                     formatted_value = f"{value:.2f}"
                 else:
                     formatted_value = f"{value:.2f}"
@@ -109,7 +119,8 @@ def create_summary_table(frame, comparison_results):
 def find_best_algorithms(comparison_results):
     """Find the best algorithm for each metric"""
     best = {}
-    metrics = ["avg_waiting_time", "avg_turnaround_time", "cpu_utilization", "throughput"]
+    metrics = ["avg_waiting_time", "avg_turnaround_time", "avg_response_time", "p95_waiting_time",
+               "cpu_utilization", "throughput"]
     
     for metric in metrics:
         best_value = None
@@ -119,13 +130,13 @@ def find_best_algorithms(comparison_results):
             if data["summary"] and metric in data["summary"]:
                 value = data["summary"][metric]
                 
-                # For waiting and turnaround times, lower is better
+                # For waiting, turnaround and response times, lower is better
                 # For CPU utilization and throughput, higher is better
                 is_better = False
                 
                 if best_value is None:
                     is_better = True
-                elif metric in ["avg_waiting_time", "avg_turnaround_time"]:
+                elif metric in ["avg_waiting_time", "avg_turnaround_time", "avg_response_time", "p95_waiting_time"]:
                     is_better = value < best_value
                 else:  # cpu_utilization, throughput
                     is_better = value > best_value
@@ -186,7 +197,7 @@ def create_comparison_charts(frame, comparison_results):
     canvas.draw()
     canvas.get_tk_widget().pack(fill="both", expand=True)
 
-def create_all_gantt_charts(frame, comparison_results):
+def create_all_gantt_charts(frame, comparison_results, processes=None):
     """Create a Gantt chart for each algorithm"""
     # Create a canvas with scrollbar for the Gantt charts
     canvas = tk.Canvas(frame)
@@ -205,49 +216,17 @@ def create_all_gantt_charts(frame, comparison_results):
     scrollbar.pack(side="right", fill="y")
     
     # Add Gantt charts for each algorithm
-    for i, (algo_name, data) in enumerate(comparison_results.items()):
+    for algo_name, data in comparison_results.items():
         # Create a frame for this algorithm
         algo_frame = ttk.LabelFrame(scrollable_frame, text=algo_name)
         algo_frame.pack(fill="x", padx=10, pady=10, anchor="n")
         
-        # Create the Gantt chart
-        fig, ax = plt.subplots(figsize=(8, 2))
-        
-        schedule = data["schedule"]
-        if not schedule or all(task[2] - task[1] == 0 for task in schedule):
+        # A Figure of its own per canvas; the lane layout is reused if this schedule was shown before
+        fig = gantt_figure(data["schedule"], title=f"{algo_name} Schedule", figsize=(8, 3), processes=processes)
+        if fig is None:
             ttk.Label(algo_frame, text="No valid schedule to display").pack()
             continue
         
-        # Define color palette for processes
-        color_palette = ['#FF5733', '#33FF57', '#3357FF', '#FF33A8', '#A833FF', '#FFC300', '#008080', '#800080']
-        process_colors = {}
-        
-        # Plot each task in the schedule
-        y_pos = 0
-        for task in schedule:
-            pid, start, end = task
-            
-            # Assign colors to processes
-            if pid not in process_colors:
-                process_colors[pid] = color_palette[len(process_colors) % len(color_palette)]
-            
-            # Create the bar for this task
-            ax.barh(y=y_pos, left=start, width=end - start, color=process_colors[pid], edgecolor="black")
-            
-            # Add process ID label
-            ax.text(start + (end - start) / 2, y_pos, f"P{pid}", va='center', ha='center', 
-                    color='white', fontsize=10, fontweight='bold')
-            
-            y_pos += 1
-        
-        # Configure chart appearance
-        ax.set_xlabel("Time")
-        ax.set_yticks([])
-        ax.set_title(f"{algo_name} Schedule")
-        
-        # Add time markers
-        ax.set_xticks([task[1] for task in schedule] + [schedule[-1][2]])
-        
         canvas_widget = FigureCanvasTkAgg(fig, master=algo_frame)
         canvas_widget.draw()
         canvas_widget.get_tk_widget().pack(fill="both", expand=True)
\ No newline at end of file
@@ -1,54 +1,336 @@
-import matplotlib.pyplot as plt
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.collections import PolyCollection
+from matplotlib.colors import to_rgba_array
+from matplotlib.figure import Figure
+
+from algorithms.metrics import schedule_to_arrays
+from algorithms.overhead import CONTEXT_SWITCH_PID, DISPATCH_LATENCY_PID, OVERHEAD_PIDS, overhead_markers
+from algorithms.process_table import as_process_table
+
+# Color palette for processes, cycled over the lanes
+COLOR_PALETTE = ['#FF5733', '#33FF57', '#3357FF', '#FF33A8', '#A833FF', '#FFC300', '#008080', '#800080']
+
+# Lanes of the overhead segments, drawn above the processes
+OVERHEAD_LANES = {CONTEXT_SWITCH_PID: ("Switch", '#404040'), DISPATCH_LATENCY_PID: ("Dispatch", '#909090')}
+
+# Segments get a "P<pid>" label only in schedules up to this size
+MAX_SEGMENT_LABELS = 100
+# Every segment boundary gets an x tick only in schedules up to this size
+MAX_BOUNDARY_TICKS = 20
+# Lanes get a "P<pid>" y tick label up to this many lanes
+MAX_LANE_LABELS = 40
+
+# Number of schedules whose lane layout is kept for reuse
+LAYOUT_CACHE_SIZE = 16
 
-def create_gantt_chart(schedule, frame):
+# (schedule hash, overhead markers) -> lane layout, least recently used first
+_layout_cache = OrderedDict()
+
+
+def create_gantt_chart(schedule, frame, processes=None):
     """
     Create and display a Gantt chart in the specified frame.
-    
+
     Args:
-        schedule: List of tuples (pid, start_time, end_time)
+        schedule: Schedule or list of tuples (pid, start_time, end_time),
+            or (pid, start_time, end_time, core) for several CPUs
         frame: Tkinter frame to display the chart in
+        processes: Optional processes the schedule was made from (see
+            draw_gantt)
     """
-    if not schedule or all(task[2] - task[1] == 0 for task in schedule):
+    fig = gantt_figure(schedule, processes=processes)
+    if fig is None:
         return None
-    
+
     # Clear previous chart
     for widget in frame.winfo_children():
         widget.destroy()
-    
-    # Create figure and axis
-    fig, ax = plt.subplots(figsize=(8, 4))
-    
-    # Define color palette for processes
-    color_palette = ['#FF5733', '#33FF57', '#3357FF', '#FF33A8', '#A833FF', '#FFC300', '#008080', '#800080']
-    process_colors = {}
-    
-    # Plot each task in the schedule
-    y_pos = 0
-    for i, task in enumerate(schedule):
-        pid, start, end = task
-        
-        # Assign colors to processes
-        if pid not in process_colors:
-            process_colors[pid] = color_palette[len(process_colors) % len(color_palette)]
-        
-        # Create the bar for this task
-        ax.barh(y=y_pos, left=start, width=end - start, color=process_colors[pid], edgecolor="black")
-        
-        # Add process ID label
-        ax.text(start + (end - start) / 2, y_pos, f"P{pid}", va='center', ha='center', 
-                color='white', fontsize=10, fontweight='bold')
-        
-        y_pos += 1
-    
-    # Configure chart appearance
-    ax.set_xlabel("Time", color="white")
-    ax.set_yticks([])
-    ax.set_xticks([task[1] for task in schedule] + [schedule[-1][2]])
-    
+
     # Display the chart in the frame
     canvas = FigureCanvasTkAgg(fig, master=frame)
     canvas.get_tk_widget().pack(fill="both", expand=True)
     canvas.draw()
-    
+
     return canvas
+
+
+def gantt_figure(schedule, title=None, figsize=(8, 4), processes=None):
+    """
+    Return a new Figure with the Gantt chart of a schedule.
+
+    Every call returns a Figure of its own, so it can be attached to a canvas
+    independently of any other. The lane layout of the schedule (segment
+    lanes, labels and colors) is kept in an LRU cache keyed by a hash of the
+    schedule, so showing the same schedule again (e.g. reopening a comparison
+    of the same workload) only draws it.
+
+    Args:
+        schedule: Schedule or list of tuples (pid, start_time, end_time),
+            or (pid, start_time, end_time, core) for several CPUs
+        title: Optional axes title
+        figsize: Figure size in inches
+        processes: Optional processes the schedule was made from (see
+            draw_gantt)
+
+    Returns:
+        Figure, or None if the schedule has no segment with a duration
+    """
+    if len(schedule) == 0:
+        return None
+
+    arrays = _columns(schedule)
+    markers = _markers(processes)
+    key = (schedule_key(arrays), markers)
+    layout = _layout_cache.get(key)
+    if layout is not None:
+        _layout_cache.move_to_end(key)
+    else:
+        layout = _layout(arrays, markers)
+        _layout_cache[key] = layout
+        while len(_layout_cache) > LAYOUT_CACHE_SIZE:
+            _layout_cache.popitem(last=False)
+    if layout is None:
+        return None
+
+    fig = Figure(figsize=figsize)
+    ax = fig.add_subplot()
+    _draw_layout(ax, layout)
+    ax.set_xlabel("Time")
+    if title:
+        ax.set_title(title)
+    fig.tight_layout()
+    return fig
+
+
+def clear_layout_cache():
+    """Forget all cached Gantt lane layouts."""
+    _layout_cache.clear()
+
+
+def schedule_key(schedule):
+    """
+    Hash a schedule's contents, e.g. to look up a rendering of it.
+
+    Args:
+        schedule: Schedule or list of tuples (pid, start_time, end_time[,
+            core]), or a tuple of arrays (pids, start_times, end_times[, cores])
+
+    Returns:
+        Hexadecimal digest string
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for column in _columns(schedule):
+        column = np.ascontiguousarray(column)
+        digest.update(column.dtype.str.encode())
+        digest.update(column.tobytes() if column.dtype.kind != 'O' else repr(column.tolist()).encode())
+    return digest.hexdigest()
+
+
+def draw_gantt(ax, schedule, processes=None):
+    """
+    Draw a schedule on a matplotlib Axes, one lane per PID, with context
+    switches and dispatch latency in gray lanes of their own on top. A
+    multi-core schedule gets one lane per core instead, the segments colored
+    by process.
+
+    With at most one segment per horizontal pixel, all segments are drawn as a
+    single PolyCollection. Larger schedules are aggregated into an occupancy
+    raster of the axes' size (a pixel is filled when its lane runs at any time
+    within it), so drawing cost depends on the pixel count, not on the number
+    of segments. Labels and ticks are only added where they stay readable.
+
+    Args:
+        ax: Matplotlib Axes to draw on
+        schedule: Schedule or list of tuples (pid, start_time, end_time[,
+            core]), or a tuple of arrays (pids, start_times, end_times[, cores])
+        processes: Optional ProcessTable or list of process dictionaries
+            the schedule was made from. A process whose pid is one of the
+            OVERHEAD_PIDS is then drawn as a process; without it, every
+            segment of those pids is drawn as overhead
+
+    Returns:
+        False if the schedule has no segment with a duration, True otherwise
+    """
+    if len(schedule) == 0 or len(schedule[0]) == 0:
+        return False
+
+    layout = _layout(_columns(schedule), _markers(processes))
+    if layout is None:
+        return False
+    _draw_layout(ax, layout)
+    return True
+
+
+def _layout(columns, markers):
+    """
+    Lanes, labels and colors of a schedule's segments, independent of the
+    axes they are drawn on.
+
+    Returns:
+        Dictionary for _draw_layout, or None if no segment has a duration
+    """
+    keep = columns[2] > columns[1]
+    if not keep.any():
+        return None
+    pids, starts, ends = (column[keep] for column in columns[:3])
+    cores = columns[3][keep] if len(columns) > 3 else None
+
+    # Numeric schedules come back as one float array, show integral pids as ints
+    if pids.dtype.kind == 'f' and np.all(pids == np.round(pids)):
+        pids = pids.astype(np.int64)
+
+    process_pids, segment_processes = _unique(pids, markers)
+    process_labels, process_colors = _lanes(process_pids, markers)
+    if cores is None:
+        lanes, lane_labels, lane_colors = segment_processes, process_labels, process_colors
+    else:
+        lanes = cores.astype(np.int64)
+        lane_labels = [f"CPU {core}" for core in range(lanes.max().item() + 1)]
+        lane_colors = to_rgba_array(COLOR_PALETTE)[np.arange(len(lane_labels)) % len(COLOR_PALETTE)]
+    return {
+        "starts": starts, "ends": ends, "lanes": lanes, "processes": segment_processes,
+        "process_labels": process_labels, "process_colors": process_colors,
+        "lane_labels": lane_labels, "lane_colors": lane_colors, "cores": cores is not None,
+    }
+
+
+def _draw_layout(ax, layout):
+    """Draw a lane layout from _layout on a matplotlib Axes."""
+    starts, ends, lanes = layout["starts"], layout["ends"], layout["lanes"]
+    lane_count = len(layout["lane_labels"])
+    first, last = starts.min().item(), ends.max().item()
+    width = max(int(ax.bbox.width), 1)
+
+    if len(starts) <= width:
+        _draw_segments(ax, lanes, layout["processes"], layout["process_labels"], layout["process_colors"],
+                       starts, ends, width / (last - first))
+    else:
+        _draw_occupancy(ax, lane_count, lanes, starts, ends, layout["lane_colors"], first, last, width)
+
+    ax.set_xlim(first, last)
+    # First lane on top
+    ax.set_ylim(lane_count - 0.5, -0.5)
+
+    if len(starts) <= MAX_BOUNDARY_TICKS:
+        ax.set_xticks(sorted(set(starts.tolist())) + [last])
+
+    if lane_count <= MAX_LANE_LABELS:
+        ax.set_yticks(range(lane_count))
+        ax.set_yticklabels(layout["lane_labels"])
+    else:
+        ax.set_yticks([])
+        ax.set_ylabel(f"{lane_count} CPUs" if layout["cores"] else f"{lane_count} processes")
+
+
+def _columns(schedule):
+    """
+    Schedule columns as arrays: (pids, starts, ends), plus the cores of a
+    multi-core schedule.
+    """
+    if isinstance(schedule, tuple) and isinstance(schedule[0], np.ndarray):
+        return schedule
+    columns = schedule_to_arrays(schedule)
+    if len(schedule[0]) > 3:
+        columns += (np.fromiter((segment[3] for segment in schedule), np.int64, len(schedule)),)
+    return columns
+
+
+def _markers(processes):
+    """The OVERHEAD_PIDS that mark overhead in schedules of the processes."""
+    if processes is None:
+        return OVERHEAD_PIDS
+    return overhead_markers(as_process_table(processes).pid)
+
+
+def _unique(pids, markers):
+    """
+    Lane pids in order and the lane of every segment, like np.unique with
+    return_inverse. Object arrays (string pids among the integer pids of
+    overhead segments) put the overhead lanes first, then sort by pid.
+    """
+    if pids.dtype.kind != 'O':
+        lane_pids, lanes = np.unique(pids, return_inverse=True)
+        return lane_pids.tolist(), lanes
+    values = pids.tolist()
+    lane_pids = sorted(set(values), key=lambda pid: (pid not in markers, str(pid)))
+    index = {pid: lane for lane, pid in enumerate(lane_pids)}
+    return lane_pids, np.fromiter((index[pid] for pid in values), np.int64, len(values))
+
+
+def _lanes(lane_pids, markers=OVERHEAD_PIDS):
+    """
+    Labels and RGBA colors of the lanes. Process lanes cycle through
+    COLOR_PALETTE, overhead lanes (the pids in markers) are gray.
+
+    Returns:
+        Tuple (list of labels, array of colors), one entry per lane
+    """
+    overhead = [pid in OVERHEAD_LANES and pid in markers for pid in lane_pids]
+    palette = to_rgba_array(COLOR_PALETTE)
+    colors = palette[(np.arange(len(lane_pids)) - sum(overhead)) % len(palette)]
+    labels = []
+    for lane, pid in enumerate(lane_pids):
+        if overhead[lane]:
+            label, color = OVERHEAD_LANES[pid]
+            colors[lane] = to_rgba_array(color)[0]
+            labels.append(label)
+        else:
+            labels.append(f"P{pid}")
+    return labels, colors
+
+
+def _draw_segments(ax, lanes, processes, process_labels, process_colors, starts, ends, pixels_per_time):
+    """
+    Draw every segment as a rectangle of one PolyCollection in its lane,
+    colored and labelled by its process (an index into process_labels and
+    process_colors). Only segments wide enough for their label get one.
+    """
+    verts = np.empty((len(starts), 4, 2))
+    verts[:, 0, 0] = verts[:, 3, 0] = starts
+    verts[:, 1, 0] = verts[:, 2, 0] = ends
+    verts[:, 0, 1] = verts[:, 1, 1] = lanes - 0.4
+    verts[:, 2, 1] = verts[:, 3, 1] = lanes + 0.4
+
+    ax.add_collection(PolyCollection(
+        verts, facecolors=process_colors[processes], edgecolors="black",
+        linewidths=1 if len(starts) <= MAX_SEGMENT_LABELS else 0.3
+    ))
+
+    if len(starts) <= MAX_SEGMENT_LABELS:
+        for lane, process, start, end in zip(lanes.tolist(), processes.tolist(), starts.tolist(), ends.tolist()):
+            label = process_labels[process]
+            # Roughly 8 pixels per character at font size 10
+            if (end - start) * pixels_per_time >= 8 * len(label):
+                ax.text(start + (end - start) / 2, lane, label, va='center', ha='center',
+                        color='white', fontsize=10, fontweight='bold')
+
+
+def _draw_occupancy(ax, lane_count, lanes, starts, ends, lane_colors, first, last, width):
+    """
+    Draw the schedule as an image with one column per horizontal pixel and at
+    most one row per vertical pixel, several lanes sharing a row if needed.
+    """
+    rows = max(1, min(lane_count, int(ax.bbox.height)))
+    row = lanes * rows // lane_count
+
+    # Pixel columns covered by each segment: [first_column, end_column)
+    scale = width / (last - first) if last > first else 0
+    first_column = np.clip(((starts - first) * scale).astype(np.int64), 0, width - 1)
+    end_column = np.clip(np.ceil((ends - first) * scale).astype(np.int64), first_column + 1, width)
+
+    # Difference array per row: +1 where a segment starts covering, -1 after it
+    stride = width + 1
+    changes = np.bincount(row * stride + first_column, minlength=rows * stride)
+    changes -= np.bincount(row * stride + end_column, minlength=rows * stride)
+    occupied = np.cumsum(changes.reshape(rows, stride)[:, :width], axis=1) > 0
+
+    # Color each row like the first lane drawn in it, transparent when idle
+    row_colors = lane_colors[-(-np.arange(rows) * lane_count // rows)]
+    image = np.zeros((rows, width, 4))
+    image[occupied] = np.broadcast_to(row_colors[:, None, :], (rows, width, 4))[occupied]
+
+    ax.imshow(image, extent=(first, last, lane_count - 0.5, -0.5), aspect='auto', interpolation='nearest')
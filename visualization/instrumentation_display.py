@@ -0,0 +1,51 @@
+# visualization/instrumentation_display.py
+
+import tkinter as tk
+from tkinter import ttk
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.figure import Figure
+
+def create_instrumentation_window(parent, instrument):
+    """
+    Create a new window showing what an Instrumentation recorded: the
+    counters, phase timings and profile as text, and the ready-queue length
+    of every run over simulated time.
+
+    Args:
+        parent: Parent Tkinter window
+        instrument: Instrumentation of a finished run or comparison
+    """
+    report = instrument.report()
+
+    window = tk.Toplevel(parent)
+    window.title("Instrumentation")
+    window.geometry("1100x700")
+
+    # Text report on the left
+    text_frame = ttk.Frame(window)
+    text_frame.pack(side="left", fill="both", expand=True, padx=5, pady=5)
+    text = tk.Text(text_frame, wrap="none", font=("Courier", 9))
+    scrollbar = ttk.Scrollbar(text_frame, orient="vertical", command=text.yview)
+    text.configure(yscrollcommand=scrollbar.set)
+    scrollbar.pack(side="right", fill="y")
+    text.pack(side="left", fill="both", expand=True)
+    text.insert("1.0", instrument.format_report())
+    text.configure(state="disabled")
+
+    # Ready-queue length over time, one curve per run
+    fig = Figure(figsize=(5, 4))
+    ax = fig.add_subplot(111)
+    for run in report["runs"]:
+        if run["queue_lengths"]:
+            times, lengths = zip(*run["queue_lengths"])
+            ax.step(times, lengths, where="post", label=run["label"], linewidth=0.8)
+    ax.set_title("Ready Queue Length")
+    ax.set_xlabel("Time")
+    ax.set_ylabel("Waiting processes")
+    if len(report["runs"]) > 1:
+        ax.legend(fontsize=8)
+    fig.tight_layout()
+
+    canvas = FigureCanvasTkAgg(fig, master=window)
+    canvas.draw()
+    canvas.get_tk_widget().pack(side="right", fill="both", expand=True)
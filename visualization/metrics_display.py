@@ -8,7 +8,7 @@ def display_metrics(frame, summary_metrics, detailed_metrics):
     Args:
         frame: Tkinter frame to display metrics in
         summary_metrics: Dictionary containing summary metrics
-        detailed_metrics: List of dictionaries with per-process metrics
+        detailed_metrics: Sequence of dictionaries with per-process metrics
     """
     # Clear previous content
     for widget in frame.winfo_children():
@@ -23,9 +23,18 @@ def display_metrics(frame, summary_metrics, detailed_metrics):
     Performance Metrics:
     - Average Waiting Time: {summary_metrics['avg_waiting_time']:.2f} time units
     - Average Turnaround Time: {summary_metrics['avg_turnaround_time']:.2f} time units
+    - Average Response Time: {summary_metrics['avg_response_time']:.2f} time units
+    - Waiting Time p50 / p95 / p99: {summary_metrics['p50_waiting_time']:.2f} / {summary_metrics['p95_waiting_time']:.2f} / {summary_metrics['p99_waiting_time']:.2f} time units
     - CPU Utilization: {summary_metrics['cpu_utilization']:.2f}%
+    - Context Switches: {summary_metrics['context_switches']} ({summary_metrics['switch_overhead']:.2f}% of the time spent switching)
     - Throughput: {summary_metrics['throughput']:.4f} processes/time unit
     """
+    if 'cpus' in summary_metrics:
+        per_core = ", ".join(f"{value:.1f}%" for value in summary_metrics['core_utilization'])
+        metrics_text += f"""- CPUs: {summary_metrics['cpus']}, utilization per CPU: {per_core}
+    - Load Imbalance: {summary_metrics['load_imbalance']:.2f}% (busiest CPU over the mean)
+    - Migrations: {summary_metrics['migrations']}
+    """
     
     ttk.Label(frame, text=metrics_text, justify="left").pack(anchor="w", padx=10)
     
@@ -34,7 +43,7 @@ def display_metrics(frame, summary_metrics, detailed_metrics):
     process_metrics_frame.pack(pady=5, fill="x", expand=True)
     
     # Define table columns
-    columns = ("Process ID", "Arrival Time", "Burst Time", "Completion Time", "Turnaround Time", "Waiting Time")
+    columns = ("Process ID", "Arrival Time", "Burst Time", "Completion Time", "Turnaround Time", "Waiting Time", "Response Time")
     process_metrics_table = ttk.Treeview(process_metrics_frame, columns=columns, show="headings")
     
     # Configure columns
@@ -50,7 +59,8 @@ def display_metrics(frame, summary_metrics, detailed_metrics):
             process['burst'],
             process['completion'],
             process['turnaround'],
-            process['waiting']
+            process['waiting'],
+            process['response']
         ))
     
     # Add scrollbar if needed
@@ -0,0 +1,47 @@
+# visualization/sweep_display.py
+
+import tkinter as tk
+from tkinter import ttk
+from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+from matplotlib.figure import Figure
+
+# Metrics plotted against the quantum, one curve each
+SWEEP_METRICS = [
+    ("avg_waiting_time", "Avg. Waiting Time"),
+    ("avg_turnaround_time", "Avg. Turnaround Time"),
+    ("avg_response_time", "Avg. Response Time"),
+    ("p95_waiting_time", "p95 Waiting Time"),
+    ("context_switches", "Context Switches"),
+    ("switch_overhead", "Switch Overhead (%)"),
+]
+
+def create_sweep_window(parent, sweep_results):
+    """
+    Create a new window plotting Round Robin metrics against the time quantum.
+
+    Args:
+        parent: Parent Tkinter window
+        sweep_results: List of dictionaries returned by sweep_round_robin
+    """
+    sweep_window = tk.Toplevel(parent)
+    sweep_window.title("Round Robin Quantum Sweep")
+    sweep_window.geometry("900x700")
+
+    frame = ttk.Frame(sweep_window)
+    frame.pack(fill="both", expand=True)
+
+    quanta = [row["quantum"] for row in sweep_results]
+
+    # 3x2 grid, one metric-vs-quantum curve per subplot
+    fig = Figure(figsize=(8, 8))
+    for position, (metric, title) in enumerate(SWEEP_METRICS, start=1):
+        ax = fig.add_subplot(3, 2, position)
+        ax.plot(quanta, [row.get(metric, 0) for row in sweep_results], marker="o")
+        ax.set_title(title)
+        ax.set_xlabel("Time Quantum")
+
+    fig.tight_layout()
+
+    canvas = FigureCanvasTkAgg(fig, master=frame)
+    canvas.draw()
+    canvas.get_tk_widget().pack(fill="both", expand=True)